@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Analysis of AS3 Declarations.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .types import ParsedF5IP, parse_f5ip
+
+__all__ = [
+    "ADDRESS_PROPERTIES",
+    "AddressLocation",
+    "AddressDuplicate",
+    "AddressOverlap",
+    "AddressReport",
+    "AddressIndex",
+    "address_report",
+]
+
+# AS3 properties holding IP addresses in F5 notation, either as str or as array of str
+ADDRESS_PROPERTIES: FrozenSet[str] = frozenset(
+    [
+        "virtualAddresses",  # Service_* (array items may be [destination, source])
+        "virtualAddress",  # Service_Address
+        "serverAddresses",  # Pool members
+        "address",  # Pool members servers: [{"name": .., "address": ..}]
+    ]
+)
+
+
+class AddressLocation(BaseModel):
+    """Location of an IP address in an AS3 Declaration.
+
+    :param address: The IP address as found in the declaration
+    :param tenant: The Tenant containing the address, ``None`` when outside of a Tenant
+    :param pointer: JSON pointer to the address within the declaration
+    :param route_domain: Effective route domain, the Tenant's ``defaultRouteDomain`` when not specified by the address
+    """
+
+    address: str
+    tenant: Optional[str]
+    pointer: str
+    route_domain: int
+
+
+class AddressDuplicate(BaseModel):
+    """Identical IP address or network used at multiple locations.
+
+    :param route_domain: Route domain of the address
+    :param locations: Locations using the address
+    """
+
+    route_domain: int
+    locations: List[AddressLocation]
+
+
+class AddressOverlap(BaseModel):
+    """IP address or network contained in another network.
+
+    :param route_domain: Route domain of the addresses
+    :param network: Locations of the containing network
+    :param contained: Locations of the contained address or network
+    """
+
+    route_domain: int
+    network: List[AddressLocation]
+    contained: List[AddressLocation]
+
+
+class AddressReport(BaseModel):
+    """Result of the address analysis of an AS3 Declaration.
+
+    :param addresses: Number of indexed IP addresses
+    :param duplicates: Identical addresses used at multiple locations
+    :param overlaps: Addresses contained in another network
+    """
+
+    addresses: int
+    duplicates: List[AddressDuplicate]
+    overlaps: List[AddressOverlap]
+
+
+def _pointer_escape(key: str) -> str:
+    """Escapes ``key`` to be used as JSON pointer segment."""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+class AddressIndex:
+    """Interval index of IP addresses keyed by route domain.
+
+    Every address is indexed as interval of its first and last address.
+    Identical intervals are grouped, which finds duplicates in linear time.
+    As addresses in CIDR notation either nest or are disjoint, overlaps are found by a single sweep
+    over the sorted intervals keeping a stack of the enclosing networks.
+    The stack is at most 33 (IPv4) or 129 (IPv6) networks deep, therefore the sweep is near-linear.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[
+            Tuple[int, int, int, int], List[AddressLocation]
+        ] = defaultdict(list)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(
+        self,
+        address: str,
+        pointer: str = "",
+        tenant: Optional[str] = None,
+        default_route_domain: int = 0,
+    ) -> bool:
+        """Adds ``address`` to the index. Returns ``False`` if ``address`` is not a valid F5 IP address, ``True`` otherwise.
+
+        :param address: IP address in F5 notation
+        :param pointer: JSON pointer to the address (Default value = "")
+        :param tenant: Tenant using the address (Default value = None)
+        :param default_route_domain: Route domain used when ``address`` doesn't specify one (Default value = 0)
+        """
+        try:
+            parsed: ParsedF5IP = parse_f5ip(address)
+        except (TypeError, ValueError):
+            return False
+        route_domain = parsed.route_domain
+        if route_domain is None:
+            route_domain = default_route_domain
+        self._intervals[
+            (route_domain, parsed.version, parsed.first, parsed.last)
+        ].append(
+            AddressLocation(
+                address=address,
+                tenant=tenant,
+                pointer=pointer,
+                route_domain=route_domain,
+            )
+        )
+        self._len += 1
+        return True
+
+    @classmethod
+    def from_declaration(
+        cls, declaration: dict, properties: FrozenSet[str] = ADDRESS_PROPERTIES
+    ) -> "AddressIndex":
+        """Returns an AddressIndex of all IP addresses in ``declaration``.
+
+        :param declaration: AS3 Declaration
+        :param properties: Names of the properties holding IP addresses (Default value = ADDRESS_PROPERTIES)
+        """
+        index = cls()
+        for address, pointer, tenant, default_route_domain in _iter_addresses(
+            declaration, properties
+        ):
+            index.add(
+                address,
+                pointer=pointer,
+                tenant=tenant,
+                default_route_domain=default_route_domain,
+            )
+        return index
+
+    def duplicates(self, cross_tenant: bool = False) -> List[AddressDuplicate]:
+        """Returns the addresses used at multiple locations.
+
+        :param cross_tenant: Only report addresses used by multiple Tenants (Default value = False)
+        """
+        return [
+            AddressDuplicate(route_domain=key[0], locations=locations)
+            for key, locations in sorted(self._intervals.items())
+            if len(locations) > 1
+            and (not cross_tenant or _tenants(locations, locations))
+        ]
+
+    def overlaps(self, cross_tenant: bool = False) -> List[AddressOverlap]:
+        """Returns the addresses contained in another network, for every enclosing network.
+
+        :param cross_tenant: Only report overlaps of addresses used by different Tenants (Default value = False)
+        """
+        overlaps: List[AddressOverlap] = []
+        stack: List[Tuple[Tuple[int, int, int, int], List[AddressLocation]]] = []
+        # sort by route domain, version, first address and descending last address: enclosing networks first
+        for key, locations in sorted(
+            self._intervals.items(),
+            key=lambda item: (item[0][0], item[0][1], item[0][2], -item[0][3]),
+        ):
+            route_domain, version, first, _ = key
+            while stack and (
+                stack[-1][0][:2] != (route_domain, version) or stack[-1][0][3] < first
+            ):
+                stack.pop()
+            for _, network in stack:
+                if not cross_tenant or _tenants(network, locations):
+                    overlaps.append(
+                        AddressOverlap(
+                            route_domain=route_domain,
+                            network=network,
+                            contained=locations,
+                        )
+                    )
+            stack.append((key, locations))
+        return overlaps
+
+    def report(self, cross_tenant: bool = False) -> AddressReport:
+        """Returns the AddressReport of the indexed addresses.
+
+        :param cross_tenant: Only report conflicts between different Tenants (Default value = False)
+        """
+        return AddressReport(
+            addresses=len(self),
+            duplicates=self.duplicates(cross_tenant=cross_tenant),
+            overlaps=self.overlaps(cross_tenant=cross_tenant),
+        )
+
+
+def _tenants(first: List[AddressLocation], second: List[AddressLocation]) -> bool:
+    """Returns ``True`` if the locations of ``first`` and ``second`` belong to more than one Tenant."""
+    return len({location.tenant for location in first + second}) > 1
+
+
+def _iter_addresses(
+    item,
+    properties: FrozenSet[str],
+    pointer: str = "",
+    tenant: Optional[str] = None,
+    route_domain: int = 0,
+) -> Iterator[Tuple[str, str, Optional[str], int]]:
+    """Yields ``(address, pointer, tenant, default_route_domain)`` for every address in ``item`` in document order.
+
+    :param item: AS3 Declaration or part of it
+    :param properties: Names of the properties holding IP addresses
+    :param pointer: JSON pointer to ``item`` (Default value = "")
+    :param tenant: Tenant containing ``item`` (Default value = None)
+    :param route_domain: Default route domain of the Tenant (Default value = 0)
+    """
+    if isinstance(item, dict):
+        for key, value in item.items():
+            value_pointer = f"{pointer}/{_pointer_escape(key)}"
+            if key in properties:
+                for address, address_pointer in _iter_property(value, value_pointer):
+                    yield address, address_pointer, tenant, route_domain
+            elif isinstance(value, dict) and value.get("class") == "Tenant":
+                yield from _iter_addresses(
+                    value,
+                    properties,
+                    value_pointer,
+                    key,
+                    value.get("defaultRouteDomain", 0),
+                )
+            else:
+                yield from _iter_addresses(
+                    value, properties, value_pointer, tenant, route_domain
+                )
+    elif isinstance(item, list):
+        for position, value in enumerate(item):
+            yield from _iter_addresses(
+                value, properties, f"{pointer}/{position}", tenant, route_domain
+            )
+
+
+def _iter_property(value, pointer: str) -> Iterator[Tuple[str, str]]:
+    """Yields ``(address, pointer)`` for the addresses of an address property.
+
+    :param value: Value of the address property
+    :param pointer: JSON pointer to the value
+    """
+    if isinstance(value, str):
+        yield value, pointer
+    elif isinstance(value, list):
+        for position, item in enumerate(value):
+            if isinstance(item, str):
+                yield item, f"{pointer}/{position}"
+            elif isinstance(item, list) and item and isinstance(item[0], str):
+                # [destination, source]
+                yield item[0], f"{pointer}/{position}/0"
+
+
+def address_report(declaration: dict, cross_tenant: bool = False) -> AddressReport:
+    """Returns the AddressReport of duplicate and overlapping IP addresses in ``declaration``.
+    Addresses without route domain use the ``defaultRouteDomain`` of their Tenant.
+
+    :param declaration: AS3 Declaration
+    :param cross_tenant: Only report conflicts between different Tenants (Default value = False)
+    """
+    return AddressIndex.from_declaration(declaration).report(cross_tenant=cross_tenant)
@@ -6,28 +6,54 @@ AS3Ninja's REST API
 # pylint: disable=C0330 # Wrong hanging indentation before block
 # pylint: disable=C0301 # Line too long
 
-from typing import List, Optional, Union
+import asyncio
+import json
+import re
+import zlib
+from functools import partial
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+)
+from pydantic import BaseModel, Field, ValidationError
 from starlette.middleware.cors import CORSMiddleware
-from starlette.responses import RedirectResponse
+from starlette.requests import Request
+from starlette.responses import RedirectResponse, StreamingResponse
 
 from . import __description__, __projectname__, __version__
-from .declaration import AS3Declaration
+from .analysis import AddressReport, address_report
+from .compression import compress, negotiate_encoding
+from .concurrency import BoundedExecutor, SingleFlight
+from .declaration import AS3Declaration, AS3DeclarationTemplate
 from .exceptions import (
     AS3JSONDecodeError,
     AS3SchemaVersionError,
     AS3TemplateSyntaxError,
     AS3UndefinedError,
     AS3ValidationError,
+    QueueFullError,
 )
 from .gitget import Gitget, GitgetException
-from .schema import AS3Schema
+from .jobs import Job, JobStore
+from .preview import PreviewSession, make_patch
+from .schema import AS3SchemaService
+from .schema.service import SerializedJSON
+from .settings import NINJASETTINGS
 from .templateconfiguration import (
     AS3TemplateConfiguration,
     AS3TemplateConfigurationError,
 )
+from .transformcache import TransformCache
+
+# declarations larger than STREAMING_THRESHOLD bytes are streamed in chunks of STREAMING_CHUNK_SIZE bytes
+STREAMING_THRESHOLD = 1024 * 1024
+STREAMING_CHUNK_SIZE = 64 * 1024
 
 CORS_SETTINGS = {
     "allow_origins": [
@@ -47,6 +73,14 @@ class AS3ValidationResult(BaseModel):
 
     valid: bool
     error: Optional[str]
+    errors: Optional[List[str]]
+
+
+class AS3TransformValidationResult(BaseModel):
+    """AS3 /declaration/transform/validate response"""
+
+    declaration: dict
+    validation: AS3ValidationResult
 
 
 class LatestVersion(BaseModel):
@@ -55,6 +89,34 @@ class LatestVersion(BaseModel):
     latest_version: str
 
 
+class HealthStatus(BaseModel):
+    """AS3 /health/live and /health/ready response"""
+
+    status: str
+    warm_versions: List[str]
+    error: Optional[str]
+
+
+class ExecutorMetrics(BaseModel):
+    """Queue metrics of an API executor"""
+
+    max_workers: int
+    max_queue: int
+    running: int
+    waiting: int = Field(..., description="Tasks waiting for a worker (queue depth)")
+    rejected: int = Field(..., description="Tasks rejected with HTTP 503 since start")
+
+
+class APIMetrics(BaseModel):
+    """AS3 /metrics response"""
+
+    executors: Dict[str, ExecutorMetrics]
+    jobs: int = Field(..., description="Retained jobs")
+    git_transforms_inflight: int = Field(
+        ..., description="In-flight (coalesced) git transformations"
+    )
+
+
 class Error(BaseModel):
     """Generic Error Model"""
 
@@ -62,6 +124,15 @@ class Error(BaseModel):
     message: str
 
 
+class JobStatus(BaseModel):
+    """AS3 Ninja job status, the declaration is available when the job is done, the error when it failed"""
+
+    id: str
+    status: str = Field(..., description="pending, running, done or failed")
+    declaration: Optional[dict]
+    error: Optional[Error]
+
+
 class AS3DeclareGit(BaseModel):
     """Model for an AS3 Declaration from a Git repository"""
 
@@ -88,6 +159,217 @@ class AS3Declare(BaseModel):
     declaration_template: str = Field(..., description="Declaration Template")
 
 
+class AS3DeclareBatch(BaseModel):
+    """Model for a batch of inline AS3 Declarations using the same Declaration Template"""
+
+    template_configurations: List[Union[List[dict], dict]] = Field(
+        ..., description="Template Configurations to use, one per AS3 Declaration"
+    )
+    declaration_template: str = Field(..., description="Declaration Template")
+
+
+class TextEdit(BaseModel):
+    """Edit of the Declaration Template, replaces the characters from ``start`` to ``end`` with ``text``"""
+
+    start: int = Field(..., ge=0, description="Offset of the first replaced character")
+    end: int = Field(..., ge=0, description="Offset after the last replaced character")
+    text: str = Field("", description="Replacement text")
+
+
+class PreviewUpdate(BaseModel):
+    """Message of the /declaration/transform/preview WebSocket"""
+
+    id: Any = Field(None, description="Message id, returned with the response")
+    declaration_template: Optional[str] = Field(
+        None, description="Replaces the Declaration Template"
+    )
+    template_edits: Optional[List[TextEdit]] = Field(
+        None, description="Edits of the Declaration Template, applied in order"
+    )
+    template_configuration: Optional[Union[List[dict], dict]] = Field(
+        None, description="Replaces the Template Configuration"
+    )
+    configuration_patch: Optional[List[dict]] = Field(
+        None, description="JSON Patch (RFC 6902) of the merged Template Configuration"
+    )
+
+
+SCHEMA_SERVICE = AS3SchemaService(prewarm_minors=NINJASETTINGS.SCHEMA_PREWARM_MINORS)
+
+TRANSFORM_CACHE: Optional[TransformCache] = (
+    TransformCache(
+        ttl=NINJASETTINGS.TRANSFORM_CACHE_TTL,
+        max_entries=NINJASETTINGS.TRANSFORM_CACHE_MAX_ENTRIES,
+        max_bytes=NINJASETTINGS.TRANSFORM_CACHE_MAX_BYTES,
+        path=NINJASETTINGS.TRANSFORM_CACHE_PATH or None,
+    )
+    if NINJASETTINGS.TRANSFORM_CACHE_TTL > 0
+    else None
+)
+
+# separate executors per kind of work: long running git transformations or validations can't starve the other endpoints
+EXECUTOR = BoundedExecutor(
+    max_workers=NINJASETTINGS.API_WORKERS,
+    max_queue=NINJASETTINGS.API_QUEUE_SIZE,
+    retry_after=NINJASETTINGS.API_RETRY_AFTER,
+)
+
+GIT_EXECUTOR = BoundedExecutor(
+    max_workers=NINJASETTINGS.API_GIT_WORKERS,
+    max_queue=NINJASETTINGS.API_GIT_QUEUE_SIZE,
+    retry_after=NINJASETTINGS.API_RETRY_AFTER,
+)
+
+VALIDATION_EXECUTOR = BoundedExecutor(
+    max_workers=NINJASETTINGS.API_VALIDATION_WORKERS,
+    max_queue=NINJASETTINGS.API_VALIDATION_QUEUE_SIZE,
+    retry_after=NINJASETTINGS.API_RETRY_AFTER,
+)
+
+GIT_TRANSFORMS = SingleFlight()
+
+JOBS = JobStore(
+    retention=NINJASETTINGS.API_JOB_RETENTION, max_jobs=NINJASETTINGS.API_JOB_MAX
+)
+
+
+async def _run(
+    function: Callable,
+    *args,
+    executor: Optional[BoundedExecutor] = None,
+    **kwargs,
+) -> Any:
+    """Runs the blocking ``function`` on ``executor`` (Default: EXECUTOR) to keep the event loop free.
+    Responds with HTTP 503 and a Retry-After header if the executor's queue is full."""
+    try:
+        return await (executor or EXECUTOR).run(function, *args, **kwargs)
+    except QueueFullError as exc:
+        raise _queue_full(exc) from exc
+
+
+def _queue_full(exc: QueueFullError) -> HTTPException:
+    """Returns the HTTP 503 HTTPException with a Retry-After header for a full executor queue."""
+    error = Error(code=503, message=str(exc))
+    return HTTPException(
+        status_code=error.code,
+        detail=error.message,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Returns True if the If-None-Match header value matches ``etag`` (weak comparison)."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().replace("W/", "", 1) == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _negotiate_encoding(request: Request) -> Optional[str]:
+    """Returns the content encoding to compress the response to ``request`` with, None if the response is not compressed."""
+    if not NINJASETTINGS.API_COMPRESSION:
+        return None
+    return negotiate_encoding(request.headers.get("accept-encoding", ""))
+
+
+def _compressed_result(
+    encoding: Optional[str], function: Callable, *args, **kwargs
+) -> Tuple[bytes, Optional[str]]:
+    """Returns the serialized JSON body returned by ``function(*args, **kwargs)`` and its content encoding.
+    Bodies of at least API_COMPRESSION_MIN_SIZE bytes are compressed with ``encoding``, the content encoding is None otherwise."""
+    body = function(*args, **kwargs)
+    if encoding is None or len(body) < NINJASETTINGS.API_COMPRESSION_MIN_SIZE:
+        return body, None
+    return compress(body, encoding), encoding
+
+
+async def _json_response(
+    request: Request,
+    function: Callable,
+    *args,
+    executor: Optional[BoundedExecutor] = None,
+    **kwargs,
+) -> Response:
+    """Runs ``function(*args, **kwargs)``, which returns serialized JSON, on ``executor`` (see ``_run``) and returns its result as response.
+    The body is compressed in the same task if the client accepts gzip or brotli, a finished result is never rejected by a full queue."""
+    body, encoding = await _run(
+        _compressed_result,
+        _negotiate_encoding(request),
+        function,
+        *args,
+        executor=executor,
+        **kwargs,
+    )
+    return _body_response(body, encoding)
+
+
+def _body_response(body: bytes, encoding: Optional[str] = None) -> Response:
+    """Returns the serialized JSON ``body`` with the content ``encoding`` as response without re-encoding it.
+    Bodies larger than STREAMING_THRESHOLD are streamed in chunks of STREAMING_CHUNK_SIZE."""
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    if len(body) <= STREAMING_THRESHOLD:
+        return Response(content=body, media_type="application/json", headers=headers)
+    return StreamingResponse(
+        (
+            body[offset : offset + STREAMING_CHUNK_SIZE]
+            for offset in range(0, len(body), STREAMING_CHUNK_SIZE)
+        ),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+async def _serialized_response(
+    request: Request, serialized: SerializedJSON
+) -> Response:
+    """Returns the pre-serialized JSON as response, HTTP 304 if the client has the current version (ETag),
+    the pre-compressed body if the client accepts gzip or brotli. Every representation has its own ETag."""
+    encoding = _negotiate_encoding(request)
+    headers = {
+        "ETag": serialized.etag_for(encoding),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        body = serialized.body
+    else:
+        headers["Content-Encoding"] = encoding
+        body = serialized.encoded(encoding, compress_body=False) or await _run(
+            serialized.encoded, encoding
+        )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _subschema_response(
+    request: Request,
+    version: str,
+    pointer: Optional[str] = None,
+    as3class: Optional[str] = None,
+) -> Response:
+    """Returns the serialized subschema referenced by ``pointer`` or ``as3class``, see ``_serialized_response``.
+    Unknown subschemas or AS3 classes return HTTP 404."""
+    try:
+        serialized = await _run(
+            SCHEMA_SERVICE.serialized_subschema,
+            version,
+            pointer=pointer,
+            as3class=as3class,
+        )
+    except KeyError as exc:
+        error = Error(code=404, message=exc.args[0])
+        raise HTTPException(status_code=error.code, detail=error.message)
+    except ValueError as exc:  # includes AS3SchemaVersionError
+        error = Error(code=400, message=str(exc))
+        raise HTTPException(status_code=error.code, detail=error.message)
+    return await _serialized_response(request, serialized)
+
+
 app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)  # pylint: disable=C0103
 
 app.add_middleware(CORSMiddleware, **CORS_SETTINGS)
@@ -95,8 +377,9 @@ app.add_middleware(CORSMiddleware, **CORS_SETTINGS)
 
 @app.on_event("startup")
 def startup():
-    """preload AS3Schema Class - assume Schemas are available"""
-    _ = AS3Schema()
+    """preload AS3Schema Class - assume Schemas are available - and prewarm the AS3 Schema validators in the background"""
+    SCHEMA_SERVICE.get()
+    SCHEMA_SERVICE.start()
 
 
 @app.get("/")
@@ -133,44 +416,151 @@ api = FastAPI(  # pylint: disable=C0103
 api.add_middleware(CORSMiddleware, **CORS_SETTINGS)
 
 
+@api.get("/health/live", response_model=HealthStatus)
+async def get_health_live():
+    """Liveness probe, returns HTTP 200 while the API is able to respond"""
+    return HealthStatus(
+        status="alive",
+        warm_versions=SCHEMA_SERVICE.warm_versions,
+        error=SCHEMA_SERVICE.error,
+    )
+
+
+@api.get("/health/ready", response_model=HealthStatus)
+async def get_health_ready(response: Response):
+    """Readiness probe, returns HTTP 200 when the AS3 Schema validators are prewarmed, HTTP 503 otherwise"""
+    if not SCHEMA_SERVICE.ready:
+        response.status_code = 503
+    return HealthStatus(
+        status="ready" if SCHEMA_SERVICE.ready else "warming up",
+        warm_versions=SCHEMA_SERVICE.warm_versions,
+        error=SCHEMA_SERVICE.error,
+    )
+
+
+@api.get("/metrics", response_model=APIMetrics)
+async def get_metrics():
+    """Returns the queue metrics of the API executors: ``default`` (templates, AS3 Schemas), ``git`` and ``validation``"""
+    return APIMetrics(
+        executors={
+            name: ExecutorMetrics(
+                max_workers=executor.max_workers,
+                max_queue=executor.max_queue,
+                running=executor.running,
+                waiting=executor.waiting,
+                rejected=executor.rejected,
+            )
+            for name, executor in (
+                ("default", EXECUTOR),
+                ("git", GIT_EXECUTOR),
+                ("validation", VALIDATION_EXECUTOR),
+            )
+        },
+        jobs=len(JOBS),
+        git_transforms_inflight=GIT_TRANSFORMS.inflight,
+    )
+
+
 @api.get("/schema/latest_version")
 async def get_schema_latest_version():
     """Returns latest known AS3 Schema version"""
-    return LatestVersion(latest_version=AS3Schema().latest_version)
+    return LatestVersion(latest_version=SCHEMA_SERVICE.get().latest_version)
 
 
 @api.get("/schema/schema")
 async def get_schema_schema_version(
+    request: Request,
     version: str = Query("latest", title="AS3 Schema version to get"),
 ):
     """Returns AS3 Schema of ``version``"""
     try:
-        return AS3Schema(version=version).schema
+        serialized = await _run(SCHEMA_SERVICE.serialized, version)
     except AS3SchemaVersionError as exc:
         error = Error(code=400, message=str(exc))
         raise HTTPException(status_code=error.code, detail=error.message)
+    return await _serialized_response(request, serialized)
 
 
 @api.get("/schema/schemas")
-async def get_schema_schemas():
+async def get_schema_schemas(request: Request):
     """Returns all known AS3 Schemas"""
-    return AS3Schema().schemas
+    return await _serialized_response(request, await _run(SCHEMA_SERVICE.serialized))
+
+
+@api.get("/schema/subschema")
+async def get_schema_subschema(
+    request: Request,
+    pointer: str = Query(
+        ..., title="JSON pointer of the subschema, for example /definitions/Pool"
+    ),
+    version: str = Query("latest", title="AS3 Schema version to get"),
+):
+    """Returns the subschema of the AS3 Schema of ``version`` referenced by the JSON ``pointer``, with all references resolved"""
+    return await _subschema_response(request, version, pointer=pointer)
+
+
+@api.get("/schema/classes")
+async def get_schema_classes(
+    version: str = Query("latest", title="AS3 Schema version to get"),
+):
+    """Returns array of the AS3 class names of the AS3 Schema of ``version``"""
+    try:
+        as3s = await _run(SCHEMA_SERVICE.get, version)
+        return sorted(await _run(as3s.class_index))
+    except AS3SchemaVersionError as exc:
+        error = Error(code=400, message=str(exc))
+        raise HTTPException(status_code=error.code, detail=error.message)
+
+
+@api.get("/schema/classes/{as3class}")
+async def get_schema_class(
+    request: Request,
+    as3class: str,
+    version: str = Query("latest", title="AS3 Schema version to get"),
+):
+    """Returns the definition of the AS3 class ``as3class`` of the AS3 Schema of ``version``, with all references resolved"""
+    return await _subschema_response(request, version, as3class=as3class)
 
 
 @api.get("/schema/versions")
 async def get_schema_versions():
     """Returns array of version numbers for all known AS3 Schemas"""
-    return AS3Schema().versions
+    return SCHEMA_SERVICE.get().versions
 
 
-@api.post("/schema/validate", response_model=AS3ValidationResult)
-async def _schema_validate(
+def _validate(
     declaration: dict,
-    version: str = Query("latest", title="AS3 Schema version to validation against"),
-):
-    """Validate declaration in POST payload against AS3 Schema of ``version`` (Default: latest)"""
+    version: str,
+    max_errors: Optional[int],
+    max_context_depth: Optional[int],
+) -> AS3ValidationResult:
+    """Validates declaration against AS3 Schema of ``version``, see ``_schema_validate``.
+    ``version`` "auto" validates against the ``schemaVersion`` of the declaration."""
     try:
-        AS3Schema(version=version).validate(declaration=declaration)
+        if version == "auto" and isinstance(declaration, dict):
+            as3s, declaration_version = SCHEMA_SERVICE.get(), version
+        else:
+            as3s, declaration_version = SCHEMA_SERVICE.get(version), None
+        if max_errors:
+            errors = [
+                str(exc)
+                for exc in islice(
+                    as3s.iter_errors(
+                        declaration=declaration,
+                        version=declaration_version,
+                        max_context_depth=max_context_depth,
+                    ),
+                    max_errors,
+                )
+            ]
+            if errors:
+                return AS3ValidationResult(valid=False, error=errors[0], errors=errors)
+            return AS3ValidationResult(valid=True)
+        as3s.validate(
+            declaration=declaration,
+            version=declaration_version,
+            max_context_depth=max_context_depth,
+        )
         return AS3ValidationResult(valid=True)
     except AS3SchemaVersionError as exc:
         error = Error(code=400, message=str(exc))
@@ -179,17 +569,160 @@ async def _schema_validate(
         return AS3ValidationResult(valid=False, error=str(exc))
 
 
-@api.post("/declaration/transform")
-async def post_declaration_transform(as3d: AS3Declare):
-    """Transforms an AS3 declaration template, see ``AS3Declare`` for details on the expected input. Returns the AS3 Declaration."""
+@api.post("/schema/validate", response_model=AS3ValidationResult)
+async def _schema_validate(
+    declaration: dict,
+    version: str = Query(
+        "latest",
+        title="AS3 Schema version to validation against, auto to use the schemaVersion of the declaration",
+    ),
+    max_errors: Optional[int] = Query(
+        None, ge=1, title="Maximum number of validation errors to return"
+    ),
+    max_context_depth: Optional[int] = Query(
+        None, ge=0, title="Maximum depth of the validation error context"
+    ),
+):
+    """Validate declaration in POST payload against AS3 Schema of ``version`` (Default: latest), "auto" uses the ``schemaVersion`` of the declaration.
+    If ``max_errors`` is set, up to ``max_errors`` validation errors are returned in ``errors``."""
+    return await _run(
+        _validate,
+        declaration,
+        version,
+        max_errors,
+        max_context_depth,
+        executor=VALIDATION_EXECUTOR,
+    )
+
+
+def _decode_body(body: bytes, content_encoding: str) -> Any:
+    """Decompresses and parses the JSON request ``body`` of the raw endpoints.
+    ``content_encoding`` can be empty, ``identity`` or ``gzip``. Bodies are limited to ``API_MAX_BODY_SIZE`` bytes after decompression."""
+    max_size = NINJASETTINGS.API_MAX_BODY_SIZE
+    content_encoding = content_encoding.strip().lower()
+    if content_encoding == "gzip":
+        decompressed = []
+        size = 0
+        try:
+            while body:
+                decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+                chunk = decompressor.decompress(body, max_size - size + 1)
+                size += len(chunk)
+                if size > max_size:
+                    break
+                if not decompressor.eof:
+                    raise zlib.error("incomplete or truncated stream")
+                decompressed.append(chunk)
+                body = decompressor.unused_data  # concatenated gzip members
+        except zlib.error as exc:
+            error = Error(code=400, message=f"invalid gzip request body: {exc}")
+            raise HTTPException(status_code=error.code, detail=error.message)
+        body = b"".join(decompressed)
+    elif content_encoding not in ("", "identity"):
+        error = Error(
+            code=415, message=f"unsupported Content-Encoding: {content_encoding}"
+        )
+        raise HTTPException(status_code=error.code, detail=error.message)
+    else:
+        size = len(body)
+    if size > max_size:
+        error = Error(code=413, message=f"request body exceeds {max_size} bytes")
+        raise HTTPException(status_code=error.code, detail=error.message)
     try:
+        return json.loads(body)
+    except ValueError as exc:  # JSONDecodeError and UnicodeDecodeError
+        error = Error(code=400, message=f"invalid JSON request body: {exc}")
+        raise HTTPException(status_code=error.code, detail=error.message)
+
+
+def _validate_raw(
+    body: bytes,
+    content_encoding: str,
+    version: str,
+    max_errors: Optional[int],
+    max_context_depth: Optional[int],
+) -> AS3ValidationResult:
+    """Parses and validates a raw request body, see ``_schema_validate_raw``."""
+    declaration = _decode_body(body, content_encoding)
+    if not isinstance(declaration, dict):
+        error = Error(code=422, message="declaration must be a JSON object")
+        raise HTTPException(status_code=error.code, detail=error.message)
+    return _validate(declaration, version, max_errors, max_context_depth)
+
+
+@api.post(
+    "/schema/validate/raw",
+    response_model=AS3ValidationResult,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": {"type": "object"}}},
+            "required": True,
+        }
+    },
+)
+async def _schema_validate_raw(
+    request: Request,
+    version: str = Query(
+        "latest",
+        title="AS3 Schema version to validation against, auto to use the schemaVersion of the declaration",
+    ),
+    max_errors: Optional[int] = Query(
+        None, ge=1, title="Maximum number of validation errors to return"
+    ),
+    max_context_depth: Optional[int] = Query(
+        None, ge=0, title="Maximum depth of the validation error context"
+    ),
+):
+    """Same as ``/schema/validate``, but the request body is passed as is to the JSON parser and the validator in a worker thread,
+    without any model validation or conversion. The request body can be gzip compressed (``Content-Encoding: gzip``)."""
+    return await _run(
+        _validate_raw,
+        await request.body(),
+        request.headers.get("content-encoding", ""),
+        version,
+        max_errors,
+        max_context_depth,
+        executor=VALIDATION_EXECUTOR,
+    )
+
+
+@api.post("/declaration/addresses", response_model=AddressReport)
+async def post_declaration_addresses(
+    declaration: dict,
+    cross_tenant: bool = Query(
+        False,
+        title="Only report duplicate or overlapping addresses used by different Tenants",
+    ),
+):
+    """Reports duplicate and overlapping IP addresses of the declaration in POST payload.
+    Addresses are compared per route domain, addresses without route domain use the ``defaultRouteDomain`` of their Tenant."""
+    return await _run(address_report, declaration, cross_tenant=cross_tenant)
+
+
+def _transform(as3d: AS3Declare) -> bytes:
+    """Transforms an AS3 declaration template, see ``post_declaration_transform``."""
+    try:
+        cache_key = None
+        if TRANSFORM_CACHE is not None and TransformCache.cacheable(
+            as3d.template_configuration, as3d.declaration_template
+        ):
+            cache_key = TransformCache.key(
+                as3d.template_configuration, as3d.declaration_template
+            )
+            cached = TRANSFORM_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
         as3tc = AS3TemplateConfiguration(as3d.template_configuration)
 
         as3declaration = AS3Declaration(
             template_configuration=as3tc.dict(),
             declaration_template=as3d.declaration_template,
         )
-        return as3declaration.dict()
+        declaration = as3declaration.json().encode("utf-8")
+        if cache_key is not None:
+            TRANSFORM_CACHE.set(cache_key, declaration)
+        return declaration
 
     except (
         AS3SchemaVersionError,
@@ -202,9 +735,92 @@ async def post_declaration_transform(as3d: AS3Declare):
         raise HTTPException(status_code=error.code, detail=error.message)
 
 
-@api.post("/declaration/transform/git")
-async def post_declaration_git_transform(as3d: AS3DeclareGit):
-    """Transforms an AS3 declaration template, see ``AS3DeclareGit`` for details on the expected input. Returns the AS3 Declaration."""
+def _transform_validate(
+    as3d: AS3Declare,
+    version: str,
+    max_errors: Optional[int],
+    max_context_depth: Optional[int],
+) -> bytes:
+    """Transforms and validates an AS3 declaration template, see ``post_declaration_transform_validate``.
+    The transformed declaration is validated as is and the response is composed of its JSON serialization created during the transformation."""
+    try:
+        as3tc = AS3TemplateConfiguration(as3d.template_configuration)
+
+        as3declaration = AS3Declaration(
+            template_configuration=as3tc.dict(),
+            declaration_template=as3d.declaration_template,
+        )
+    except (
+        AS3JSONDecodeError,
+        AS3TemplateSyntaxError,
+        AS3UndefinedError,
+        AS3TemplateConfigurationError,
+    ) as exc:
+        error = Error(code=400, message=str(exc))
+        raise HTTPException(status_code=error.code, detail=error.message)
+
+    result = _validate(as3declaration.dict(), version, max_errors, max_context_depth)
+    return b'{"declaration":%s,"validation":%s}' % (
+        as3declaration.json().encode("utf-8"),
+        result.json().encode("utf-8"),
+    )
+
+
+def _transform_raw(body: bytes, content_encoding: str) -> bytes:
+    """Parses a raw request body and transforms it, see ``post_declaration_transform_raw``."""
+    data = _decode_body(body, content_encoding)
+    if not isinstance(data, dict):
+        data = {}
+    template_configuration = data.get("template_configuration")
+    declaration_template = data.get("declaration_template")
+    if not (
+        isinstance(template_configuration, dict)
+        or (
+            isinstance(template_configuration, list)
+            and all(isinstance(item, dict) for item in template_configuration)
+        )
+    ) or not isinstance(declaration_template, str):
+        error = Error(
+            code=422,
+            message="template_configuration (object or array of objects) and declaration_template (string) are required",
+        )
+        raise HTTPException(status_code=error.code, detail=error.message)
+    return _transform(
+        AS3Declare.construct(
+            template_configuration=template_configuration,
+            declaration_template=declaration_template,
+        )
+    )
+
+
+async def _git_transform_key(as3d: AS3DeclareGit) -> Optional[Tuple]:
+    """Returns the key identifying identical git transformations, see ``post_declaration_git_transform``.
+    Branches and tags are resolved to the commit id they point to, ``commit`` ids in long format are used as is.
+    Returns None if the remote commit cannot be resolved, the transformation reports the error in this case."""
+    commit = as3d.commit
+    if not (commit and re.fullmatch(r"[0-9a-f]{40}", commit)):
+        try:
+            head = await _run(
+                Gitget.remote_commit,
+                as3d.repository,
+                as3d.branch,
+                executor=GIT_EXECUTOR,
+            )
+        except GitgetException:
+            return None
+        commit = (
+            f"{head}:{commit}" if commit else head
+        )  # HEAD~<int> is relative to head
+    return (
+        as3d.repository,
+        commit,
+        as3d.depth,
+        TransformCache.key(as3d.template_configuration, as3d.declaration_template),
+    )
+
+
+def _git_transform(as3d: AS3DeclareGit) -> bytes:
+    """Transforms an AS3 declaration template from a Git repository, see ``post_declaration_git_transform``."""
     try:
         with Gitget(
             repository=as3d.repository,
@@ -229,7 +845,7 @@ async def post_declaration_git_transform(as3d: AS3DeclareGit):
                 declaration_template=as3d.declaration_template,
                 jinja2_searchpath=gitrepo.repodir,
             )
-            return as3declaration.dict()
+            return as3declaration.json().encode("utf-8")
     except (
         GitgetException,
         AS3SchemaVersionError,
@@ -243,5 +859,425 @@ async def post_declaration_git_transform(as3d: AS3DeclareGit):
         raise HTTPException(status_code=error.code, detail=error.message)
 
 
+def _batch_error(index: int, error: Error) -> bytes:
+    """Returns the NDJSON line of the ``error`` of batch item ``index``."""
+    return (json.dumps({"index": index, "error": error.dict()}) + "\n").encode("utf-8")
+
+
+def _batch_transform_item(
+    template: AS3DeclarationTemplate, index: int, template_configuration: Any
+) -> bytes:
+    """Transforms a single item of a batch, see ``post_declaration_transform_batch``. Returns the NDJSON line of the result or error."""
+    try:
+        cache_key = None
+        if TRANSFORM_CACHE is not None and TransformCache.cacheable(
+            template_configuration, template.declaration_template
+        ):
+            cache_key = TransformCache.key(
+                template_configuration, template.declaration_template
+            )
+            declaration = TRANSFORM_CACHE.get(cache_key)
+            if declaration is not None:
+                return b'{"index":%d,"declaration":%s}\n' % (index, declaration)
+
+        as3tc = AS3TemplateConfiguration(template_configuration)
+        declaration = (
+            AS3Declaration(
+                template_configuration=as3tc.dict(), declaration_template=template
+            )
+            .json()
+            .encode("utf-8")
+        )
+        if cache_key is not None:
+            TRANSFORM_CACHE.set(cache_key, declaration)
+        return b'{"index":%d,"declaration":%s}\n' % (index, declaration)
+    except (
+        AS3JSONDecodeError,
+        AS3TemplateSyntaxError,
+        AS3UndefinedError,
+        AS3TemplateConfigurationError,
+    ) as exc:
+        return _batch_error(index, Error(code=400, message=str(exc)))
+    except Exception as exc:  # pylint: disable=W0703 # reported in the item's line
+        return _batch_error(
+            index, Error(code=400, message=f"{exc.__class__.__name__}: {exc}")
+        )
+
+
+async def _batch_results(
+    template: AS3DeclarationTemplate, template_configurations: List[Any]
+) -> AsyncIterator[bytes]:
+    """Transforms the ``template_configurations`` concurrently on the EXECUTOR and yields the NDJSON lines in order of completion.
+    At most ``EXECUTOR.max_workers`` items of the batch are in flight, items rejected by a full EXECUTOR queue result in an error with code 503.
+    Errors of an item are reported in the item's line, the remaining items are still transformed."""
+
+    async def transform(index: int, template_configuration: Any) -> bytes:
+        try:
+            return await EXECUTOR.run(
+                _batch_transform_item, template, index, template_configuration
+            )
+        except QueueFullError as exc:
+            return _batch_error(index, Error(code=503, message=str(exc)))
+        except Exception as exc:  # pylint: disable=W0703 # reported in the item's line
+            return _batch_error(
+                index, Error(code=500, message=f"{exc.__class__.__name__}: {exc}")
+            )
+
+    items = enumerate(template_configurations)
+    pending: set = set()
+    try:
+        while True:
+            for index, template_configuration in islice(
+                items, EXECUTOR.max_workers - len(pending)
+            ):
+                pending.add(
+                    asyncio.ensure_future(transform(index, template_configuration))
+                )
+            if not pending:
+                return
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:  # only left when the client disconnected
+            task.cancel()
+
+
+@api.post("/declaration/transform")
+async def post_declaration_transform(as3d: AS3Declare, request: Request):
+    """Transforms an AS3 declaration template, see ``AS3Declare`` for details on the expected input. Returns the AS3 Declaration.
+    Results of templates which only depend on their input are cached, templates using functions or filters like
+    ``uuid``, ``env``, ``vault`` or ``readfile`` or including files are always transformed."""
+    return await _json_response(request, _transform, as3d)
+
+
+@api.post(
+    "/declaration/transform/validate", response_model=AS3TransformValidationResult
+)
+async def post_declaration_transform_validate(
+    as3d: AS3Declare,
+    request: Request,
+    version: str = Query(
+        "latest",
+        title="AS3 Schema version to validation against, auto to use the schemaVersion of the declaration",
+    ),
+    max_errors: Optional[int] = Query(
+        None, ge=1, title="Maximum number of validation errors to return"
+    ),
+    max_context_depth: Optional[int] = Query(
+        None, ge=0, title="Maximum depth of the validation error context"
+    ),
+):
+    """Transforms an AS3 declaration template, see ``AS3Declare`` for details on the expected input,
+    and validates the AS3 Declaration against AS3 Schema of ``version`` (Default: latest) in one request.
+    Returns the AS3 Declaration and the validation result, see ``_schema_validate`` for the validation parameters."""
+    return await _json_response(
+        request,
+        _transform_validate,
+        as3d,
+        version,
+        max_errors,
+        max_context_depth,
+        executor=VALIDATION_EXECUTOR,
+    )
+
+
+def _job_response(job: Job, status_code: int = 200) -> Response:
+    """Returns the JobStatus of ``job`` as response, the declaration of a finished job is not re-serialized."""
+    headers = {"Location": f"/api/declaration/transform/git/jobs/{job.id}"}
+    status = job.status
+    if status == "done":
+        return Response(
+            content=b'{"id":"%s","status":"done","declaration":%s,"error":null}'
+            % (job.id.encode("utf-8"), job.future.result()),
+            status_code=status_code,
+            media_type="application/json",
+            headers=headers,
+        )
+    error = None
+    if status == "failed":
+        exc = None if job.future.cancelled() else job.future.exception()
+        if isinstance(exc, HTTPException):
+            error = Error(code=exc.status_code, message=exc.detail)
+        else:
+            error = Error(code=500, message=str(exc) if exc else "job cancelled")
+    return Response(
+        content=JobStatus(id=job.id, status=status, error=error).json(),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+async def _wait_job(job: Job, timeout: float) -> None:
+    """Waits up to ``timeout`` seconds for ``job`` to finish without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    finished = asyncio.Event()
+
+    def notify(_) -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(finished.set)
+
+    job.add_done_callback(notify)
+    try:
+        await asyncio.wait_for(finished.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        job.remove_done_callback(notify)
+
+
+@api.post(
+    "/declaration/transform/raw",
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/AS3Declare"}
+                }
+            },
+            "required": True,
+        }
+    },
+)
+async def post_declaration_transform_raw(request: Request):
+    """Same as ``/declaration/transform``, but the request body is passed as is to the JSON parser in a worker thread,
+    without any model validation or conversion. The request body can be gzip compressed (``Content-Encoding: gzip``)."""
+    return await _json_response(
+        request,
+        _transform_raw,
+        await request.body(),
+        request.headers.get("content-encoding", ""),
+    )
+
+
+@api.post("/declaration/transform/batch")
+async def post_declaration_transform_batch(as3d: AS3DeclareBatch):
+    """Transforms the declaration template with every template configuration, see ``AS3DeclareBatch`` for details on the expected input.
+    The declaration template is compiled once, the AS3 Declarations are transformed concurrently.
+    Returns newline delimited JSON (NDJSON), one line per template configuration in order of completion:
+    ``{"index": <int>, "declaration": {...}}`` or ``{"index": <int>, "error": {"code": <int>, "message": <str>}}``,
+    where ``index`` is the position of the template configuration in ``template_configurations``."""
+    try:
+        template = await _run(AS3DeclarationTemplate, as3d.declaration_template)
+    except AS3TemplateSyntaxError as exc:
+        error = Error(code=400, message=str(exc))
+        raise HTTPException(status_code=error.code, detail=error.message)
+    return StreamingResponse(
+        _batch_results(template, as3d.template_configurations),
+        media_type="application/x-ndjson",
+    )
+
+
+def _preview_error(message_id: Any, error: Error) -> str:
+    """Returns the /declaration/transform/preview error message for the message ``message_id``."""
+    return json.dumps({"id": message_id, "error": error.dict()})
+
+
+def _preview(session: PreviewSession, messages: List[Any], patch: bool) -> List[str]:
+    """Applies the ``messages`` received by the /declaration/transform/preview WebSocket to ``session`` and renders the declaration once.
+    Returns the response messages as JSON: an error for every invalid message, followed by the declaration
+    or the JSON Patch against the previously rendered declaration if ``patch`` is True, or the rendering error."""
+    responses: List[str] = []
+    message_id: Any = None
+    updated = False
+    for message in messages:
+        try:
+            update = PreviewUpdate.parse_raw(message)
+        except ValidationError as exc:
+            responses.append(_preview_error(None, Error(code=400, message=str(exc))))
+            continue
+        message_id = update.id
+        try:
+            session.update(
+                declaration_template=update.declaration_template,
+                template_edits=[edit.dict() for edit in update.template_edits or ()],
+                template_configuration=update.template_configuration,
+                configuration_patch=update.configuration_patch,
+            )
+            updated = True
+        except ValueError as exc:  # includes AS3TemplateConfigurationError
+            responses.append(
+                _preview_error(message_id, Error(code=400, message=str(exc)))
+            )
+        except Exception as exc:  # pylint: disable=W0703 # invalid updates are reported to the client
+            responses.append(
+                _preview_error(
+                    message_id,
+                    Error(code=400, message=f"{exc.__class__.__name__}: {exc}"),
+                )
+            )
+    if not updated:
+        return responses
+
+    previous = session.declaration
+    try:
+        declaration = session.render()
+    except (
+        ValueError,  # includes AS3JSONDecodeError
+        AS3TemplateSyntaxError,
+        AS3UndefinedError,
+    ) as exc:
+        responses.append(_preview_error(message_id, Error(code=400, message=str(exc))))
+        return responses
+    except Exception as exc:  # pylint: disable=W0703 # template errors are reported to the client
+        responses.append(
+            _preview_error(
+                message_id,
+                Error(code=400, message=f"{exc.__class__.__name__}: {exc}"),
+            )
+        )
+        return responses
+
+    if patch and previous is not None:
+        responses.append(
+            json.dumps({"id": message_id, "patch": make_patch(previous, declaration)})
+        )
+    else:
+        responses.append(json.dumps({"id": message_id, "declaration": declaration}))
+    return responses
+
+
+_PREVIEW_OVERFLOW = object()
+
+
+async def _preview_receive(websocket: WebSocket, messages: asyncio.Queue) -> None:
+    """Puts the messages received by ``websocket`` into ``messages``, None when the client disconnected.
+    Puts ``_PREVIEW_OVERFLOW`` and stops receiving when ``AS3N_API_PREVIEW_QUEUE_SIZE`` messages are waiting,
+    ``messages`` must have room for one more item."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            messages.put_nowait(None)
+            return
+        if messages.qsize() >= NINJASETTINGS.API_PREVIEW_QUEUE_SIZE:
+            messages.put_nowait(_PREVIEW_OVERFLOW)
+            return
+        text = message.get("text")
+        messages.put_nowait(text if text is not None else message.get("bytes", b""))
+
+
+@api.websocket("/declaration/transform/preview")
+async def websocket_declaration_transform_preview(
+    websocket: WebSocket,
+    patch: bool = Query(
+        False, title="Respond with a JSON Patch against the previous declaration"
+    ),
+):
+    """Live preview of an AS3 declaration template. The session keeps the compiled declaration template and the merged template configuration.
+    Every message (see ``PreviewUpdate``) replaces or edits the declaration template and the template configuration.
+    Messages received within ``AS3N_API_PREVIEW_DEBOUNCE`` seconds of each other are applied together and rendered once,
+    up to ``AS3N_API_PREVIEW_MAX_BATCH`` messages per rendering.
+    Responds with ``{"id": <id>, "declaration": {...}}``, with ``patch`` the first declaration followed by
+    ``{"id": <id>, "patch": [...]}``, a JSON Patch against the previous declaration.
+    Errors are returned as ``{"id": <id>, "error": {"code": <int>, "message": <str>}}``, the session is kept.
+    Clients sending more than ``AS3N_API_PREVIEW_QUEUE_SIZE`` messages while a rendering is in progress
+    receive an error with code 429 and the connection is closed (1008 policy violation)."""
+    await websocket.accept()
+    session = PreviewSession()
+    # one more item for None or _PREVIEW_OVERFLOW
+    messages: asyncio.Queue = asyncio.Queue(NINJASETTINGS.API_PREVIEW_QUEUE_SIZE + 1)
+    receiver = asyncio.ensure_future(_preview_receive(websocket, messages))
+    try:
+        while True:
+            batch = [await messages.get()]
+            # debounce, wait until the client pauses or the batch is full
+            while (
+                isinstance(batch[-1], (str, bytes))
+                and len(batch) < NINJASETTINGS.API_PREVIEW_MAX_BATCH
+            ):
+                try:
+                    batch.append(
+                        await asyncio.wait_for(
+                            messages.get(), NINJASETTINGS.API_PREVIEW_DEBOUNCE
+                        )
+                    )
+                except asyncio.TimeoutError:
+                    break
+            if batch[-1] is None:
+                return  # client disconnected
+            if batch[-1] is _PREVIEW_OVERFLOW:
+                error = Error(
+                    code=429,
+                    message=f"More than {NINJASETTINGS.API_PREVIEW_QUEUE_SIZE} messages are waiting",
+                )
+                await websocket.send_text(_preview_error(None, error))
+                await websocket.close(code=1008)  # policy violation
+                return
+            try:
+                responses = await _run(_preview, session, batch, patch)
+            except HTTPException as exc:  # queue full
+                responses = [
+                    _preview_error(
+                        None, Error(code=exc.status_code, message=exc.detail)
+                    )
+                ]
+            for response in responses:
+                await websocket.send_text(response)
+    finally:
+        receiver.cancel()
+
+
+@api.post("/declaration/transform/git")
+async def post_declaration_git_transform(as3d: AS3DeclareGit, request: Request):
+    """Transforms an AS3 declaration template, see ``AS3DeclareGit`` for details on the expected input. Returns the AS3 Declaration.
+    Concurrent identical requests for the same repository, commit, template configuration and declaration template are coalesced:
+    they share a single clone and transformation and receive the same result."""
+    key = await _git_transform_key(as3d)
+    if key is None:
+        return await _json_response(
+            request, _git_transform, as3d, executor=GIT_EXECUTOR
+        )
+    encoding = _negotiate_encoding(request)
+    body, encoding = await GIT_TRANSFORMS.run(
+        (*key, encoding),
+        partial(
+            _run,
+            _compressed_result,
+            encoding,
+            _git_transform,
+            as3d,
+            executor=GIT_EXECUTOR,
+        ),
+    )
+    return _body_response(body, encoding)
+
+
+@api.post("/declaration/transform/git/jobs", status_code=202, response_model=JobStatus)
+async def post_declaration_git_transform_job(as3d: AS3DeclareGit):
+    """Submits a job to transform an AS3 declaration template from a Git repository, see ``AS3DeclareGit`` for details on the expected input.
+    Returns HTTP 202 with the job id immediately, the Location header points to the job status.
+    Use ``/declaration/transform/git/jobs/{job_id}`` to get the AS3 Declaration when the job is done."""
+    try:
+        future = GIT_EXECUTOR.submit(_git_transform, as3d)
+    except QueueFullError as exc:
+        raise _queue_full(exc) from exc
+    return _job_response(JOBS.add(future), status_code=202)
+
+
+@api.get("/declaration/transform/git/jobs/{job_id}", response_model=JobStatus)
+async def get_declaration_git_transform_job(
+    job_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=NINJASETTINGS.API_JOB_MAX_WAIT,
+        title="Seconds to wait for the job to finish (long-polling)",
+    ),
+):
+    """Returns the status of a job submitted to ``/declaration/transform/git/jobs``, including the AS3 Declaration when it is done
+    or the error when it failed. With ``wait`` the response is delayed until the job finished or ``wait`` seconds passed.
+    Finished jobs are retained for a limited time, unknown or expired jobs return HTTP 404."""
+    job = JOBS.get(job_id)
+    if job is None:
+        error = Error(code=404, message=f"job {job_id} is unknown or expired")
+        raise HTTPException(status_code=error.code, detail=error.message)
+    if wait and not job.future.done():
+        await _wait_job(job, wait)
+    return _job_response(job)
+
+
 # mount api
 app.mount("/api", api)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Cache backends used by AS3 Ninja.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+__all__ = ["LRUCache", "DiskCache"]
+
+
+class LRUCache:
+    """In-memory cache with least recently used eviction.
+
+    :param max_entries: Maximum number of entries, the least recently used entry is evicted when exceeded (Default value = 1024)
+    :param max_bytes: Maximum total size (``len``) of the values, the least recently used entries are evicted when exceeded (Default value = None, unlimited)
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the value for ``key``, ``default`` if ``key`` is not cached.
+
+        :param key: Cache key
+        :param default: Value to return if ``key`` is not cached (Default value = None)
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+    def _size(self, value: Any) -> int:
+        """Private Method: returns the size of ``value`` counted against ``max_bytes``."""
+        return len(value) if self._max_bytes is not None else 0
+
+    def set(self, key: str, value: Any) -> None:
+        """Adds or updates ``key`` with ``value``.
+
+        :param key: Cache key
+        :param value: Value to cache, must support ``len`` if ``max_bytes`` is set
+        """
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._size(self._entries[key])
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._bytes += self._size(value)
+            while len(self._entries) > self._max_entries or (
+                self._max_bytes is not None and self._bytes > self._max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted)
+
+    def delete(self, key: str) -> None:
+        """Removes ``key`` if it is cached.
+
+        :param key: Cache key
+        """
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._size(self._entries.pop(key))
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class DiskCache:
+    """On-disk cache using a SQLite database, can be shared by multiple processes.
+
+    :param path: Path to the SQLite database file, created if it doesn't exist
+    :param max_entries: Maximum number of entries, the least recently used entries are evicted when exceeded (Default value = 65536)
+    :param max_bytes: Maximum total size of the values, the least recently used entries are evicted when exceeded (Default value = None, unlimited)
+
+    Entries exceeding ``max_entries`` or ``max_bytes`` are evicted periodically, every ``_EVICT_INTERVAL`` writes.
+    """
+
+    _SCHEMA = "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, accessed REAL)"
+    _EVICT_INTERVAL = 128  # check for entries to evict every _EVICT_INTERVAL writes
+
+    def __init__(
+        self, path: str, max_entries: int = 65536, max_bytes: Optional[int] = None
+    ):
+        self._path = path
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute(self._SCHEMA)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    @property
+    def path(self) -> str:
+        """Property: returns the path to the SQLite database file."""
+        return self._path
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the value for ``key``, ``default`` if ``key`` is not cached.
+
+        :param key: Cache key
+        :param default: Value to return if ``key`` is not cached (Default value = None)
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+            self._connection.execute(
+                "UPDATE cache SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            return row[0]
+
+    def set(self, key: str, value: Any) -> None:
+        """Adds or updates ``key`` with ``value``.
+
+        :param key: Cache key
+        :param value: Value to cache (``bytes``, ``str``, ``int`` or ``float``)
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, accessed) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._writes += 1
+            if self._writes % self._EVICT_INTERVAL == 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Private Method: removes the least recently used entries exceeding ``max_entries`` and ``max_bytes``."""
+        self._connection.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+        if self._max_bytes is not None:
+            self._connection.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM (SELECT key, SUM(LENGTH(value)) OVER (ORDER BY accessed DESC, key) AS total FROM cache) WHERE total > ?)",
+                (self._max_bytes,),
+            )
+
+    def delete(self, key: str) -> None:
+        """Removes ``key`` if it is cached.
+
+        :param key: Cache key
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._connection.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        """Closes the SQLite database."""
+        with self._lock:
+            self._connection.close()
@@ -8,6 +8,7 @@ AS3 Ninja CLI module
 
 import json
 import sys
+from itertools import islice
 from typing import Any, List, Optional, Union
 
 import click
@@ -15,6 +16,7 @@ import yaml
 from loguru import logger
 
 from . import __version__
+from .analysis import address_report
 from .declaration import AS3Declaration
 from .exceptions import AS3ValidationError
 from .gitget import Gitget
@@ -253,19 +255,48 @@ def git_transform(  # pylint: disable=R0913 # Too many arguments
     default="latest",
     help="AS3 Schema version to use for validation (e.g. 3.16.0)",
 )
+@click.option(
+    "--max-errors",
+    required=False,
+    default=None,
+    type=click.IntRange(min=1),
+    help="Report up to this number of validation errors instead of the first error only",
+)
+@click.option(
+    "--max-context-depth",
+    required=False,
+    default=None,
+    type=click.IntRange(min=0),
+    help="Maximum depth of the reported validation error context",
+)
 @failOnException
 @LOG_STDERR.catch(reraise=True)
 def validate(
     declaration: str,
     version: Optional[str],
+    max_errors: Optional[int],
+    max_context_depth: Optional[int],
 ):
     """Validate an AS3 Declaration against the AS3 JSON Schema.
 
     If no version is specified, the latest available version is used."""
     as3s = AS3Schema(version=version)
     _declaration = deserialize(declaration.name)
+    errors: List[AS3ValidationError] = []
     try:
-        as3s.validate(declaration=_declaration)
+        if max_errors:
+            errors = list(
+                islice(
+                    as3s.iter_errors(
+                        declaration=_declaration, max_context_depth=max_context_depth
+                    ),
+                    max_errors,
+                )
+            )
+            if errors:
+                raise errors[0]
+        else:
+            as3s.validate(declaration=_declaration, max_context_depth=max_context_depth)
         LOG_STDOUT.info(
             "Validation passed for AS3 Schema version: {}",
             as3s.version,
@@ -284,9 +315,81 @@ def validate(
                     subexc,
                     feature="f-strings",
                 )
+        for error in errors[1:]:
+            LOG_STDERR.info(
+                "\n{}\n",
+                error,
+                feature="f-strings",
+            )
         raise exc
 
 
+@cli.command()
+@click.option(
+    "-d",
+    "--declaration",
+    required=True,
+    type=click.File("r"),
+    help="AS3 Declaration file (JSON) to analyze",
+)
+@click.option(
+    "--cross-tenant",
+    is_flag=True,
+    default=False,
+    help="Only report duplicate or overlapping addresses used by different Tenants",
+)
+@click.option(
+    "--json",
+    "output_json",
+    is_flag=True,
+    default=False,
+    help="Format output as JSON.",
+)
+@failOnException
+@LOG_STDERR.catch(reraise=True)
+def addresses(declaration: Any, cross_tenant: bool, output_json: bool):
+    """Report duplicate and overlapping IP addresses of an AS3 Declaration.
+
+    Addresses are compared per route domain, addresses without route domain use the defaultRouteDomain of their Tenant.
+    Exits with a non-zero exit code when duplicates or overlaps are found."""
+    report = address_report(deserialize(declaration.name), cross_tenant=cross_tenant)
+
+    if output_json:
+        click.echo(report.json())
+    else:
+        for duplicate in report.duplicates:
+            click.echo(
+                f"duplicate (route domain {duplicate.route_domain}): "
+                + ", ".join(
+                    f"{location.address} at {location.pointer}"
+                    for location in duplicate.locations
+                )
+            )
+        for overlap in report.overlaps:
+            click.echo(
+                f"overlap (route domain {overlap.route_domain}): "
+                + ", ".join(
+                    f"{location.address} at {location.pointer}"
+                    for location in overlap.contained
+                )
+                + " within "
+                + ", ".join(
+                    f"{location.address} at {location.pointer}"
+                    for location in overlap.network
+                )
+            )
+        LOG_STDOUT.info(
+            "Analyzed {} addresses: {} duplicates, {} overlaps",
+            report.addresses,
+            len(report.duplicates),
+            len(report.overlaps),
+            feature="f-strings",
+        )
+
+    if report.duplicates or report.overlaps:
+        sys.exit(1)
+
+
 @cli.group(context_settings=dict(help_option_names=["-h", "--help"]))
 def schema() -> None:
     """Group of AS3 Schema related commands."""
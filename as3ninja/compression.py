@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Compression of API responses with gzip and, if the optional ``brotli`` package is installed, brotli.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+import gzip
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli  # optional dependency
+except ImportError:
+    brotli = None  # pylint: disable=C0103
+
+__all__ = ["ENCODINGS", "compress", "negotiate_encoding"]
+
+# supported content encodings in order of preference
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _qualities(accept_encoding: str) -> Dict[str, float]:
+    """Returns the quality values (q) of the content codings of the Accept-Encoding header value ``accept_encoding``."""
+    qualities = {}
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        params = params.strip()
+        try:
+            qualities[name.strip()] = (
+                float(params[2:]) if params.startswith("q=") else 1.0
+            )
+        except ValueError:
+            qualities[name.strip()] = 0.0
+    return qualities
+
+
+def negotiate_encoding(
+    accept_encoding: str, encodings: Tuple[str, ...] = ENCODINGS
+) -> Optional[str]:
+    """Returns the content encoding of ``encodings`` to use for the Accept-Encoding header value ``accept_encoding``, None for no compression.
+    The encoding with the highest quality value is used, ties are resolved by the order of ``encodings``.
+    An explicit entry for an encoding takes precedence over ``*``.
+
+    :param accept_encoding: Accept-Encoding header value
+    :param encodings: Supported encodings in order of preference (Default value = ENCODINGS)
+    """
+    qualities = _qualities(accept_encoding)
+    negotiated, best = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best:
+            negotiated, best = encoding, quality
+    return negotiated
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compresses ``data`` with ``encoding`` ("gzip" or "br").
+    Uses fast compression settings for dynamic responses, ``best`` compresses best for responses compressed only once.
+
+    :param data: Data to compress
+    :param encoding: Content encoding
+    :param best: Use the best compression (Default value = False)
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11 if best else 5)
+    raise ValueError(f"unsupported content encoding: {encoding}")
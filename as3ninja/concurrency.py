@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded execution of blocking tasks outside of the asyncio event loop.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .exceptions import QueueFullError
+
+__all__ = ["BoundedExecutor", "SingleFlight"]
+
+
+class BoundedExecutor:
+    """Thread pool executor with a bounded queue.
+
+    At most ``max_workers`` tasks run concurrently and at most ``max_queue`` tasks wait for a worker.
+    Tasks submitted while the queue is full are rejected with :py:class:`as3ninja.exceptions.QueueFullError`
+    instead of waiting, which allows callers to apply backpressure.
+
+    :param max_workers: Maximum number of concurrently running tasks (Default value = 4)
+    :param max_queue: Maximum number of tasks waiting for a worker (Default value = 16)
+    :param retry_after: Seconds after which rejected tasks should be retried (Default value = 1)
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16, retry_after: int = 1):
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._retry_after = retry_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="as3ninja"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+
+    @property
+    def max_workers(self) -> int:
+        """Property: returns the maximum number of concurrently running tasks."""
+        return self._max_workers
+
+    @property
+    def max_queue(self) -> int:
+        """Property: returns the maximum number of tasks waiting for a worker."""
+        return self._max_queue
+
+    @property
+    def pending(self) -> int:
+        """Property: returns the number of running and waiting tasks."""
+        return self._pending
+
+    @property
+    def running(self) -> int:
+        """Property: returns the number of running tasks."""
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        """Property: returns the number of tasks waiting for a worker (queue depth)."""
+        return max(self._pending - self._running, 0)
+
+    @property
+    def rejected(self) -> int:
+        """Property: returns the number of tasks rejected because the queue was full."""
+        return self._rejected
+
+    def _release(self, _: Future) -> None:
+        """Private Method: releases the slot of a finished task."""
+        with self._lock:
+            self._pending -= 1
+
+    def _execute(self, function: Callable, *args, **kwargs) -> Any:
+        """Private Method: executes ``function(*args, **kwargs)`` in a worker and counts it as running."""
+        with self._lock:
+            self._running += 1
+        try:
+            return function(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """Submits ``function(*args, **kwargs)`` for execution and returns its Future.
+        Raises QueueFullError if the maximum number of running and waiting tasks is reached.
+
+        :param function: Callable to execute
+        """
+        with self._lock:
+            if self._pending >= self._max_workers + self._max_queue:
+                self._rejected += 1
+                raise QueueFullError(
+                    f"too many pending tasks, retry after {self._retry_after} seconds",
+                    retry_after=self._retry_after,
+                )
+            self._pending += 1
+        try:
+            future = self._executor.submit(self._execute, function, *args, **kwargs)
+        except BaseException:
+            self._release(None)  # type: ignore
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """Runs ``function(*args, **kwargs)`` in a worker thread and returns its result without blocking the event loop.
+        The ``contextvars`` context of the caller is propagated to the worker.
+        Raises QueueFullError if the maximum number of running and waiting tasks is reached.
+
+        :param function: Callable to execute
+        """
+        context = contextvars.copy_context()
+        return await asyncio.wrap_future(
+            self.submit(context.run, partial(function, *args, **kwargs))
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the executor.
+
+        :param wait: Wait for running tasks to finish (Default value = True)
+        """
+        self._executor.shutdown(wait=wait)
+
+
+class SingleFlight:
+    """Coalesces concurrent identical asyncio calls.
+
+    The first call for a ``key`` starts the coroutine, concurrent calls for the same ``key``
+    wait for the same in-flight execution and receive its result or exception.
+    The key is forgotten as soon as the execution finished, later calls start a new execution.
+    Cancelling a waiting caller does not cancel the shared execution.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def inflight(self) -> int:
+        """Property: returns the number of in-flight executions."""
+        return len(self._inflight)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """Private Method: forgets the finished execution of ``key``."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # retrieved by the callers, avoids "exception was never retrieved" warnings
+
+    async def run(self, key: Hashable, function: Callable[[], Awaitable]) -> Any:
+        """Returns the result of ``function()``, shared with all concurrent calls using the same ``key``.
+
+        :param key: Hashable key identifying identical calls
+        :param function: Callable returning the awaitable to execute
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(function())
+            self._inflight[key] = future
+            future.add_done_callback(partial(self._forget, key))
+        return await asyncio.shield(future)
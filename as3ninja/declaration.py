@@ -7,7 +7,7 @@ The AS3Declaration module. Represents an AS3 Declaration as a python class.
 # pylint: disable=C0301 # Line too long
 
 import json
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 from jinja2 import (
     ChoiceLoader,
@@ -15,13 +15,80 @@ from jinja2 import (
     Environment,
     FileSystemLoader,
     StrictUndefined,
+    Template,
 )
 from jinja2.exceptions import TemplateSyntaxError, UndefinedError
 
 from .exceptions import AS3JSONDecodeError, AS3TemplateSyntaxError, AS3UndefinedError
 from .jinja2 import J2Ninja
 
-__all__ = ["AS3Declaration"]
+__all__ = ["AS3Declaration", "AS3DeclarationTemplate"]
+
+
+class AS3DeclarationTemplate:
+    """Compiled Declaration Template, which renders AS3 Declarations for any number of Template Configurations.
+
+    The jinja2 environment is created and the template is parsed and compiled once on instantiation.
+    Rendering is thread-safe, every render uses its own template globals.
+    Instances can be passed as ``declaration_template`` to :py:class:`AS3Declaration`.
+
+    On jinja2 template syntax errors raises AS3TemplateSyntaxError.
+
+    :param declaration_template: Declaration Template as ``str``
+    :param jinja2_searchpath: The jinja2 search path for the FileSystemLoader. Important for jinja2 includes. (Default value = ``"."``)
+    """
+
+    def __init__(self, declaration_template: str, jinja2_searchpath: str = "."):
+        self._declaration_template = declaration_template
+        self._jinja2_searchpath = jinja2_searchpath
+        self._environment = Environment(  # nosec (bandit: autoescaping is not helpful for as3ninja's use-case)
+            loader=ChoiceLoader(
+                [
+                    DictLoader({"template": declaration_template}),
+                    FileSystemLoader(searchpath=jinja2_searchpath),
+                ]
+            ),
+            trim_blocks=False,
+            lstrip_blocks=False,
+            keep_trailing_newline=True,
+            undefined=StrictUndefined,
+            autoescape=False,
+        )
+        self._environment.globals["jinja2_searchpath"] = jinja2_searchpath + "/"
+        self._environment.globals.update(J2Ninja.functions)
+        self._environment.filters.update(J2Ninja.filters)
+        self._environment.tests.update(J2Ninja.tests)
+        try:
+            self._code = self._environment.compile(declaration_template, "template")
+        except TemplateSyntaxError as exc:
+            raise AS3TemplateSyntaxError(
+                "AS3 declaration template caused jinja2 syntax error",
+                declaration_template,
+                exc,
+            )
+
+    @property
+    def declaration_template(self) -> str:
+        """Property contains the declaration template source"""
+        return self._declaration_template
+
+    @property
+    def jinja2_searchpath(self) -> str:
+        """Property contains the jinja2 search path"""
+        return self._jinja2_searchpath
+
+    def render(self, template_configuration: Dict) -> str:
+        """Renders the declaration template using ``template_configuration``, available as ``ninja`` in the template.
+        Raises relevant jinja2 exceptions which need to be handled by the caller.
+
+        :param template_configuration: AS3 Template Configuration as ``dict``
+        """
+        template = Template.from_code(
+            self._environment,
+            self._code,
+            self._environment.make_globals({"ninja": template_configuration}),
+        )
+        return template.render()
 
 
 class AS3Declaration:
@@ -31,21 +98,27 @@ class AS3Declaration:
     If a list is provided, the member dicts will be merged using :py:meth:`_dict_deep_update`.
 
     Optionally a jinja2 declaration_template can be provided, otherwise it is read from the configuration.
+    The declaration_template can also be a pre-compiled :py:class:`AS3DeclarationTemplate`, which is re-used.
     The template file reference is expected to be at `as3ninja.declaration_template` within the configuration.
     An explicitly specified declaration_template takes precedence over any included template.
 
     :param template_configuration: AS3 Template Configuration as ``dict`` or ``list``
-    :param declaration_template: Optional Declaration Template as ``str`` (Default value = ````)
+    :param declaration_template: Optional Declaration Template as ``str`` or ``AS3DeclarationTemplate`` (Default value = ````)
     :param jinja2_searchpath: The jinja2 search path for the FileSystemLoader. Important for jinja2 includes. (Default value = ``"."``)
     """
 
     def __init__(
         self,
         template_configuration: Dict,
-        declaration_template: Optional[str] = None,
+        declaration_template: Optional[Union[str, AS3DeclarationTemplate]] = None,
         jinja2_searchpath: str = ".",
     ):
         self._template_configuration = template_configuration
+        self._compiled_template: Optional[AS3DeclarationTemplate] = None
+        if isinstance(declaration_template, AS3DeclarationTemplate):
+            self._compiled_template = declaration_template
+            declaration_template = declaration_template.declaration_template
+            jinja2_searchpath = self._compiled_template.jinja2_searchpath
         self._declaration_template = declaration_template or ""
         self._jinja2_searchpath = jinja2_searchpath
 
@@ -82,26 +155,11 @@ class AS3Declaration:
         """Renders the declaration using jinja2.
         Raises relevant exceptions which need to be handled by the caller.
         """
-        env = Environment(  # nosec (bandit: autoescaping is not helpful for as3ninja's use-case)
-            loader=ChoiceLoader(
-                [
-                    DictLoader({"template": self.declaration_template}),
-                    FileSystemLoader(searchpath=self._jinja2_searchpath),
-                ]
-            ),
-            trim_blocks=False,
-            lstrip_blocks=False,
-            keep_trailing_newline=True,
-            undefined=StrictUndefined,
-            autoescape=False,
-        )
-        env.globals["jinja2_searchpath"] = self._jinja2_searchpath + "/"
-        env.globals["ninja"] = self._template_configuration
-        env.globals.update(J2Ninja.functions)
-        env.filters.update(J2Ninja.filters)
-        env.tests.update(J2Ninja.tests)
-
-        return env.get_template("template").render()
+        if self._compiled_template is None:
+            self._compiled_template = AS3DeclarationTemplate(
+                self.declaration_template, jinja2_searchpath=self._jinja2_searchpath
+            )
+        return self._compiled_template.render(self._template_configuration)
 
     def _transform(self) -> None:
         """Transforms the declaration_template using the template_configuration to an AS3 declaration.
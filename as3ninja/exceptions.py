@@ -18,6 +18,7 @@ __all__ = [
     "AS3SchemaError",
     "AS3ValidationError",
     "AS3TemplateConfigurationError",
+    "QueueFullError",
 ]
 
 
@@ -179,3 +180,14 @@ class AS3ValidationError(ValidationError):
             )
         else:
             super().__init__(message=message)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a task is submitted to a BoundedExecutor whose queue is full.
+
+    :param retry_after: Seconds after which the task should be retried
+    """
+
+    def __init__(self, message: str = "", retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -135,6 +135,43 @@ class Gitget:
 
         return shlex.quote(str(arg))
 
+    @classmethod
+    def remote_commit(cls, repository: str, branch: Optional[str] = None) -> str:
+        """Method: returns the commit id ``branch`` of the remote ``repository`` points to, using ``git ls-remote`` without cloning the repository.
+        ``branch`` can be a branch or tag, the remote default branch (HEAD) is used if not specified. Raises GitgetException on failure.
+
+        :param repository: Git Repository URL.
+        :param branch: Optional. Branch or Tag. (Default value = None)
+        """
+        result = cls._run_git(
+            cls._gitcmd
+            + (
+                "ls-remote",
+                cls._sh_quote(repository),
+                cls._sh_quote(branch) if branch else "HEAD",
+            )
+        )
+        refs = {}
+        for line in result.splitlines():
+            commit_id, _, ref = line.partition("\t")
+            refs[ref] = commit_id
+        if branch:
+            # prefer branches over tags, annotated tags are resolved to their commit (^{})
+            candidates = [
+                f"refs/heads/{branch}",
+                f"refs/tags/{branch}^{{}}",
+                f"refs/tags/{branch}",
+                branch,
+            ]
+        else:
+            candidates = ["HEAD"]
+        for candidate in candidates:
+            if candidate in refs:
+                return refs[candidate]
+        raise GitgetException(
+            f"Gitget failed to resolve {branch or 'HEAD'} of repository {repository}"
+        )
+
     def _clone(self):
         """Private Method: clones git repository"""
         self._run_command(
@@ -189,18 +226,27 @@ class Gitget:
             self._gitlog["branch"] = result.rstrip()
 
     def _run_command(self, cmd: tuple) -> str:
+        """Private Method: runs a git command in the repodir, see :meth:`_run_git`
+
+        :param cmd: list of command + arguments
+        """
+        return Gitget._run_git(self._gitcmd + cmd, cwd=self._repodir)
+
+    @staticmethod
+    def _run_git(cmd: tuple, cwd: Optional[str] = None) -> str:
         """Private Method: runs a shell command and handles/raises exceptions based on the command return code
 
         :param cmd: list of command + arguments
+        :param cwd: Optional. Working directory of the command. (Default value = None)
         """
         result = None
         try:
             # exclude None types from command
             cmd = tuple(command for command in cmd if command)
             result = run(  # nosec (bandit: disable subprocess.run check)
-                self._gitcmd + cmd,
+                cmd,
                 shell=False,
-                cwd=self._repodir,
+                cwd=cwd,
                 check=False,
                 stdout=PIPE,
                 stderr=PIPE,
@@ -3,7 +3,7 @@
 Jinja2 filters, functions and tests module for AS3 Ninja.
 """
 
-from . import filterfunctions, filters, functions, tests
+from . import filterfunctions, filters, functions, network, tests
 from .. import vault
 from .j2ninja import J2Ninja
 
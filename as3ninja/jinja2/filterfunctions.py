@@ -52,6 +52,7 @@ def b64decode(data: Union[str, bytes], urlsafe: bool = False) -> Union[str, byte
         return b64
 
 
+@J2Ninja.registeruncacheable
 @J2Ninja.registerfilter
 @J2Ninja.registerfunction
 @pass_context
@@ -133,6 +134,7 @@ def to_list(data: Any) -> list:
     return list(data)
 
 
+@J2Ninja.registeruncacheable
 @J2Ninja.registerfilter
 @J2Ninja.registerfunction
 def env(env_var: str, default: Optional[Union[str, int]] = None) -> str:
@@ -161,6 +163,7 @@ def env(env_var: str, default: Optional[Union[str, int]] = None) -> str:
     return str(os.getenv(env_var, default=default))
 
 
+@J2Ninja.registeruncacheable
 @J2Ninja.registerfilter
 @J2Ninja.registerfunction
 def uuid(_=None) -> str:
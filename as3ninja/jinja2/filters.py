@@ -11,6 +11,7 @@ from jinja2.runtime import Context
 
 from .j2ninja import J2Ninja
 
+@J2Ninja.registeruncacheable
 @J2Ninja.registerfilter
 @pass_context
 def ninjutsu(ctx: Context, value: str, **kwargs: dict) -> str:
@@ -13,6 +13,7 @@ from .j2ninja import J2Ninja
 from ..utils import deserialize
 
 
+@J2Ninja.registeruncacheable
 @J2Ninja.registerfunction
 class iterfiles:
     """iterates files, returns a tuple of all globbing matches and the file content as dict.
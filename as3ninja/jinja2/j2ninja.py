@@ -8,11 +8,14 @@ class J2Ninja:
     """
     J2Ninja provides decorator methods to register jinja2 filters,
     functions and tests, which are available as class attributes (dict).
+    Names of filters and functions which are not deterministic or perform I/O
+    are collected in the class attribute ``uncacheable`` (set).
     """
 
     filters: dict = {}
     functions: dict = {}
     tests: dict = {}
+    uncacheable: set = set()
 
     @classmethod
     def registertest(cls, function):
@@ -31,3 +34,9 @@ class J2Ninja:
         """Decorator to register a jinja2 function"""
         cls.functions[function.__name__] = function
         return function
+
+    @classmethod
+    def registeruncacheable(cls, function):
+        """Decorator to mark a jinja2 filter or function as not deterministic or performing I/O"""
+        cls.uncacheable.add(function.__name__)
+        return function
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+This module holds Jinja2 functions for IP address and network calculations, which also work as filters.
+
+Addresses are in F5 notation ``addr%rdid/mask`` and are parsed with :py:func:`as3ninja.types.parse_f5ip`.
+Calculations are done on the integer representation of the addresses and the route domain is kept in the results.
+Functions which can return many addresses return lazy iterators.
+"""
+
+# pylint: disable=C0330 # Wrong hanging indentation before block
+# pylint: disable=C0301 # Line too long
+
+import ipaddress
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ..types import ParsedF5IP, parse_f5ip
+from .j2ninja import J2Ninja
+
+__all__ = [
+    "cidr_contains",
+    "cidr_hosts",
+    "cidr_size",
+    "ip_range",
+    "next_free_ip",
+    "is_f5ip",
+    "is_f5ipv4",
+    "is_f5ipv6",
+]
+
+
+def _format(address: int, version: int, rdid: str = "") -> str:
+    """Formats ``address`` as str in F5 notation, including the route domain ``rdid`` if specified.
+
+    :param address: The address as int
+    :param version: IP version
+    :param rdid: Route domain id (Default value = "")
+    """
+    if version == 4:
+        addr = f"{address >> 24}.{address >> 16 & 255}.{address >> 8 & 255}.{address & 255}"
+    else:
+        addr = str(ipaddress.IPv6Address(address))
+    if rdid:
+        return f"{addr}%{rdid}"
+    return addr
+
+
+def _hosts_range(network: ParsedF5IP) -> range:
+    """Returns the range of usable host addresses of ``network`` as int.
+    The network and broadcast address of IPv4 networks and the Subnet-Router anycast address of IPv6 networks are excluded,
+    unless the network has a prefix length of 31 or 32 (IPv4) or 127 or 128 (IPv6).
+
+    :param network: The parsed network
+    """
+    first, last = network.first, network.last
+    if network.max_prefixlen - network.prefixlen < 2:
+        return range(first, last + 1)
+    if network.version == 4:
+        return range(first + 1, last)
+    return range(first + 1, last + 1)
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def cidr_contains(network: str, address: str) -> bool:
+    """Returns ``True`` if ``address`` is within ``network``, ``False`` otherwise.
+    ``address`` can be an address or a network, both must use the same IP version and route domain.
+    A route domain which is not specified only matches another unspecified route domain.
+
+    .. code-block:: jinja
+
+        {% if ninja.network | cidr_contains(member) %}
+        ...
+        {% endif %}
+
+    :param network: Network in F5 notation, for example ``192.0.2.0%2/24``
+    :param address: Address or network in F5 notation, for example ``192.0.2.10%2``
+    """
+    parsed_network = parse_f5ip(network)
+    parsed_address = parse_f5ip(address)
+    return (
+        parsed_network.version == parsed_address.version
+        and parsed_network.route_domain == parsed_address.route_domain
+        and parsed_network.first <= parsed_address.first
+        and parsed_address.last <= parsed_network.last
+    )
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def cidr_size(network: str) -> int:
+    """Returns the number of addresses of ``network``.
+
+    :param network: Network in F5 notation, for example ``192.0.2.0/24``
+    """
+    parsed = parse_f5ip(network)
+    return 1 << (parsed.max_prefixlen - parsed.prefixlen)
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def cidr_hosts(network: str, skip: int = 0) -> Iterator[str]:
+    """Returns a lazy iterator of the usable host addresses of ``network`` including its route domain.
+    The network and broadcast address of IPv4 networks and the Subnet-Router anycast address of IPv6 networks are excluded.
+    Use ``skip`` to skip the first host addresses, for example the addresses used by the gateway.
+
+    .. code-block:: jinja
+
+        "serverAddresses": [
+        {% for member in "192.0.2.0%2/29" | cidr_hosts(skip=1) %}
+            "{{ member }}"{{ "," if not loop.last }}
+        {% endfor %}
+        ]
+
+    Addresses are calculated when they are consumed, large networks are not expanded in memory.
+
+    :param network: Network in F5 notation, for example ``192.0.2.0%2/29``
+    :param skip: Number of host addresses to skip (Default value = 0)
+    """
+    parsed = parse_f5ip(network)
+    version, rdid = parsed.version, parsed.rdid
+    hosts = _hosts_range(parsed)
+    return (_format(address, version, rdid) for address in hosts[skip:])
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def ip_range(start: str, end: str) -> Iterator[str]:
+    """Returns a lazy iterator of all addresses from ``start`` to ``end`` (inclusive).
+    ``start`` and ``end`` must use the same IP version and route domain, the route domain is kept in the results.
+
+    .. code-block:: jinja
+
+        {% for address in ip_range("192.0.2.10%2", "192.0.2.20%2") %}
+        ...
+        {% endfor %}
+
+    :param start: First address in F5 notation
+    :param end: Last address in F5 notation
+    """
+    parsed_start = parse_f5ip(start)
+    parsed_end = parse_f5ip(end)
+    if parsed_start.version != parsed_end.version:
+        raise ValueError(f"IP version of '{start}' and '{end}' differ")
+    if parsed_start.route_domain != parsed_end.route_domain:
+        raise ValueError(f"route domain of '{start}' and '{end}' differ")
+    version, rdid = parsed_start.version, parsed_start.rdid
+    return (
+        _format(address, version, rdid)
+        for address in range(parsed_start.first, parsed_end.last + 1)
+    )
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def next_free_ip(network: str, used: Optional[Iterable[str]] = None) -> Optional[str]:
+    """Returns the first usable host address of ``network`` which is not in ``used``, ``None`` if all addresses are used.
+    Networks in ``used`` reserve all of their addresses.
+    Addresses in ``used`` which are not valid, or use a different IP version or route domain, are ignored.
+
+    .. code-block:: jinja
+
+        "virtualAddresses": ["{{ ninja.vip_network | next_free_ip(ninja.allocated) }}"]
+
+    :param network: Network in F5 notation, for example ``192.0.2.0/24``
+    :param used: Addresses or networks in F5 notation already in use (Default value = None)
+    """
+    parsed = parse_f5ip(network)
+    taken: List[Tuple[int, int]] = []
+    for address in used or ():
+        try:
+            parsed_address = parse_f5ip(address)
+        except (TypeError, ValueError):
+            continue
+        if (
+            parsed_address.version == parsed.version
+            and parsed_address.route_domain == parsed.route_domain
+        ):
+            taken.append((parsed_address.first, parsed_address.last))
+    hosts = _hosts_range(parsed)
+    candidate = hosts.start
+    for first, last in sorted(taken):
+        if first > candidate:
+            break
+        candidate = max(candidate, last + 1)
+    if candidate in hosts:
+        return _format(candidate, parsed.version, parsed.rdid)
+    return None
+
+
+def _is_valid(value: str, version: Optional[int] = None) -> bool:
+    """Returns ``True`` if ``value`` is a valid address in F5 notation of IP ``version``, ``False`` otherwise."""
+    try:
+        parse_f5ip(value, version=version)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def is_f5ip(value: str) -> bool:
+    """Returns ``True`` if ``value`` is a valid IPv4 or IPv6 address or network in F5 notation, ``False`` otherwise.
+
+    :param value: Value to check
+    """
+    return _is_valid(value)
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def is_f5ipv4(value: str) -> bool:
+    """Returns ``True`` if ``value`` is a valid IPv4 address or network in F5 notation, ``False`` otherwise.
+
+    :param value: Value to check
+    """
+    return _is_valid(value, version=4)
+
+
+@J2Ninja.registerfilter
+@J2Ninja.registerfunction
+def is_f5ipv6(value: str) -> bool:
+    """Returns ``True`` if ``value`` is a valid IPv6 address or network in F5 notation, ``False`` otherwise.
+
+    :param value: Value to check
+    """
+    return _is_valid(value, version=6)
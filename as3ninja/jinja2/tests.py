@@ -3,4 +3,28 @@
 This module holds Jinja2 tests for AS3 Ninja.
 """
 
-#from .j2ninja import J2Ninja
+from .j2ninja import J2Ninja
+from .network import is_f5ip, is_f5ipv4, is_f5ipv6
+
+
+@J2Ninja.registertest
+def f5ip(value) -> bool:
+    """Tests if ``value`` is a valid IPv4 or IPv6 address or network in F5 notation.
+
+    .. code-block:: jinja
+
+        {% if ninja.address is f5ip %}
+    """
+    return is_f5ip(value)
+
+
+@J2Ninja.registertest
+def f5ipv4(value) -> bool:
+    """Tests if ``value`` is a valid IPv4 address or network in F5 notation."""
+    return is_f5ipv4(value)
+
+
+@J2Ninja.registertest
+def f5ipv6(value) -> bool:
+    """Tests if ``value`` is a valid IPv6 address or network in F5 notation."""
+    return is_f5ipv6(value)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Bookkeeping of asynchronous jobs, for example long running git transformations of the API.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+__all__ = ["Job", "JobStore"]
+
+
+class Job:
+    """An asynchronous job tracking the ``future`` of its work.
+
+    :param future: Future of the work, for example returned by :py:meth:`as3ninja.concurrency.BoundedExecutor.submit`
+    """
+
+    __slots__ = ("id", "future", "created", "finished", "_callbacks", "_lock")
+
+    def __init__(self, future: Future):
+        self.id: str = str(uuid.uuid4())
+        self.future = future
+        self.created: float = time.time()
+        self.finished: Optional[float] = None
+        self._callbacks: List[Callable[[Future], None]] = []
+        self._lock = threading.Lock()
+        future.add_done_callback(self._done)
+
+    def _done(self, future: Future) -> None:
+        """Private Method: calls the callbacks registered with :py:meth:`add_done_callback`."""
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(future)
+
+    def add_done_callback(self, callback: Callable[[Future], None]) -> None:
+        """Method: calls ``callback`` with the future once the job finished, immediately if it already finished.
+        Unlike the callbacks of the future, ``callback`` can be removed with :py:meth:`remove_done_callback`.
+
+        :param callback: Callable taking the future as only argument
+        """
+        with self._lock:
+            if not self.future.done():
+                self._callbacks.append(callback)
+                return
+        callback(self.future)
+
+    def remove_done_callback(self, callback: Callable[[Future], None]) -> None:
+        """Method: removes ``callback`` added with :py:meth:`add_done_callback`, if it was not removed already.
+
+        :param callback: The callback
+        """
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @property
+    def status(self) -> str:
+        """Property: returns the status of the job: "pending", "running", "done" or "failed"."""
+        if not self.future.done():
+            return "running" if self.future.running() else "pending"
+        if self.future.cancelled() or self.future.exception() is not None:
+            return "failed"
+        return "done"
+
+
+class JobStore:
+    """Stores jobs by their id.
+
+    Finished jobs are retained for ``retention`` seconds after they finished.
+    If more than ``max_jobs`` jobs are stored, finished jobs are removed early in order of their creation.
+    Unfinished jobs are never removed, their number is bounded by the executor running them.
+
+    :param retention: Seconds finished jobs are retained (Default value = 300)
+    :param max_jobs: Maximum number of stored jobs (Default value = 1024)
+    """
+
+    def __init__(self, retention: int = 300, max_jobs: int = 1024):
+        self._retention = retention
+        self._max_jobs = max_jobs
+        self._jobs: Dict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @staticmethod
+    def _finished(job: Job, _: Future) -> None:
+        """Private Method: records the time ``job`` finished."""
+        job.finished = time.time()
+
+    def add(self, future: Future) -> Job:
+        """Method: creates and stores a job for ``future`` and returns it.
+
+        :param future: Future of the work
+        """
+        job = Job(future)
+        future.add_done_callback(partial(self._finished, job))
+        with self._lock:
+            self._prune(reserve=1)
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Method: returns the job with ``job_id``, None if the job is unknown or expired.
+
+        :param job_id: Id of the job
+        """
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def _prune(self, reserve: int = 0) -> None:
+        """Private Method: removes expired jobs and the oldest finished jobs exceeding ``max_jobs``.
+
+        :param reserve: Number of jobs to make room for (Default value = 0)
+        """
+        expired = time.time() - self._retention
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.finished is not None
+        ]
+        excess = len(self._jobs) + reserve - self._max_jobs
+        for job_id in finished:
+            if excess > 0 or self._jobs[job_id].finished < expired:
+                del self._jobs[job_id]
+                excess -= 1
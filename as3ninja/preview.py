@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Live preview of AS3 Declarations.
+A PreviewSession keeps the compiled Declaration Template and the merged Template Configuration
+and re-renders the AS3 Declaration after edits of either of them.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .declaration import AS3Declaration, AS3DeclarationTemplate
+from .schema.as3validator import resolve_pointer
+from .templateconfiguration import AS3TemplateConfiguration
+
+__all__ = ["PreviewSession", "apply_patch", "apply_text_edits", "make_patch"]
+
+
+def apply_text_edits(text: str, edits: List[Dict[str, Any]]) -> str:
+    """Returns ``text`` with the ``edits`` applied in order, every edit applies to the result of the previous edit.
+    An edit ``{"start": 4, "end": 7, "text": "new"}`` replaces the characters from offset ``start`` to ``end`` (exclusive) with ``text``.
+    Raises ValueError for edits outside of the text.
+
+    :param text: Text to edit
+    :param edits: List of edits
+    """
+    for edit in edits:
+        start, end = edit["start"], edit["end"]
+        if not 0 <= start <= end <= len(text):
+            raise ValueError(
+                f"Edit from {start} to {end} is outside of the text (length {len(text)})"
+            )
+        text = text[:start] + edit.get("text", "") + text[end:]
+    return text
+
+
+def _unescape(token: str) -> str:
+    """Returns the unescaped JSON pointer reference ``token``."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _escape(token: Any) -> str:
+    """Returns ``token`` escaped as JSON pointer reference token."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _parent(document: Any, path: str) -> Tuple[Any, str]:
+    """Returns the parent container of the value at the JSON pointer ``path`` and the (unescaped) last reference token.
+
+    :param document: JSON document
+    :param path: JSON pointer, must not be the root
+    """
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: '{path}'")
+    parent_path, _, token = path.rpartition("/")
+    parent = resolve_pointer(document, parent_path)
+    if not isinstance(parent, (dict, list)):
+        raise KeyError(f"JSON pointer '{path}' not found")
+    return parent, _unescape(token)
+
+
+def _index(container: list, token: str, path: str, append: bool = False) -> int:
+    """Returns ``token`` as index of ``container``, ``len(container)`` for ``-`` if ``append`` is True.
+    Raises KeyError for indexes which are out of range.
+
+    :param container: The list
+    :param token: Reference token
+    :param path: JSON pointer, for error messages
+    :param append: ``token`` may reference the end of ``container`` (Default value = False)
+    """
+    size = len(container) + 1 if append else len(container)
+    if append and token == "-":
+        return len(container)
+    if token.isdigit() and int(token) < size:
+        return int(token)
+    raise KeyError(f"JSON pointer '{path}' not found")
+
+
+def _add(document: Any, path: str, value: Any) -> Any:
+    """Adds ``value`` at ``path`` and returns the document, see :py:func:`apply_patch`."""
+    if path == "":
+        return value
+    parent, token = _parent(document, path)
+    if isinstance(parent, list):
+        parent.insert(_index(parent, token, path, append=True), value)
+    else:
+        parent[token] = value
+    return document
+
+
+def _remove(document: Any, path: str) -> Any:
+    """Removes and returns the value at ``path``, see :py:func:`apply_patch`."""
+    parent, token = _parent(document, path)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, path))
+    if token not in parent:
+        raise KeyError(f"JSON pointer '{path}' not found")
+    return parent.pop(token)
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Returns a copy of ``document`` with the JSON Patch (RFC 6902) ``patch`` applied, ``document`` is not modified.
+    Raises ValueError if an operation is invalid or fails, the patch is applied completely or not at all.
+
+    :param document: JSON document
+    :param patch: List of JSON Patch operations (``add``, ``remove``, ``replace``, ``move``, ``copy``, ``test``)
+    """
+    document = deepcopy(document)
+    for operation in patch:
+        try:
+            operation_type, path = operation["op"], operation["path"]
+            if operation_type == "add":
+                document = _add(document, path, deepcopy(operation["value"]))
+            elif operation_type == "remove":
+                _remove(document, path)
+            elif operation_type == "replace":
+                resolve_pointer(document, path)  # the value must exist
+                if path != "":
+                    _remove(document, path)
+                document = _add(document, path, deepcopy(operation["value"]))
+            elif operation_type == "move":
+                if path.startswith(operation["from"] + "/"):
+                    raise ValueError(
+                        f"Cannot move '{operation['from']}' into one of its children"
+                    )
+                value = _remove(document, operation["from"])
+                document = _add(document, path, value)
+            elif operation_type == "copy":
+                value = deepcopy(resolve_pointer(document, operation["from"]))
+                document = _add(document, path, value)
+            elif operation_type == "test":
+                if resolve_pointer(document, path) != operation["value"]:
+                    raise ValueError(f"Test of '{path}' failed")
+            else:
+                raise ValueError(f"Unknown operation: '{operation_type}'")
+        except KeyError as exc:
+            raise ValueError(
+                f"Invalid JSON Patch operation {operation}: {exc}"
+            ) from None
+    return document
+
+
+def make_patch(source: Any, target: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Returns the JSON Patch (RFC 6902) which transforms ``source`` into ``target``.
+    Objects are compared by key and arrays by index, changed values are replaced.
+
+    :param source: Source JSON document
+    :param target: Target JSON document
+    :param path: JSON pointer of ``source`` and ``target`` (Default value = "")
+    """
+    if isinstance(source, dict) and isinstance(target, dict):
+        patch: List[Dict[str, Any]] = []
+        for key, value in source.items():
+            key_path = f"{path}/{_escape(key)}"
+            if key not in target:
+                patch.append({"op": "remove", "path": key_path})
+            else:
+                patch.extend(make_patch(value, target[key], key_path))
+        for key, value in target.items():
+            if key not in source:
+                patch.append(
+                    {"op": "add", "path": f"{path}/{_escape(key)}", "value": value}
+                )
+        return patch
+    if isinstance(source, list) and isinstance(target, list):
+        patch = []
+        for index, (value, target_value) in enumerate(zip(source, target)):
+            patch.extend(make_patch(value, target_value, f"{path}/{index}"))
+        for index in range(len(source) - 1, len(target) - 1, -1):
+            patch.append({"op": "remove", "path": f"{path}/{index}"})
+        for index in range(len(source), len(target)):
+            patch.append(
+                {"op": "add", "path": f"{path}/{index}", "value": target[index]}
+            )
+        return patch
+    if type(source) is not type(target) or source != target:
+        return [{"op": "replace", "path": path, "value": target}]
+    return []
+
+
+class PreviewSession:
+    """Live preview session of an AS3 Declaration.
+
+    The session keeps the Declaration Template and the merged Template Configuration, which are changed with :py:meth:`update`.
+    The Declaration Template is compiled once per change and the merged Template Configuration is patched in place of being merged again.
+    :py:meth:`render` renders the AS3 Declaration, the last successfully rendered declaration is available as :py:attr:`declaration`.
+
+    :param jinja2_searchpath: The jinja2 search path for the FileSystemLoader. Important for jinja2 includes. (Default value = ``"."``)
+    """
+
+    def __init__(self, jinja2_searchpath: str = "."):
+        self._jinja2_searchpath = jinja2_searchpath
+        self._declaration_template: str = ""
+        self._template: Optional[AS3DeclarationTemplate] = None
+        self._template_configuration: dict = {}
+        self._declaration: Any = None
+
+    @property
+    def declaration_template(self) -> str:
+        """Property: returns the current Declaration Template."""
+        return self._declaration_template
+
+    @property
+    def template_configuration(self) -> dict:
+        """Property: returns the current merged Template Configuration."""
+        return self._template_configuration
+
+    @property
+    def declaration(self) -> Any:
+        """Property: returns the last successfully rendered AS3 Declaration, None if no declaration was rendered yet."""
+        return self._declaration
+
+    def update(
+        self,
+        declaration_template: Optional[str] = None,
+        template_edits: Optional[List[Dict[str, Any]]] = None,
+        template_configuration: Optional[Union[List[dict], dict]] = None,
+        configuration_patch: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """Method: updates the Declaration Template and the Template Configuration.
+        The update is applied completely or not at all. Raises ValueError for invalid edits or patches
+        and AS3TemplateConfigurationError for invalid Template Configurations.
+
+        :param declaration_template: Replaces the Declaration Template (Default value = None)
+        :param template_edits: Edits of the Declaration Template, see :py:func:`apply_text_edits` (Default value = None)
+        :param template_configuration: Replaces the Template Configuration, lists are merged (Default value = None)
+        :param configuration_patch: JSON Patch of the merged Template Configuration, see :py:func:`apply_patch` (Default value = None)
+        """
+        source = self._declaration_template
+        if declaration_template is not None:
+            source = declaration_template
+        if template_edits:
+            source = apply_text_edits(source, template_edits)
+
+        configuration = self._template_configuration
+        if template_configuration is not None:
+            configuration = AS3TemplateConfiguration(template_configuration).dict()
+        if configuration_patch:
+            configuration = apply_patch(configuration, configuration_patch)
+        if not isinstance(configuration, dict):
+            raise ValueError("Template Configuration must be an object")
+
+        if source != self._declaration_template:
+            self._declaration_template = source
+            self._template = None  # compiled on next render
+        self._template_configuration = configuration
+
+    def render(self) -> Any:
+        """Method: renders and returns the AS3 Declaration.
+        The Declaration Template is only compiled if it changed since the last render.
+        Raises the exceptions of :py:class:`AS3Declaration`, the Declaration Template is kept on errors.
+        """
+        if not self._declaration_template:
+            raise ValueError("Declaration Template is empty")
+        if self._template is None:
+            self._template = AS3DeclarationTemplate(
+                self._declaration_template, jinja2_searchpath=self._jinja2_searchpath
+            )
+        self._declaration = AS3Declaration(
+            template_configuration=self._template_configuration,
+            declaration_template=self._template,
+        ).dict()
+        return self._declaration
@@ -4,5 +4,7 @@ AS3 Schema package.
 """
 
 from .as3schema import AS3Schema
+from .service import AS3SchemaService
+from .validationcache import ValidationCache
 
-__all__ = ["AS3Schema"]
+__all__ = ["AS3Schema", "AS3SchemaService", "ValidationCache"]
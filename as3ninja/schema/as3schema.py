@@ -6,22 +6,159 @@ AS3 Schema Class module. Represents the AS3 JSON Schema as a python class.
 # pylint: disable=C0330 # Wrong hanging indentation before block
 # pylint: disable=C0301 # Line too long
 
+import hashlib
 import json
+import re
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
 
-from jsonschema import Draft7Validator
-from jsonschema.exceptions import RefResolutionError, SchemaError, ValidationError
+from jsonschema import RefResolver, TypeChecker
+from jsonschema.exceptions import (
+    RefResolutionError,
+    SchemaError,
+    ValidationError,
+    best_match,
+)
 
 from ..exceptions import AS3SchemaError, AS3SchemaVersionError, AS3ValidationError
 from ..gitget import Gitget
 from ..settings import NINJASETTINGS
+from ..cache import LRUCache
+from .as3validator import (
+    AS3Validator,
+    class_dispatch_prune,
+    class_dispatch_update,
+    prune_definitions,
+    resolve_refs,
+)
 from .formatcheckers import AS3FormatChecker
+from .validationcache import ValidationCache
 
 __all__ = ["AS3Schema"]
 
+_VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)(?:\.(\d+))?")
+
+
+def _parse_version(version: str) -> Tuple[int, ...]:
+    """Parses a ``MAJOR.MINOR.PATCH`` or ``MAJOR.MINOR`` version str to a tuple of int. Raises ValueError for other values.
+
+    :param version: A version str (example: "3.8.1")
+    """
+    match = _VERSION_PATTERN.fullmatch(version)
+    if match is None:
+        raise ValueError(
+            f"'{version}' is not in MAJOR.MINOR.PATCH or MAJOR.MINOR format"
+        )
+    return tuple(int(part) for part in match.groups() if part is not None)
+
+
+def _error_state(error: ValidationError) -> dict:
+    """Returns the state of a ValidationError as a picklable dict.
+
+    :param error: jsonschema ValidationError
+    """
+    return {
+        "message": error.message,
+        "validator": error.validator,
+        "validator_value": error.validator_value,
+        "instance": error.instance,
+        "schema": error.schema,
+        "path": list(error.path),
+        "schema_path": list(error.schema_path),
+        "context": [_error_state(suberror) for suberror in error.context or ()],
+    }
+
+
+def _error_from_state(
+    state: dict, type_checker: TypeChecker, path_prefix: tuple = ()
+) -> ValidationError:
+    """Re-creates a ValidationError from the state returned by :py:func:`_error_state`.
+
+    :param state: ValidationError state
+    :param type_checker: TypeChecker of the validator
+    :param path_prefix: Path to prepend to the error path (Default value = ())
+    """
+    return ValidationError(
+        message=state["message"],
+        validator=state["validator"],
+        validator_value=state["validator_value"],
+        instance=state["instance"],
+        schema=state["schema"],
+        path=(*path_prefix, *state["path"]),
+        schema_path=state["schema_path"],
+        context=[
+            _error_from_state(substate, type_checker=type_checker)
+            for substate in state["context"]
+        ],
+        type_checker=type_checker,
+    )
+
+
+def _limit_context_depth(
+    error: ValidationError, max_depth: Optional[int] = None
+) -> ValidationError:
+    """Removes the context of ``error`` nested deeper than ``max_depth`` levels, returns ``error``.
+
+    :param error: jsonschema ValidationError
+    :param max_depth: Maximum depth of the error context (Default value = None, unlimited)
+    """
+    if max_depth is None:
+        return error
+    if max_depth <= 0:
+        error.context = []
+    for suberror in error.context:
+        _limit_context_depth(suberror, max_depth=max_depth - 1)
+    return error
+
+
+def _validate_subtree(
+    validator: AS3Validator, ref: str, instance: dict
+) -> List[dict]:
+    """Validates ``instance`` against the AS3 Schema definition ``ref`` with ``validator``, returns the (picklable) state of all validation errors.
+
+    :param validator: AS3Validator of the AS3 Schema
+    :param ref: Reference to the AS3 Schema definition, relative to the AS3 Schema
+    :param instance: Instance to validate
+    """
+    validator = validator.evolve(schema={"$ref": ref})
+    return [_error_state(error) for error in validator.iter_errors(instance)]
+
+
+@lru_cache(maxsize=None)
+def _worker_schema(version: str) -> "AS3Schema":
+    """Returns the AS3Schema of ``version`` used by :py:func:`_validate_subtree_worker`, created once per process.
+
+    :param version: AS3 Schema version
+    """
+    return AS3Schema(version=version)
+
+
+def _validate_subtree_worker(
+    version: str,
+    class_dispatch: bool,
+    ref: str,
+    instance: dict,
+    classes: Optional[FrozenSet[str]] = None,
+) -> List[dict]:
+    """Validates ``instance`` against the AS3 Schema definition ``ref`` in a worker process, see :py:func:`_validate_subtree`.
+
+    :param version: AS3 Schema version
+    :param class_dispatch: Use the class dispatching validator
+    :param ref: Reference to the AS3 Schema definition, relative to the AS3 Schema
+    :param instance: Instance to validate
+    :param classes: Use the AS3 Schema reduced to these AS3 classes (Default value = None)
+    """
+    validator = _worker_schema(version)._validator(
+        version, class_dispatch=class_dispatch, classes=classes
+    )
+    return _validate_subtree(validator, ref, instance)
+
 
 class AS3Schema:
     """Creates a AS3Schema instance of specified version.
@@ -32,9 +169,18 @@ class AS3Schema:
 
     _latest_version: str = ""
     _versions: tuple = ()
+    _version_index: Dict[str, Tuple[int, ...]] = {}
+    _minor_index: Dict[Tuple[int, ...], str] = {}
     _schemas: dict = {}
     _schemas_ref_updated: dict = {}
     _validators: dict = {}
+    _dispatch_validators: dict = {}
+    _class_indexes: dict = {}
+    _pruned_validators: LRUCache = LRUCache(max_entries=32)
+    _subschemas: LRUCache = LRUCache(max_entries=256)
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_workers: int = 0
+    _load_lock = threading.Lock()
 
     _SCHEMA_REF_URL_TEMPLATE = (
         NINJASETTINGS.SCHEMA_BASE_PATH
@@ -42,8 +188,9 @@ class AS3Schema:
     )
     _SCHEMA_LOCAL_FSPATH = Path(NINJASETTINGS.SCHEMA_BASE_PATH + "/schema/")
     _SCHEMA_FILENAME_GLOB = "**/as3-schema-*.json"
+    _MINIMUM_VERSION = (3, 8, 0)
 
-    # IDEA: The AS3 Schema uses semantic versioning. For a given MAJOR + MINOR version the latest available PATCH version should be used for validation of the Schema.
+    # The AS3 Schema uses semantic versioning. For a given MAJOR.MINOR version the latest available PATCH version is used.
 
     def __init__(self, version: str = "latest"):
         self._validate_schema_version_format(version=version)
@@ -51,11 +198,8 @@ class AS3Schema:
         if not self._SCHEMA_LOCAL_FSPATH.exists():
             self.updateschemas()
 
-        if version != "latest":
-            # make sure latest version gets always loaded first
-            self._load_schema(version="latest")
-
-        self._load_schema(version=version)
+        # make sure latest version gets always loaded first
+        self._load_schema(version="latest")
 
         self._version = self._check_version(version=version)
         self._schema = self._schemas[self._version]
@@ -67,7 +211,11 @@ class AS3Schema:
             :param version: AS3 Schema version
             :param force: Force loading of Schema even if it was loaded before (Default value = False)
         """
-        if version not in self._schemas or force:
+        if version in self._schemas and not force:
+            return
+        with AS3Schema._load_lock:
+            if version in self._schemas and not force:
+                return  # loaded by another thread meanwhile
             path = self._SCHEMA_LOCAL_FSPATH
             # build sorted list of schema files
             # intention is a sorted schema.schemas dict with newest version first
@@ -82,6 +230,7 @@ class AS3Schema:
                 # schemalist is sorted, use first element as latest version
                 version = schemalist[0].split("/")[-2]
 
+            schemas = dict(self._schemas)
             for schemafile in schemalist:
                 version_file = schemafile.split("/")[-2]
 
@@ -90,12 +239,12 @@ class AS3Schema:
 
                 versions.append(version_file)
 
-                if version == version_file:
+                if version == version_file and (force or version not in schemas):
                     try:
                         self._validate_schema_version_format(version=version_file)
                         with open(schemafile, "rb") as _schemafile_fh:
                             _schema = json.loads(_schemafile_fh.read())
-                            self._schemas[version] = _schema
+                            schemas[version] = _schema
                     except (AS3SchemaVersionError, ValueError):
                         print(
                             f"Could not read schemafile: {schemafile}, schemafile ignored.",
@@ -105,25 +254,44 @@ class AS3Schema:
             self._update_versions(versions=versions)
 
             # (re-)sort loaded schemas according to version
-            self._sort_schemas()
+            self._sort_schemas(schemas)
 
-    def _sort_schemas(self) -> None:
-        """Private Method: Sorts the schemas class attribute according to version"""
-        _schemas_versions = list(self._schemas.keys())
-        _schemas_versions.sort(key=self.__version_sort_helper, reverse=True)
+    @staticmethod
+    def _sort_schemas(schemas: dict) -> None:
+        """Private Method: Replaces the schemas class attribute with ``schemas`` sorted according to version.
+        The class attribute is replaced, not modified, as other threads may iterate over it concurrently.
+
+            :param schemas: The loaded AS3 Schemas by version
+        """
+        _schemas_versions = list(schemas.keys())
+        _schemas_versions.sort(key=_parse_version, reverse=True)
 
-        for _schema_version in _schemas_versions:
-            self._schemas[_schema_version] = self._schemas.pop(_schema_version)
+        AS3Schema._schemas = {
+            _schema_version: schemas[_schema_version]
+            for _schema_version in _schemas_versions
+        }
 
     def _update_versions(self, versions: list) -> None:
-        """Private Method: Updates and sorts the versions class attribute"""
+        """Private Method: Updates and sorts the versions class attribute and the version indexes.
+
+        The version index maps every version to its parsed version tuple,
+        the minor index maps every ``(MAJOR, MINOR)`` tuple to the version with the latest PATCH version.
+        """
         try:
             versions.pop(versions.index("latest"))
         except ValueError:
             # pass exception if 'latest' doesn't exist
             pass
-        versions.sort(key=self.__version_sort_helper, reverse=True)
+        version_index = {version: _parse_version(version) for version in versions}
+        versions.sort(key=version_index.__getitem__, reverse=True)
         self._versions = tuple(versions)
+        self._version_index = version_index
+
+        minor_index: Dict[Tuple[int, ...], str] = {}
+        for version in versions:
+            # versions are sorted, the first version of a MAJOR.MINOR version has the latest PATCH version
+            minor_index.setdefault(version_index[version][:2], version)
+        self._minor_index = minor_index
 
         self._latest_version = versions[0]
 
@@ -143,7 +311,7 @@ class AS3Schema:
     def _check_version(self, version: str) -> str:
         """Private Method: _check_version checks if the specified version exists in available schemas.
         In case the specified schema version is not loaded, it will load the version.
-        It converts "latest" to the actual version.
+        It converts "latest" to the actual version and a MAJOR.MINOR version to the latest available PATCH version.
 
         The checked version is returned as str.
 
@@ -152,59 +320,55 @@ class AS3Schema:
         if version == "latest":
             return self._latest_version
 
-        if version in self.versions:
-            if version not in self.schemas:
-                self._load_schema(version=version)
-            return version
+        if version not in self._version_index:
+            try:
+                minor = _parse_version(version)
+            except ValueError:
+                minor = ()
+            if len(minor) != 2 or minor not in self._minor_index:
+                raise AS3SchemaVersionError(f"schema version:{version} is unknown")
+            version = self._minor_index[minor]
 
-        raise AS3SchemaVersionError(f"schema version:{version} is unknown")
+        if version not in self._schemas:
+            self._load_schema(version=version)
+        return version
 
     @property
     def latest_version(self) -> str:
         """Property: returns the latest AS3 schema version as str."""
         return self._latest_version
 
-    @staticmethod
-    def __version_sort_helper(value: str) -> int:
-        """Private Method: A sort helper. converts value: str to int and removes "."
-
-            :param value: str: A version str (example: "3.8.1")
-        """
-        # could be a lambda but this staticmethod improves documentation.
-        return int(value.replace(".", ""))
-
-    @staticmethod
-    def _validate_schema_version_format(version: str) -> None:
-        """Private Method: validates the format and minimum version.
+    @classmethod
+    def _validate_schema_version_format(cls, version: str) -> None:
+        """Private Method: validates the format (MAJOR.MINOR.PATCH or MAJOR.MINOR) and minimum version.
 
             :param version: str: AS3 Schema version
         """
         if version != "latest":
             try:
-                _ver = int(version.replace(".", ""))
-                if _ver < 380:
-                    raise AS3SchemaVersionError(
-                        f"Minimum AS3 Schema version is 3.8.0, requested version:{version}"
-                    )
+                _ver = _parse_version(version)
             except Exception as exc:
                 raise AS3SchemaVersionError(
                     f"version:{version} is not a valid version string, exception occurred:{exc}"
                 )
+            if _ver < cls._MINIMUM_VERSION[: len(_ver)]:
+                raise AS3SchemaVersionError(
+                    f"Minimum AS3 Schema version is {'.'.join(map(str, cls._MINIMUM_VERSION))}, requested version:{version}"
+                )
 
     @staticmethod
-    def __schemalist_sort_helper(value: str) -> int:
+    def __schemalist_sort_helper(value: str) -> Tuple[int, ...]:
         """Private Method: A sort helper.
 
-        Sorts based on the schema version (converted to int).
+        Sorts based on the schema version (parsed to a tuple of int).
 
             :param value: str: Path to the schema file (example: f5-appsvcs-extension/schema/3.8.1/as3-schema.json)
         """
-        value = value.split("/")[-2].replace(".", "")
         try:
-            return int(value)
+            return _parse_version(value.split("/")[-2])
         except ValueError:
-            # extracted value isn't convertible to int, for example for 'latest'
-            return 0
+            # extracted value isn't a version, for example for 'latest'
+            return ()
 
     @property
     def is_latest(self) -> bool:
@@ -272,55 +436,515 @@ class AS3Schema:
 
             :param version: The AS3 Schema version
         """
-        # do not mutate schema, create full copy instead
-        _schema = deepcopy(self.schemas[version])
+        # only load the schema of the version, do not mutate schema, create full copy instead
+        self._load_schema(version=version)
+        _schema = deepcopy(self._schemas[version])
         self._ref_update(
             schema=_schema, _ref_url=self._build_ref_url(version=version),
         )
 
         return _schema
 
-    def _validator(self, version: str) -> None:
-        """Creates jsonschema.Draft7Validator for specified AS3 schema version.
+    def _build_validator(
+        self,
+        schema: dict,
+        version: str,
+        ref_url: Optional[str] = None,
+        store: Optional[dict] = None,
+        check_schema: bool = True,
+    ) -> AS3Validator:
+        """Private Method: builds an AS3Validator for the (updated) AS3 Schema of the specified version.
         Will check schema is valid and raise a jsonschema SchemaError otherwise.
-        Memoizes the Draft7Validator instance for faster re-use.
+        References to the AS3 Schema file are resolved against ``schema`` instead of re-reading the file from disk.
+
+            :param schema: The AS3 Schema with updated references
+            :param version: The AS3 Schema version
+            :param ref_url: The URL of ``schema`` (Default value = None, the URL of the AS3 Schema file)
+            :param store: Additional schemas to resolve references against, by URL (Default value = None)
+            :param check_schema: Check the schema is valid (Default value = True)
+        """
+        if ref_url is None:
+            ref_url = self._build_ref_url(version=version)
+        validator = AS3Validator(
+            schema=schema,
+            format_checker=AS3FormatChecker(),
+            resolver=RefResolver(
+                base_uri=ref_url,
+                referrer=schema,
+                store={**(store or {}), ref_url: schema},
+            ),
+        )
+        if check_schema:
+            validator.check_schema(schema)  # check schema is valid
+        return validator
+
+    def _validator(
+        self,
+        version: str,
+        class_dispatch: bool = False,
+        classes: Optional[FrozenSet[str]] = None,
+    ) -> AS3Validator:
+        """Creates AS3Validator for specified AS3 schema version.
+        Will check schema is valid and raise a jsonschema SchemaError otherwise.
+        Memoizes the AS3Validator instance for faster re-use.
+
+        With ``class_dispatch`` the AS3 Schema is pre-indexed by AS3 class name and every object
+        is validated directly against the definition of its class, see :py:meth:`class_index`.
+
+        With ``classes`` the class dispatching AS3 Schema is reduced to the definitions reachable from these AS3 classes,
+        see :py:meth:`_pruned_validator`.
 
             :param version: AS3 schema version
+            :param class_dispatch: Create a class dispatching validator (Default value = False)
+            :param classes: Create a class dispatching validator reduced to these AS3 classes (Default value = None)
         """
+        if classes is not None:
+            return self._pruned_validator(version, classes=classes)
+
+        if class_dispatch:
+            return self._dispatch_validator(version)
 
         # create validator and memoize if it doesn't exist
         if version not in self._validators:
             _schema = self._schema_ref_update(version=version)
-            validator = Draft7Validator(
-                schema=_schema, format_checker=AS3FormatChecker(),
-            )
-            validator.check_schema(_schema)  # check schema is valid
-            self._validators[version] = validator  # memoize validator
+            self._validators[version] = self._build_validator(
+                schema=_schema, version=version
+            )  # memoize validator
 
         return self._validators[version]
 
+    def _dispatch_validator(self, version: str) -> AS3Validator:
+        """Private Method: Creates and memoizes the class dispatching AS3Validator for specified AS3 schema version.
+
+            :param version: AS3 schema version
+        """
+        if version not in self._dispatch_validators:
+            _schema = self._schema_ref_update(version=version)
+            self._class_indexes[version] = class_dispatch_update(
+                schema=_schema, ref_url=self._build_ref_url(version=version)
+            )
+            self._dispatch_validators[version] = self._build_validator(
+                schema=_schema, version=version
+            )
+
+        return self._dispatch_validators[version]
+
+    def _pruned_validator(self, version: str, classes: FrozenSet[str]) -> AS3Validator:
+        """Private Method: Creates and memoizes the class dispatching AS3Validator for the AS3 Schema reduced to ``classes``.
+        Subschemas of other AS3 classes and unreachable definitions are removed, objects without a ``class``
+        are validated against the complete AS3 Schema. The least recently used validators are evicted.
+
+            :param version: AS3 schema version
+            :param classes: AS3 class names used by the declaration
+        """
+        key = (version, classes)
+        validator = self._pruned_validators.get(key)
+        if validator is None:
+            dispatch_schema = self._dispatch_validator(version).schema
+            ref_url = self._build_ref_url(version=version)
+            digest = hashlib.sha256("\n".join(sorted(classes)).encode()).hexdigest()
+            pruned_url = f"{ref_url}?classes={digest}"
+
+            _schema = class_dispatch_prune(
+                dispatch_schema, classes=classes, ref_url=ref_url, pruned_url=pruned_url
+            )
+            prune_definitions(schema=_schema, url=pruned_url)
+            # the reduced schema is derived from the checked class dispatching schema
+            validator = self._build_validator(
+                schema=_schema,
+                version=version,
+                ref_url=pruned_url,
+                store={ref_url: dispatch_schema},
+                check_schema=False,
+            )
+            self._pruned_validators.set(key, validator)
+
+        return validator
+
+    @staticmethod
+    def declaration_classes(declaration: dict) -> FrozenSet[str]:
+        """Method: returns the set of AS3 classes (values of ``class`` properties) used by the declaration.
+
+            :param declaration: AS3 Declaration
+        """
+        classes: set = set()
+        pending: list = [declaration]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, dict):
+                if isinstance(item.get("class"), str):
+                    classes.add(item["class"])
+                pending.extend(item.values())
+            elif isinstance(item, list):
+                pending.extend(item)
+        return frozenset(classes)
+
+    def class_index(self, version: Optional[str] = None) -> dict:
+        """Method: returns the AS3 class index of the AS3 Schema, a dict mapping AS3 class names
+        (`Tenant`, `Application`, `Service_HTTP`, ...) to the ``$ref`` of their definition.
+
+            :param version: AS3 Schema version (Default value = None, the version of this AS3 Schema instance)
+        """
+        if not version:
+            version = self.version
+        else:
+            version = self._check_version(version=version)
+
+        self._dispatch_validator(version)
+        return self._class_indexes[version]
+
+    def subschema(
+        self,
+        pointer: Optional[str] = None,
+        as3class: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> Any:
+        """Method: returns the subschema of the AS3 Schema referenced by the JSON ``pointer`` or the definition of the AS3 class ``as3class``,
+        with all references resolved. Recursive references are kept and reference the ``definitions`` of the subschema.
+        AS3 classes are looked up in the :py:meth:`class_index`. Subschemas are memoized, they must not be mutated.
+        Raises KeyError if the subschema or the AS3 class does not exist.
+
+            :param pointer: JSON pointer (``/definitions/Pool``) or URI fragment (``#/definitions/Pool``) (Default value = None)
+            :param as3class: AS3 class name, for example ``Service_HTTP`` (Default value = None)
+            :param version: AS3 Schema version (Default value = None, the version of this AS3 Schema instance)
+        """
+        if (pointer is None) == (as3class is None):
+            raise ValueError("Either pointer or as3class must be specified")
+        if not version:
+            version = self.version
+        else:
+            version = self._check_version(version=version)
+
+        if as3class is not None:
+            try:
+                pointer = self.class_index(version)[as3class].split("#", 1)[1]
+            except KeyError:
+                raise KeyError(
+                    f"AS3 class '{as3class}' not found in AS3 Schema version {version}"
+                ) from None
+
+        key = (version, pointer)
+        subschema = self._subschemas.get(key)
+        if subschema is None:
+            self._load_schema(version=version)
+            subschema = resolve_refs(self._schemas[version], pointer)
+            if isinstance(subschema, dict) and "$schema" in self._schemas[version]:
+                subschema = {"$schema": self._schemas[version]["$schema"], **subschema}
+            self._subschemas.set(key, subschema)
+
+        return subschema
+
+    @staticmethod
+    def _split_tenants(declaration: dict) -> Tuple[dict, List[Tuple[tuple, dict]]]:
+        """Private Method: splits the declaration into its tenants and the remaining declaration.
+
+        Returns a tuple of the remaining declaration, where every tenant is replaced with an empty tenant,
+        and a list of tuples with the path and the tenant.
+
+            :param declaration: AS3 Declaration
+        """
+        prefix: tuple = ()
+        adc = declaration
+        if declaration.get("class") == "AS3" and isinstance(
+            declaration.get("declaration"), dict
+        ):
+            prefix = ("declaration",)
+            adc = declaration["declaration"]
+
+        tenants = [
+            (prefix + (name,), tenant)
+            for name, tenant in adc.items()
+            if isinstance(tenant, dict) and tenant.get("class") == "Tenant"
+        ]
+
+        adc_shell = {**adc, **{path[-1]: {"class": "Tenant"} for path, _ in tenants}}
+        if prefix:
+            return {**declaration, "declaration": adc_shell}, tenants
+        return adc_shell, tenants
+
+    @staticmethod
+    def _split_applications(
+        tenant: dict, version: str, cache: Optional[ValidationCache]
+    ) -> Tuple[dict, List[Tuple[str, dict]]]:
+        """Private Method: removes the applications known to be valid by ``cache`` from the tenant.
+
+        Returns a tuple of the remaining tenant and a list of tuples with the name and the application
+        of all applications which need validation.
+
+            :param tenant: AS3 Tenant
+            :param version: AS3 Schema version
+            :param cache: Validation cache
+        """
+        remaining: dict = {}
+        applications: List[Tuple[str, dict]] = []
+        for name, value in tenant.items():
+            if isinstance(value, dict) and value.get("class") == "Application":
+                if cache is not None and cache.is_valid(
+                    version, "Application", {name: value}
+                ):
+                    continue
+                applications.append((name, value))
+            remaining[name] = value
+        return remaining, applications
+
+    def _executor_for(self, workers: int) -> ProcessPoolExecutor:
+        """Private Method: returns the process pool with ``workers`` worker processes, re-created if the number of workers changed.
+
+            :param workers: Number of worker processes
+        """
+        if AS3Schema._executor is None or AS3Schema._executor_workers != workers:
+            if AS3Schema._executor is not None:
+                AS3Schema._executor.shutdown()
+            # workers are created after the validators have been built, forked workers share them
+            AS3Schema._executor = ProcessPoolExecutor(max_workers=workers)
+            AS3Schema._executor_workers = workers
+        return AS3Schema._executor
+
+    def _tenant_ref(self, version: str, class_dispatch: bool) -> str:
+        """Private Method: returns the reference of the Tenant definition relative to the AS3 Schema of ``version``.
+        The definition is looked up in the AS3 Schema, the class index is only used with ``class_dispatch``
+        or if the AS3 Schema has no ``Tenant`` definition, as it requires the class dispatching validator.
+
+            :param version: AS3 Schema version
+            :param class_dispatch: The class dispatching validator is used
+        """
+        if not class_dispatch:
+            self._load_schema(version=version)
+            if "Tenant" in self._schemas[version].get("definitions", {}):
+                return "#/definitions/Tenant"
+        return "#" + self.class_index(version=version)["Tenant"].split("#", 1)[1]
+
+    def _iter_tenant_errors(
+        self,
+        declaration: dict,
+        version: str,
+        class_dispatch: bool,
+        workers: Optional[int] = None,
+        cache: Optional[ValidationCache] = None,
+        classes: Optional[FrozenSet[str]] = None,
+    ) -> Iterator[ValidationError]:
+        """Private Method: validates the tenants of the declaration separately.
+        Tenants and applications known to be valid by ``cache`` are skipped, tenants are validated in parallel
+        using a pool of ``workers`` processes if ``workers`` is greater than 1.
+        Yields the validation errors with their path relative to the declaration.
+
+            :param declaration: AS3 Declaration
+            :param version: AS3 Schema version
+            :param class_dispatch: Use the class dispatching validator
+            :param workers: Number of worker processes (Default value = None)
+            :param cache: Validation cache (Default value = None)
+            :param classes: Use the AS3 Schema reduced to these AS3 classes (Default value = None)
+        """
+        validator = self._validator(
+            version, class_dispatch=class_dispatch, classes=classes
+        )
+        shell, tenants = self._split_tenants(declaration)
+
+        yield from validator.iter_errors(shell)
+
+        pending = []
+        for path, tenant in tenants:
+            if cache is not None and cache.is_valid(version, "Tenant", tenant):
+                continue
+            remaining, applications = self._split_applications(tenant, version, cache)
+            pending.append((path, tenant, remaining, applications))
+
+        tenant_ref = self._tenant_ref(version, class_dispatch=class_dispatch)
+        if workers and workers > 1:
+            executor = self._executor_for(workers)
+            futures = [
+                executor.submit(
+                    _validate_subtree_worker,
+                    version,
+                    class_dispatch,
+                    tenant_ref,
+                    remaining,
+                    classes,
+                )
+                for _, _, remaining, _ in pending
+            ]
+            results = (future.result() for future in futures)
+        else:
+            results = (
+                _validate_subtree(validator, tenant_ref, remaining)
+                for _, _, remaining, _ in pending
+            )
+
+        for (path, tenant, _, applications), states in zip(pending, results):
+            for state in states:
+                yield _error_from_state(
+                    state, type_checker=validator.TYPE_CHECKER, path_prefix=path
+                )
+            if cache is None:
+                continue
+            if not states:
+                cache.add(version, "Tenant", tenant)
+            elif not all(state["path"] for state in states):
+                # tenant level errors (e.g. invalid application names) can't be attributed to an application
+                continue
+            invalid = {state["path"][0] for state in states}
+            for name, application in applications:
+                if name not in invalid:
+                    cache.add(version, "Application", {name: application})
+
+    def _declaration_version(
+        self, declaration: dict, version: Optional[str] = None
+    ) -> str:
+        """Private Method: returns the AS3 Schema version to validate ``declaration`` against.
+        For "auto" the ``schemaVersion`` of the declaration is used, if this version is not available
+        the latest available PATCH version of its MAJOR.MINOR version is used.
+
+            :param declaration: AS3 Declaration
+            :param version: AS3 Schema version, "auto" to use the version of the declaration (Default value = None, the version of this AS3 Schema instance)
+        """
+        if not version:
+            return self.version
+        if version == "auto":
+            adc = declaration
+            if isinstance(adc, dict) and adc.get("class") == "AS3":
+                adc = adc.get("declaration", {})
+            if not isinstance(adc, dict):
+                raise AS3SchemaVersionError(
+                    "declaration is not an object, cannot determine its schemaVersion"
+                )
+            version = adc.get("schemaVersion", "")
+            if not isinstance(version, str):
+                raise AS3SchemaVersionError(
+                    f"declaration schemaVersion:{version} is not a valid version string"
+                )
+            if version not in self._version_index:
+                try:
+                    version = ".".join(map(str, _parse_version(version)[:2]))
+                except ValueError:
+                    raise AS3SchemaVersionError(
+                        f"declaration schemaVersion:{version} is not a valid version string"
+                    )
+        return self._check_version(version=version)
+
+    def _iter_errors(
+        self,
+        declaration: dict,
+        version: str,
+        class_dispatch: bool = False,
+        workers: Optional[int] = None,
+        cache: Optional[ValidationCache] = None,
+        prune: bool = False,
+    ) -> Iterator[ValidationError]:
+        """Private Method: lazily yields the jsonschema validation errors of the declaration.
+
+            :param declaration: AS3 Declaration
+            :param version: AS3 Schema version
+            :param class_dispatch: Use the class dispatching validator (Default value = False)
+            :param workers: Number of worker processes (Default value = None)
+            :param cache: Validation cache (Default value = None)
+            :param prune: Use the AS3 Schema reduced to the AS3 classes of the declaration (Default value = False)
+        """
+        classes = self.declaration_classes(declaration) if prune else None
+        if cache is not None or (workers and workers > 1):
+            return self._iter_tenant_errors(
+                declaration,
+                version=version,
+                class_dispatch=class_dispatch,
+                workers=workers,
+                cache=cache,
+                classes=classes,
+            )
+        return self._validator(
+            version, class_dispatch=class_dispatch, classes=classes
+        ).iter_errors(declaration)
+
+    def iter_errors(
+        self,
+        declaration: Union[dict, str],
+        version: Optional[str] = None,
+        class_dispatch: bool = False,
+        workers: Optional[int] = None,
+        cache: Optional[ValidationCache] = None,
+        prune: bool = False,
+        max_context_depth: Optional[int] = None,
+    ) -> Iterator[AS3ValidationError]:
+        """Method: Validates a declaration against the AS3 Schema and lazily yields a AS3ValidationError for every error.
+        Validation stops as soon as the caller stops consuming errors, use ``itertools.islice`` to limit the number of errors.
+
+            :param declaration: Declaration to be validated against the AS3 Schema.
+            :param version: See :py:meth:`validate` (Default value = None)
+            :param class_dispatch: See :py:meth:`validate` (Default value = False)
+            :param workers: See :py:meth:`validate` (Default value = None)
+            :param cache: See :py:meth:`validate` (Default value = None)
+            :param prune: See :py:meth:`validate` (Default value = False)
+            :param max_context_depth: See :py:meth:`validate` (Default value = None)
+        """
+        if isinstance(declaration, str):
+            declaration = json.loads(declaration)
+
+        version = self._declaration_version(declaration, version=version)
+
+        try:
+            for error in self._iter_errors(
+                declaration,
+                version=version,
+                class_dispatch=class_dispatch,
+                workers=workers,
+                cache=cache,
+                prune=prune,
+            ):
+                yield AS3ValidationError(
+                    "AS3 Validation Error: ",
+                    _limit_context_depth(error, max_depth=max_context_depth),
+                )
+        except (SchemaError) as exc:
+            raise AS3SchemaError("JSON Schema Error", exc)
+
     def validate(
-        self, declaration: Union[dict, str], version: Optional[str] = None
+        self,
+        declaration: Union[dict, str],
+        version: Optional[str] = None,
+        class_dispatch: bool = False,
+        workers: Optional[int] = None,
+        cache: Optional[ValidationCache] = None,
+        prune: bool = False,
+        max_errors: Optional[int] = None,
+        max_context_depth: Optional[int] = None,
     ) -> None:
         """Method: Validates a declaration against the AS3 Schema. Raises a AS3ValidationError on failure.
 
             :param declaration: Declaration to be validated against the AS3 Schema.
             :param version: Allows to validate the declaration against the specified version
                     instead of this AS3 Schema instance version. If set to "auto", the version of the declaration is used.
+            :param class_dispatch: Validate every AS3 object directly against the definition of its class
+                    instead of evaluating all class branches of the AS3 Schema. Speeds up validation of
+                    declarations with many objects. (Default value = False)
+            :param workers: Number of worker processes to validate the tenants of the declaration in parallel.
+                    Validation is performed in-process if not specified. (Default value = None)
+            :param cache: Validation cache, tenants and applications known to be valid are not validated again.
+                    Valid tenants and applications are added to the cache. (Default value = None)
+            :param prune: Validate against the class dispatching AS3 Schema reduced to the AS3 classes used by the declaration.
+                    Reduced AS3 Schemas are memoized per AS3 Schema version and set of AS3 classes. (Default value = False)
+            :param max_errors: Maximum number of errors to collect when validating tenants separately (``workers`` or ``cache``),
+                    the most relevant of the collected errors is raised. (Default value = None, all errors)
+            :param max_context_depth: Maximum depth of the error context (errors of ``anyOf``/``oneOf`` subschemas)
+                    of the raised AS3ValidationError. (Default value = None, unlimited)
         """
         if isinstance(declaration, str):
             declaration = json.loads(declaration)
 
-        if not version:
-            version = self.version
-        elif version == "auto":
-            version = declaration["declaration"]["schemaVersion"]
-        else:
-            version = self._check_version(version=version)
+        version = self._declaration_version(declaration, version=version)
 
         try:
-            validator = self._validator(version)
-            validator.validate(declaration)
+            errors = self._iter_errors(
+                declaration,
+                version=version,
+                class_dispatch=class_dispatch,
+                workers=workers,
+                cache=cache,
+                prune=prune,
+            )
+            if cache is not None or (workers and workers > 1):
+                error = best_match(islice(errors, max_errors))
+            else:
+                error = next(errors, None)
+            if error is not None:
+                raise _limit_context_depth(error, max_depth=max_context_depth)
         except ValidationError as exc:
             raise AS3ValidationError("AS3 Validation Error: ", exc) from exc
         except (SchemaError) as exc:
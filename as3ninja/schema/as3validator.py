@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+"""
+AS3 Validator, a jsonschema Draft7Validator extended with AS3 specific keywords.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+from typing import AbstractSet, Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from jsonschema import Draft7Validator, validators
+from jsonschema.exceptions import ValidationError
+
+from ..types import validate_many
+from .formatcheckers import AS3FormatChecker
+
+__all__ = [
+    "AS3Validator",
+    "CLASS_DISPATCH_KEYWORD",
+    "class_dispatch_prune",
+    "class_dispatch_update",
+    "prune_definitions",
+    "resolve_pointer",
+    "resolve_refs",
+]
+
+CLASS_DISPATCH_KEYWORD = "as3ClassDispatch"
+
+# IP version accepted by the F5 IP address formats
+_F5IP_FORMATS = {"f5ip": None, "f5ipv4": 4, "f5ipv6": 6}
+_draft7_items = Draft7Validator.VALIDATORS["items"]
+
+
+def _dispatch_class(
+    validator: Any, dispatch: dict, instance: Any, schema: dict
+) -> Iterator[ValidationError]:
+    """
+    Implements the ``as3ClassDispatch`` keyword.
+    Validates an object directly against the subschemas registered for the value of its ``class`` property,
+    instead of evaluating every ``if``/``then`` branch of the original schema.
+
+    Objects without a ``class`` property (and non-objects) are validated against the original branches,
+    which keeps the semantics of the original schema.
+
+    :param validator: The validator instance
+    :param dispatch: Value of the ``as3ClassDispatch`` keyword
+    :param instance: Instance to validate
+    :param schema: The (sub)schema containing the keyword
+    """
+    if not validator.is_type(instance, "object") or "class" not in instance:
+        for original in dispatch["original"]:
+            yield from validator.descend(instance, original)
+        return
+
+    as3class = instance["class"]
+    if isinstance(as3class, str) and as3class in dispatch["classes"]:
+        subschemas = dispatch["classes"][as3class]
+    else:
+        subschemas = dispatch["otherwise"]
+
+    for subschema in subschemas:
+        yield from validator.descend(instance, subschema)
+
+
+def _batch_items(
+    validator: Any, items: Any, instance: Any, schema: dict
+) -> Iterator[ValidationError]:
+    """
+    Implements the ``items`` keyword. Arrays of F5 IP address strings (formats ``f5ip``, ``f5ipv4``, ``f5ipv6``)
+    are validated in one batch, see :py:func:`as3ninja.types.validate_many`, instead of checking the format of every item.
+
+    If an item fails the batch validation, the array is validated by the ``items`` keyword of Draft7Validator
+    to report the same errors.
+
+    :param validator: The validator instance
+    :param items: Value of the ``items`` keyword
+    :param instance: Instance to validate
+    :param schema: The (sub)schema containing the keyword
+    """
+    f5ip_format = items.get("format") if isinstance(items, dict) else None
+    if (
+        f5ip_format not in _F5IP_FORMATS
+        or validator.format_checker is None
+        or validator.format_checker.checkers.get(f5ip_format)
+        != AS3FormatChecker._as3_checkers[f5ip_format]  # pylint: disable=W0212
+        or not validator.is_type(instance, "array")
+        or not validate_many(instance, version=_F5IP_FORMATS[f5ip_format]).valid
+    ):
+        yield from _draft7_items(validator, items, instance, schema)
+        return
+
+    remaining = {key: value for key, value in items.items() if key != "format"}
+    if remaining in ({}, {"type": "string"}):
+        # all items are valid F5 IP address strings
+        return
+    for index, item in enumerate(instance):
+        yield from validator.descend(item, remaining, path=index)
+
+
+AS3Validator = validators.extend(
+    Draft7Validator,
+    {CLASS_DISPATCH_KEYWORD: _dispatch_class, "items": _batch_items},
+)
+
+
+def _branch_class(branch: Any) -> Optional[str]:
+    """
+    Returns the AS3 class name a ``if`` condition checks for, ``None`` if it is not a plain AS3 class check.
+    A plain AS3 class check has the form: ``{"properties": {"class": {"const": "<name>"}}}`` (optionally ``"required": ["class"]``).
+
+    :param branch: ``if`` subschema
+    """
+    if not isinstance(branch, dict) or not set(branch) <= {"properties", "required"}:
+        return None
+    if branch.get("required", ["class"]) != ["class"]:
+        return None
+    properties = branch.get("properties")
+    if not isinstance(properties, dict) or list(properties) != ["class"]:
+        return None
+    condition = properties["class"]
+    if not isinstance(condition, dict) or list(condition) != ["const"]:
+        return None
+    if not isinstance(condition["const"], str):
+        return None
+    return condition["const"]
+
+
+def _dispatch_allof(schema: dict, index: Dict[str, str]) -> None:
+    """
+    Replaces AS3 class ``if``/``then`` branches of an ``allOf`` with the ``as3ClassDispatch`` keyword.
+
+    :param schema: (Sub)schema to update in-place
+    :param index: Class index to update in-place
+    """
+    classes: Dict[str, List[dict]] = {}
+    branches: list = []
+    remaining: list = []
+    for branch in schema["allOf"]:
+        as3class = None
+        if isinstance(branch, dict) and set(branch) == {"if", "then"}:
+            as3class = _branch_class(branch["if"])
+        if as3class is None:
+            remaining.append(branch)
+            continue
+        classes.setdefault(as3class, []).append(branch["then"])
+        branches.append(branch)
+
+    if len(branches) < 2:
+        # not worth dispatching
+        return
+
+    for as3class, subschemas in classes.items():
+        _index_class(index, as3class, subschemas)
+
+    if remaining:
+        schema["allOf"] = remaining
+    else:
+        del schema["allOf"]
+    schema[CLASS_DISPATCH_KEYWORD] = {
+        "classes": classes,
+        "otherwise": [],
+        "original": branches,
+    }
+
+
+def _dispatch_ifthen(schema: dict, index: Dict[str, str]) -> None:
+    """
+    Replaces an AS3 class ``if``/``then``/``else`` with the ``as3ClassDispatch`` keyword.
+
+    :param schema: (Sub)schema to update in-place
+    :param index: Class index to update in-place
+    """
+    as3class = _branch_class(schema["if"])
+    if as3class is None or "then" not in schema:
+        return
+
+    original = {key: schema.pop(key) for key in ("if", "then", "else") if key in schema}
+    _index_class(index, as3class, [original["then"]])
+    schema[CLASS_DISPATCH_KEYWORD] = {
+        "classes": {as3class: [original["then"]]},
+        "otherwise": [original["else"]] if "else" in original else [],
+        "original": [original],
+    }
+
+
+def _index_class(index: Dict[str, str], as3class: str, subschemas: List[dict]) -> None:
+    """
+    Adds the definition reference of ``as3class`` to the class index.
+
+    :param index: Class index to update in-place
+    :param as3class: AS3 class name
+    :param subschemas: ``then`` subschemas for ``as3class``
+    """
+    for subschema in subschemas:
+        if isinstance(subschema, dict) and "$ref" in subschema:
+            index[as3class] = subschema["$ref"]
+
+
+def _definition_class(definition: Any) -> Optional[str]:
+    """
+    Returns the AS3 class name a definition describes (``properties.class`` is a ``const`` or single value ``enum``), ``None`` otherwise.
+
+    :param definition: Definition of the AS3 Schema
+    """
+    try:
+        condition = definition["properties"]["class"]
+        if "const" in condition:
+            as3class = condition["const"]
+        else:
+            (as3class,) = condition["enum"]
+    except (KeyError, TypeError, ValueError):
+        return None
+    return as3class if isinstance(as3class, str) else None
+
+
+def class_dispatch_update(
+    schema: Any, ref_url: str = "", index: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Performs an in-place update of the AS3 Schema: all ``if``/``then`` constructs branching on the AS3 ``class``
+    are replaced with the ``as3ClassDispatch`` keyword understood by :py:class:`AS3Validator`.
+
+    Returns the class index, a dict mapping AS3 class names (`Tenant`, `Application`, `Service_HTTP`, ...) to the
+    ``$ref`` of their definition. Definitions which are not referenced by a class branch (for example `ADC`) are
+    indexed based on their ``class`` property.
+
+    :param schema: The AS3 Schema
+    :param ref_url: The URL prepended to definition references of the class index (Default value = "")
+    :param index: Class index to update (Default value = None)
+    """
+    if index is None:
+        index = {}
+        if isinstance(schema, dict) and isinstance(schema.get("definitions"), dict):
+            for name, definition in schema["definitions"].items():
+                as3class = _definition_class(definition)
+                if as3class == name:
+                    index[as3class] = f"{ref_url}#/definitions/{name}"
+
+    if isinstance(schema, list):
+        for item in schema:
+            class_dispatch_update(schema=item, ref_url=ref_url, index=index)
+    elif isinstance(schema, dict):
+        if isinstance(schema.get("allOf"), list):
+            _dispatch_allof(schema, index)
+        if "if" in schema:
+            _dispatch_ifthen(schema, index)
+        for key, value in schema.items():
+            if key == CLASS_DISPATCH_KEYWORD:
+                # the original branches are kept as they are
+                value = [value["classes"], value["otherwise"]]
+            class_dispatch_update(schema=value, ref_url=ref_url, index=index)
+
+    return index
+
+
+def _pointer_escape(key: Any) -> str:
+    """
+    Returns ``key`` escaped as JSON pointer reference token.
+
+    :param key: Key of a (sub)schema
+    """
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def class_dispatch_prune(
+    schema: Any,
+    classes: AbstractSet[str],
+    ref_url: str,
+    pruned_url: str,
+    pointer: str = "",
+) -> Any:
+    """
+    Returns a copy of the class dispatched AS3 Schema (see :py:func:`class_dispatch_update`) reduced to the AS3 ``classes``.
+
+    Subschemas of other AS3 classes are removed from the ``as3ClassDispatch`` keywords. The original branches, which are only
+    evaluated for objects without a ``class``, are replaced with references into the complete AS3 Schema at ``ref_url``.
+    All other references to ``ref_url`` are updated to reference the reduced AS3 Schema at ``pruned_url``.
+
+    :param schema: The class dispatched AS3 Schema
+    :param classes: AS3 class names to keep
+    :param ref_url: The URL of the class dispatched AS3 Schema
+    :param pruned_url: The URL of the reduced AS3 Schema
+    :param pointer: JSON pointer of ``schema`` (Default value = "")
+    """
+    if isinstance(schema, list):
+        return [
+            class_dispatch_prune(item, classes, ref_url, pruned_url, f"{pointer}/{i}")
+            for i, item in enumerate(schema)
+        ]
+    if not isinstance(schema, dict):
+        return schema
+
+    pruned: dict = {}
+    for key, value in schema.items():
+        key_pointer = f"{pointer}/{_pointer_escape(key)}"
+        if key == CLASS_DISPATCH_KEYWORD:
+            pruned[key] = {
+                "classes": {
+                    as3class: class_dispatch_prune(
+                        subschemas,
+                        classes,
+                        ref_url,
+                        pruned_url,
+                        f"{key_pointer}/classes/{_pointer_escape(as3class)}",
+                    )
+                    for as3class, subschemas in value["classes"].items()
+                    if as3class in classes
+                },
+                "otherwise": class_dispatch_prune(
+                    value["otherwise"],
+                    classes,
+                    ref_url,
+                    pruned_url,
+                    f"{key_pointer}/otherwise",
+                ),
+                "original": [
+                    {"$ref": f"{ref_url}#{quote(f'{key_pointer}/original/{i}')}"}
+                    for i in range(len(value["original"]))
+                ],
+            }
+        elif (
+            key == "$ref" and isinstance(value, str) and value.startswith(ref_url + "#")
+        ):
+            pruned[key] = pruned_url + value[len(ref_url) :]
+        else:
+            pruned[key] = class_dispatch_prune(
+                value, classes, ref_url, pruned_url, key_pointer
+            )
+    return pruned
+
+
+def prune_definitions(schema: dict, url: str) -> None:
+    """
+    Performs an in-place update of the AS3 Schema: removes all definitions which are not reachable from the root of the AS3 Schema.
+
+    :param schema: The AS3 Schema
+    :param url: The URL of the AS3 Schema, only references to this URL are followed
+    """
+    definitions = schema.get("definitions")
+    if not isinstance(definitions, dict):
+        return
+
+    prefix = f"{url}#/definitions/"
+    reachable: set = set()
+    pending: list = [
+        {key: value for key, value in schema.items() if key != "definitions"}
+    ]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, list):
+            pending.extend(item)
+        elif isinstance(item, dict):
+            ref = item.get("$ref")
+            if isinstance(ref, str) and ref.startswith(prefix):
+                name = unquote(ref[len(prefix) :].split("/", 1)[0])
+                name = name.replace("~1", "/").replace("~0", "~")
+                if name not in reachable and name in definitions:
+                    reachable.add(name)
+                    pending.append(definitions[name])
+            pending.extend(item.values())
+
+    schema["definitions"] = {
+        name: definition
+        for name, definition in definitions.items()
+        if name in reachable
+    }
+
+
+def _pointer_tokens(pointer: str) -> List[str]:
+    """
+    Returns the unescaped reference tokens of the JSON ``pointer``. Raises ValueError for invalid JSON pointers.
+
+    :param pointer: JSON pointer (``/definitions/Pool``) or URI fragment (``#/definitions/Pool``)
+    """
+    if pointer.startswith("#"):
+        pointer = unquote(pointer[1:])
+    if pointer and not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: '{pointer}'")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]
+    ]
+
+
+def resolve_pointer(document: Any, pointer: str) -> Any:
+    """
+    Returns the value of ``document`` referenced by the JSON ``pointer`` (RFC 6901).
+    Raises KeyError if the value does not exist and ValueError for invalid JSON pointers.
+
+    :param document: JSON document, for example the AS3 Schema
+    :param pointer: JSON pointer (``/definitions/Pool``) or URI fragment (``#/definitions/Pool``)
+    """
+    item = document
+    for token in _pointer_tokens(pointer):
+        if isinstance(item, dict) and token in item:
+            item = item[token]
+        elif isinstance(item, list) and token.isdigit() and int(token) < len(item):
+            item = item[int(token)]
+        else:
+            raise KeyError(f"JSON pointer '{pointer}' not found")
+    return item
+
+
+def resolve_refs(root: dict, pointer: str = "") -> Any:
+    """
+    Returns a copy of the subschema of ``root`` referenced by the JSON ``pointer``, with all local references (``#/...``)
+    replaced by the referenced subschema. Raises KeyError if the subschema does not exist.
+
+    Recursive references cannot be replaced. They are detected by tracking the references being resolved and
+    are kept, the referenced definition is added to the ``definitions`` of the returned subschema instead.
+    Raises ValueError for invalid JSON pointers and references which cannot be resolved.
+
+    :param root: The AS3 Schema
+    :param pointer: JSON pointer or URI fragment of the subschema (Default value = "", the complete schema)
+    """
+    definitions: dict = {}
+
+    def resolve(item: Any, resolving: Tuple[str, ...]) -> Any:
+        if isinstance(item, list):
+            return [resolve(value, resolving) for value in item]
+        if not isinstance(item, dict):
+            return item
+        ref = item.get("$ref")
+        if not (isinstance(ref, str) and ref.startswith("#")):
+            return {key: resolve(value, resolving) for key, value in item.items()}
+
+        pointer = unquote(ref[1:])
+        try:
+            target = resolve_pointer(root, pointer)
+        except (KeyError, ValueError):
+            raise ValueError(f"Reference '{ref}' cannot be resolved") from None
+        if pointer not in resolving:
+            return resolve(target, resolving + (pointer,))
+
+        # recursive reference, keep the reference and add the definition
+        tokens = _pointer_tokens(pointer)
+        if len(tokens) < 2 or tokens[0] != "definitions":
+            raise ValueError(f"Recursive reference '{ref}' cannot be resolved")
+        name = tokens[1]
+        if name not in definitions:
+            definitions[name] = {}  # the definition may reference itself
+            definitions[name] = resolve(
+                root["definitions"][name], (f"/definitions/{_pointer_escape(name)}",)
+            )
+        return {"$ref": ref}
+
+    if pointer.startswith("#"):
+        pointer = unquote(pointer[1:])
+    resolved = resolve(resolve_pointer(root, pointer), (pointer,))
+    if definitions:
+        if not isinstance(resolved, dict):
+            raise ValueError(f"Recursive references of '{pointer}' cannot be resolved")
+        resolved["definitions"] = {**resolved.get("definitions", {}), **definitions}
+    return resolved
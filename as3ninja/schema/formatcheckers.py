@@ -6,107 +6,120 @@ AS3 Schema Format Checker for F5 specific formats.
 # pylint: disable=C0301 # Line too long
 
 import re
-from typing import Any
+from functools import lru_cache, partial, wraps
+from typing import Any, Callable, Dict, Pattern
 
 from jsonschema import FormatChecker
 
-from ..types import F5IP, F5IPv4, F5IPv6
+from ..types import parse_f5ip
+
+__all__ = ["AS3FormatChecker"]
+
+CACHE_SIZE = 4096  # number of values memoized per format
+
+# based on AS3 3.17.1 : lib/adcParserFormats.js
+_PATTERNS: Dict[str, Pattern] = {
+    "f5name": re.compile(r"^([A-Za-z][0-9A-Za-z_]{0,63})?$"),
+    "f5bigip": re.compile(r"^\x2f[^\x00-\x19\x22#\'*<>?\x5b-\x5d\x7b-\x7d\x7f]+$"),
+    "f5long-id": re.compile(r"^[^\x00-\x20\x22\'<>\x5c^`|\x7f]{0,255}$"),
+    "f5label": re.compile(r"^[^\x00-\x1f\x22#&*<>?\x5b-\x5d`\x7f]{0,64}$"),
+    "f5remark": re.compile(r"^[^\x00-\x1f\x22\x5c\x7f]{0,64}$"),
+    "f5pointer": re.compile(
+        r"((@|[0-9]+)|(([0-9]*\x2f)?((@|[0-9]+|[A-Za-z][0-9A-Za-z_]{0,63})\x2f)*([0-9]+|([A-Za-z][0-9A-Za-z_]{0,63}))))?#?$"
+    ),
+    "f5base64": re.compile(r"^([0-9A-Za-z\/+_-]*|[0-9A-Za-z\/+_-]+={1,2})$"),
+}
+
+
+def _memoize(check: Callable[[str], bool]) -> Callable[[Any], bool]:
+    """
+    Returns a format checker memoizing the results of ``check`` for the last ``CACHE_SIZE`` str values.
+    Values which are not a str fail the check.
+
+    :param check: Function checking a str value
+    """
+    cached_check = lru_cache(maxsize=CACHE_SIZE)(check)
+
+    @wraps(check)
+    def checker(value: Any) -> bool:
+        if not isinstance(value, str):
+            return False
+        return cached_check(value)
+
+    checker.cache_info = cached_check.cache_info  # type: ignore
+    checker.cache_clear = cached_check.cache_clear  # type: ignore
+    return checker
+
+
+def _regex_checker(pattern: Pattern) -> Callable[[Any], bool]:
+    """
+    Returns a memoizing format checker matching the precompiled ``pattern``.
+
+    :param pattern: The compiled regular expression
+    """
+
+    def check(value: str) -> bool:
+        return pattern.match(value) is not None
+
+    return _memoize(check)
+
+
+def _validator_checker(validate: Callable[[str], Any]) -> Callable[[Any], bool]:
+    """
+    Returns a memoizing format checker which passes when ``validate`` does not raise an exception.
+
+    :param validate: Function validating a str value
+    """
+
+    def check(value: str) -> bool:
+        try:
+            validate(value)
+            return True
+        except Exception:  # pylint: disable=W0703 # we do not care which exception occurs
+            return False
+
+    return _memoize(check)
+
+
+_CHECKERS: Dict[str, Callable[[Any], bool]] = {
+    # based on F5 IP addressing schemes for Virtual Servers, Nodes and Pool Members
+    "f5ip": _validator_checker(parse_f5ip),
+    "f5ipv4": _validator_checker(partial(parse_f5ip, version=4)),
+    "f5ipv6": _validator_checker(partial(parse_f5ip, version=6)),
+    **{name: _regex_checker(pattern) for name, pattern in _PATTERNS.items()},
+}
 
 
 class AS3FormatChecker(FormatChecker):
     """
     AS3FormatChecker subclasses jsonschema.FormatChecker to provide AS3 specific format checks.
+    The format checks are shared by all instances and memoize their results for repeated values.
     """
 
+    _as3_checkers: dict = {name: (check, ()) for name, check in _CHECKERS.items()}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         # update FormatChecker instance's format checkers with AS3 schema specific format checkers
-        self.checkers.update(self.as3_schema_format_checkers)
+        self.checkers.update(self._as3_checkers)
 
     @property
     def as3_schema_format_checkers(self) -> dict:
         """
-        Returns dict of AS3 formats: f5ip, f5ipv4, f5ipv6, f5label, f5long-id, f5remark, f5pointer, f5base64
+        Returns dict of AS3 formats: f5ip, f5ipv4, f5ipv6, f5name, f5bigip, f5label, f5long-id, f5remark, f5pointer, f5base64
         Currently missing formats used in AS3:
 
             - date-time
             - uri
             - url
         """
-        return {
-            # based on F5 IP addressing schemes for Virtual Servers, Nodes and Pool Members
-            "f5ip": (lambda v: self._is_type(F5IP, v), ()),
-            "f5ipv4": (lambda v: self._is_type(F5IPv4, v), ()),
-            "f5ipv6": (lambda v: self._is_type(F5IPv6, v), ()),
-            # based on AS3 3.17.1 : lib/adcParserFormats.js
-            "f5name": (
-                lambda v: self._regex_match(r"^([A-Za-z][0-9A-Za-z_]{0,63})?$", v),
-                (),
-            ),
-            "f5bigip": (
-                lambda v: self._regex_match(
-                    r"^\x2f[^\x00-\x19\x22#\'*<>?\x5b-\x5d\x7b-\x7d\x7f]+$", v
-                ),
-                (),
-            ),
-            "f5long-id": (
-                lambda v: self._regex_match(
-                    r"^[^\x00-\x20\x22\'<>\x5c^`|\x7f]{0,255}$", v
-                ),
-                (),
-            ),
-            "f5label": (
-                lambda v: self._regex_match(
-                    r"^[^\x00-\x1f\x22#&*<>?\x5b-\x5d`\x7f]{0,64}$", v
-                ),
-                (),
-            ),
-            "f5remark": (
-                lambda v: self._regex_match(r"^[^\x00-\x1f\x22\x5c\x7f]{0,64}$", v),
-                (),
-            ),
-            "f5pointer": (
-                lambda v: self._regex_match(
-                    r"((@|[0-9]+)|(([0-9]*\x2f)?((@|[0-9]+|[A-Za-z][0-9A-Za-z_]{0,63})\x2f)*([0-9]+|([A-Za-z][0-9A-Za-z_]{0,63}))))?#?$",
-                    v,
-                ),
-                (),
-            ),
-            "f5base64": (
-                lambda v: self._regex_match(
-                    r"^([0-9A-Za-z\/+_-]*|[0-9A-Za-z\/+_-]+={1,2})$", v
-                ),
-                (),
-            ),
-        }
+        return dict(self._as3_checkers)
 
     @staticmethod
-    def _is_type(is_type: Any, value: Any) -> bool:
+    def cache_clear() -> None:
         """
-        Helper function _is_type returns `True` when `is_type(value)` does not raise an exception, `False` otherwise
-
-        :param is_type: The type to check against
-        :param value: Value to check
+        Clears the memoized results of all AS3 format checks.
         """
-        try:
-            is_type(value)
-            return True
-        except Exception:  # pylint: disable=W0703 # we do not care which exception occurs
-            return False
-
-    @staticmethod
-    def _regex_match(regex: str, value: str) -> bool:
-        """
-        Helper function _regex_match matches a regular expression against the given value.
-        Returns `True` when regex matches, `False` otherwise.
-
-        :param regex: The regular expression, for example: ``r'^[ -~]+$'``
-        :param value: Value to apply the regular expression to
-        """
-        if not isinstance(value, str):
-            return False
-        reg_ex = re.compile(regex)
-        if reg_ex.match(value) is None:
-            return False
-        return True
+        for check in _CHECKERS.values():
+            check.cache_clear()  # type: ignore
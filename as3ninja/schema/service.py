@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Shared AS3Schema instances with validator prewarming for long running applications (the API).
+"""
+
+# pylint: disable=C0301 # Line too long
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..cache import LRUCache
+from ..compression import ENCODINGS, compress
+from .as3schema import AS3Schema, _parse_version
+
+__all__ = ["AS3SchemaService", "SerializedJSON"]
+
+
+class SerializedJSON:
+    """Compact JSON serialization of ``data`` as UTF-8 bytes with a strong ETag, serialized once.
+    The serialization is identical to the JSON responses of the API.
+    Compressed representations are compressed once on first use, see :py:meth:`encoded`.
+
+    :param data: JSON serializable data
+    """
+
+    __slots__ = ("body", "etag", "_encoded")
+
+    def __init__(self, data: Any):
+        self.body: bytes = json.dumps(
+            data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        self.etag: str = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str, compress_body: bool = True) -> Optional[bytes]:
+        """Method: returns the body compressed with ``encoding`` ("gzip" or "br"), compressed once with the best compression.
+
+        :param encoding: Content encoding
+        :param compress_body: Compress the body if it is not compressed yet, returns None otherwise (Default value = True)
+        """
+        encoded = self._encoded.get(encoding)
+        if encoded is None and compress_body:
+            encoded = self._encoded.setdefault(
+                encoding, compress(self.body, encoding, best=True)
+            )
+        return encoded
+
+    def etag_for(self, encoding: Optional[str] = None) -> str:
+        """Method: returns the strong ETag of the representation compressed with ``encoding``, of the body if None.
+
+        :param encoding: Content encoding (Default value = None)
+        """
+        if encoding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+
+class AS3SchemaService:
+    """Provides shared AS3Schema instances and builds the validators of the latest AS3 Schema versions ahead of time.
+
+    Instances are memoized per requested version (e.g. "latest", "3.20" or "3.20.0"), see :py:meth:`get`.
+    :py:meth:`start` prewarms the validators of the latest PATCH version of the ``prewarm_minors`` latest MAJOR.MINOR versions
+    in a background thread. The service is ready when prewarming finished, see :py:attr:`ready`.
+
+    :param prewarm_minors: Number of MAJOR.MINOR versions to prewarm (Default value = 1, 0 disables prewarming)
+    """
+
+    def __init__(self, prewarm_minors: int = 1):
+        self._prewarm_minors = prewarm_minors
+        self._instances: Dict[str, AS3Schema] = {}
+        self._serialized: Dict[Optional[str], SerializedJSON] = {}
+        self._serialized_subschemas = LRUCache(max_entries=256)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warm_versions: List[str] = []
+        self._error: Optional[str] = None
+
+    def get(self, version: str = "latest") -> AS3Schema:
+        """Method: returns the shared AS3Schema instance of ``version``.
+        Raises AS3SchemaVersionError for unknown versions, which are not memoized.
+
+        :param version: AS3 Schema version (Default value = "latest")
+        """
+        as3s = self._instances.get(version)
+        if as3s is None:
+            with self._lock:  # AS3Schema loads the AS3 Schemas into shared class attributes
+                as3s = self._instances.get(version)
+                if as3s is None:
+                    as3s = self._instances[version] = AS3Schema(version=version)
+        return as3s
+
+    def reset(self) -> None:
+        """Method: forgets all shared AS3Schema instances and serialized schemas, for example after the AS3 Schemas were updated."""
+        with self._lock:
+            self._instances.clear()
+            self._serialized.clear()
+        self._serialized_subschemas.clear()
+
+    def serialized(self, version: Optional[str] = None) -> SerializedJSON:
+        """Method: returns the serialized AS3 Schema of ``version``, serialized once per AS3 Schema version.
+        Raises AS3SchemaVersionError for unknown versions.
+
+        :param version: AS3 Schema version (Default value = None, all known AS3 Schemas)
+        """
+        key = None if version is None else self.get(version).version
+        serialized = self._serialized.get(key)
+        if serialized is None:
+            if key is None:
+                serialized = SerializedJSON(self.get().schemas)
+            else:
+                serialized = SerializedJSON(self.get(key).schema)
+            with self._lock:
+                serialized = self._serialized.setdefault(key, serialized)
+        return serialized
+
+    def serialized_subschema(
+        self,
+        version: str = "latest",
+        pointer: Optional[str] = None,
+        as3class: Optional[str] = None,
+    ) -> SerializedJSON:
+        """Method: returns the serialized subschema of the AS3 Schema of ``version`` referenced by the JSON ``pointer``
+        or the definition of the AS3 class ``as3class``, see :py:meth:`AS3Schema.subschema`.
+        The least recently used serialized subschemas are evicted.
+        Raises AS3SchemaVersionError for unknown versions and KeyError for unknown subschemas or AS3 classes.
+
+        :param version: AS3 Schema version (Default value = "latest")
+        :param pointer: JSON pointer of the subschema (Default value = None)
+        :param as3class: AS3 class name (Default value = None)
+        """
+        as3s = self.get(version)
+        key = (as3s.version, pointer, as3class)
+        serialized = self._serialized_subschemas.get(key)
+        if serialized is None:
+            serialized = SerializedJSON(
+                as3s.subschema(pointer=pointer, as3class=as3class, version=as3s.version)
+            )
+            self._serialized_subschemas.set(key, serialized)
+        return serialized
+
+    def prewarm_versions(self) -> List[str]:
+        """Method: returns the versions to prewarm, the latest PATCH version of the ``prewarm_minors`` latest MAJOR.MINOR versions."""
+        versions: Dict[tuple, str] = {}
+        for version in self.get().versions:  # sorted, latest version first
+            if len(versions) >= self._prewarm_minors:
+                break
+            versions.setdefault(_parse_version(version)[:2], version)
+        return list(versions.values())
+
+    def warmup(self) -> None:
+        """Method: builds the validators and compressed serialized schemas of the :py:meth:`prewarm_versions` and marks the service as ready.
+        The service does not become ready if an exception occurs, the exception is available as :py:attr:`error`."""
+        try:
+            for version in self.prewarm_versions():
+                self.get(version)._validator(version)  # pylint: disable=W0212
+                for encoding in ENCODINGS:  # pre-compress the schema responses
+                    self.serialized(version).encoded(encoding)
+                self._warm_versions.append(version)
+        except Exception as exc:  # pylint: disable=W0703 # reported by error
+            self._error = f"{exc.__class__.__name__}: {exc}"
+            return
+        self._ready.set()
+
+    def start(self) -> threading.Thread:
+        """Method: starts :py:meth:`warmup` in a background thread, returns the thread.
+        Calling start again returns the thread of the first call."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.warmup, name="as3ninja-schema-warmup", daemon=True
+                )
+                self._thread.start()
+        return self._thread
+
+    @property
+    def ready(self) -> bool:
+        """Property: returns True when prewarming finished."""
+        return self._ready.is_set()
+
+    @property
+    def warm_versions(self) -> List[str]:
+        """Property: returns the versions which have been prewarmed."""
+        return list(self._warm_versions)
+
+    @property
+    def error(self) -> Optional[str]:
+        """Property: returns the error which occurred during prewarming, None otherwise."""
+        return self._error
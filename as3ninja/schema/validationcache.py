@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache of AS3 declaration subtrees known to be valid.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+import hashlib
+import json
+from typing import Any, Optional
+
+from ..cache import DiskCache, LRUCache
+
+__all__ = ["ValidationCache"]
+
+
+class ValidationCache:
+    """Records subtrees (tenants and applications) of AS3 declarations which are known to be valid.
+
+    Entries are keyed by the AS3 Schema version, the AS3 class and the hash of the canonical JSON of the subtree.
+    Pass an instance to :py:meth:`AS3Schema.validate` to only re-validate changed subtrees.
+
+    :param max_entries: Maximum number of in-memory entries, the least recently used entry is evicted when exceeded (Default value = 4096)
+    :param path: Optional path to a SQLite database file to persist entries on disk (Default value = None)
+
+    Example usage:
+
+    .. code:: python
+
+        from as3ninja.schema import AS3Schema, ValidationCache
+
+        cache = ValidationCache(path="/tmp/as3ninja.validationcache.sqlite")
+        AS3Schema().validate(declaration, cache=cache)
+
+    """
+
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self._memory = LRUCache(max_entries=max_entries)
+        self._disk = DiskCache(path=path) if path else None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @staticmethod
+    def key(version: str, as3class: str, subtree: Any) -> str:
+        """Returns the cache key for ``subtree``.
+
+        :param version: AS3 Schema version
+        :param as3class: AS3 class of the subtree
+        :param subtree: Subtree of the AS3 declaration
+        """
+        canonical = json.dumps(
+            subtree, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return f"{version}:{as3class}:{digest}"
+
+    def is_valid(self, version: str, as3class: str, subtree: Any) -> bool:
+        """Returns ``True`` if ``subtree`` is known to be valid, ``False`` otherwise.
+
+        :param version: AS3 Schema version
+        :param as3class: AS3 class of the subtree
+        :param subtree: Subtree of the AS3 declaration
+        """
+        key = self.key(version, as3class, subtree)
+        if key in self._memory:
+            return True
+        if self._disk is not None and key in self._disk:
+            self._memory.set(key, True)
+            return True
+        return False
+
+    def add(self, version: str, as3class: str, subtree: Any) -> None:
+        """Records ``subtree`` as valid.
+
+        :param version: AS3 Schema version
+        :param as3class: AS3 class of the subtree
+        :param subtree: Subtree of the AS3 declaration
+        """
+        key = self.key(version, as3class, subtree)
+        self._memory.set(key, True)
+        if self._disk is not None:
+            self._disk.set(key, 1)
+
+    def clear(self) -> None:
+        """Removes all entries, including entries on disk."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
@@ -42,10 +42,54 @@ class NinjaSettings(BaseSettings):
     SCHEMA_BASE_PATH: str = ""
     # Github repository to fetch schema files
     SCHEMA_GITHUB_REPO: str = "https://github.com/F5Networks/f5-appsvcs-extension"
+    # Number of latest MAJOR.MINOR AS3 Schema versions to prepare validators for when the API starts
+    SCHEMA_PREWARM_MINORS: int = 1
 
     # SSL/TLS certificate verification (True -> verify)
     VAULT_SSL_VERIFY: bool = True
 
+    # Number of worker threads for rendering templates and serving AS3 Schemas in the API
+    API_WORKERS: int = 4
+    # Number of tasks waiting for an API worker, additional requests are rejected with HTTP 503
+    API_QUEUE_SIZE: int = 16
+    # Number of worker threads for git transformations (/declaration/transform/git*) of the API
+    API_GIT_WORKERS: int = 2
+    # Number of git transformations waiting for a worker, additional requests are rejected with HTTP 503
+    API_GIT_QUEUE_SIZE: int = 8
+    # Number of worker threads for AS3 Schema validations (/schema/validate, /declaration/transform/validate) of the API
+    API_VALIDATION_WORKERS: int = 2
+    # Number of validations waiting for a worker, additional requests are rejected with HTTP 503
+    API_VALIDATION_QUEUE_SIZE: int = 8
+    # Seconds a client should wait before retrying a rejected request (Retry-After header)
+    API_RETRY_AFTER: int = 1
+    # Maximum size of (decompressed) request bodies of the API raw endpoints in bytes
+    API_MAX_BODY_SIZE: int = 64 * 1024 * 1024
+    # Compress API responses with gzip or brotli (requires the brotli package) if accepted by the client
+    API_COMPRESSION: bool = True
+    # Minimum size of dynamic API responses (e.g. transformed declarations) to compress in bytes
+    API_COMPRESSION_MIN_SIZE: int = 1024
+    # Seconds finished API jobs (e.g. /declaration/transform/git/jobs) are retained
+    API_JOB_RETENTION: int = 300
+    # Maximum number of retained API jobs, the oldest finished jobs are removed first
+    API_JOB_MAX: int = 1024
+    # Maximum seconds a client can wait for a job to finish (long-polling)
+    API_JOB_MAX_WAIT: int = 30
+    # Seconds the API live preview (/declaration/transform/preview) waits for further edits before rendering
+    API_PREVIEW_DEBOUNCE: float = 0.1
+    # Maximum number of messages the API live preview applies together and renders once
+    API_PREVIEW_MAX_BATCH: int = 32
+    # Maximum number of messages waiting for the API live preview, clients sending more are disconnected
+    API_PREVIEW_QUEUE_SIZE: int = 256
+
+    # Seconds results of the API /declaration/transform endpoint are cached (0 -> disable cache)
+    TRANSFORM_CACHE_TTL: int = 300
+    # Maximum number of cached transform results
+    TRANSFORM_CACHE_MAX_ENTRIES: int = 256
+    # Maximum total size of cached transform results in bytes
+    TRANSFORM_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # SQLite file to share the transform cache between API worker processes ("" -> in-process cache)
+    TRANSFORM_CACHE_PATH: str = ""
+
     class Config:
         """Configuration for NinjaSettings BaseSettings class"""
 
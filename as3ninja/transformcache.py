@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of transformed AS3 Declarations.
+"""
+
+# pylint: disable=C0301 # Line too long
+
+import hashlib
+import json
+import struct
+import time
+from functools import lru_cache
+from typing import Any, Optional, Set, Union
+
+from jinja2 import Environment, nodes
+from jinja2.exceptions import TemplateSyntaxError
+
+from . import __version__
+from .cache import DiskCache, LRUCache
+from .jinja2 import J2Ninja
+
+__all__ = ["TransformCache", "UNCACHEABLE_NAMES"]
+
+# Jinja2 functions and filters which are not deterministic or perform I/O, see J2Ninja.registeruncacheable
+UNCACHEABLE_NAMES: Set[str] = J2Ninja.uncacheable
+
+_EXPIRES = struct.Struct("!d")
+
+
+@lru_cache(maxsize=256)
+def _template_is_cacheable(declaration_template: str) -> bool:
+    """Returns ``True`` if the rendered ``declaration_template`` only depends on the template configuration.
+
+    Templates are not cacheable if they use any of the ``UNCACHEABLE_NAMES`` as function or filter,
+    include or import other templates, or cannot be parsed.
+
+    :param declaration_template: The Declaration Template
+    """
+    try:
+        ast = Environment().parse(declaration_template)  # nosec (not rendered)
+    except TemplateSyntaxError:
+        return False
+    if any(
+        ast.find_all((nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends))
+    ):
+        return False
+    for node in ast.find_all((nodes.Filter, nodes.Name)):
+        if node.name in UNCACHEABLE_NAMES:
+            return False
+    return True
+
+
+class TransformCache:
+    """Caches transformed AS3 Declarations (JSON bytes) by the hash of the template configuration and declaration template.
+
+    Entries expire after ``ttl`` seconds. The backend is an in-memory :py:class:`as3ninja.cache.LRUCache`,
+    or a :py:class:`as3ninja.cache.DiskCache` shared by multiple processes if ``path`` is specified.
+    Use :py:meth:`cacheable` to check whether the result of a transformation can be cached.
+
+    :param ttl: Seconds after which entries expire (Default value = 300)
+    :param max_entries: Maximum number of entries (Default value = 256)
+    :param max_bytes: Maximum total size of the cached declarations in bytes (Default value = 64 MiB)
+    :param path: Optional path to a SQLite database file to use as backend (Default value = None)
+    """
+
+    def __init__(
+        self,
+        ttl: int = 300,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: Optional[str] = None,
+    ):
+        self._ttl = ttl
+        self._backend: Union[LRUCache, DiskCache]
+        if path:
+            self._backend = DiskCache(
+                path=path, max_entries=max_entries, max_bytes=max_bytes
+            )
+        else:
+            self._backend = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._backend)
+
+    @staticmethod
+    def key(template_configuration: Any, declaration_template: str) -> str:
+        """Returns the cache key: the sha256 of the canonical JSON of ``template_configuration`` and ``declaration_template``.
+        The AS3 Ninja version is part of the key, as the transformation may change between versions.
+
+        :param template_configuration: The Template Configuration
+        :param declaration_template: The Declaration Template
+        """
+        canonical = json.dumps(
+            [__version__, template_configuration, declaration_template],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def cacheable(template_configuration: Any, declaration_template: str) -> bool:
+        """Returns ``True`` if the transformation only depends on its input and can be cached.
+        Transformations including files (``as3ninja.include``, Jinja2 ``include``/``import``)
+        or using non-deterministic or I/O functions and filters (see ``UNCACHEABLE_NAMES``) are not cacheable.
+
+        :param template_configuration: The Template Configuration
+        :param declaration_template: The Declaration Template
+        """
+        configurations = (
+            template_configuration
+            if isinstance(template_configuration, list)
+            else [template_configuration]
+        )
+        for configuration in configurations:
+            if not isinstance(configuration, dict):
+                return False
+            as3ninja = configuration.get("as3ninja")
+            if isinstance(as3ninja, dict) and "include" in as3ninja:
+                return False
+        return _template_is_cacheable(declaration_template)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached declaration for ``key``, ``None`` if it is not cached or expired.
+
+        :param key: Cache key, see :py:meth:`key`
+        """
+        entry = self._backend.get(key)
+        if entry is None:
+            return None
+        (expires,) = _EXPIRES.unpack_from(entry)
+        if expires < time.time():
+            self._backend.delete(key)
+            return None
+        return bytes(entry[_EXPIRES.size :])
+
+    def set(self, key: str, declaration: bytes) -> None:
+        """Caches the transformed ``declaration`` for ``key``.
+
+        :param key: Cache key, see :py:meth:`key`
+        :param declaration: The transformed declaration as JSON bytes
+        """
+        self._backend.set(key, _EXPIRES.pack(time.time() + self._ttl) + declaration)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        self._backend.clear()
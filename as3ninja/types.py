@@ -3,7 +3,8 @@
 AS3 Ninja types.
 """
 import ipaddress
-from typing import Any, Optional
+from array import array
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from pydantic import BaseModel
 
@@ -11,78 +12,325 @@ __all__ = [
     "F5IP",
     "F5IPv4",
     "F5IPv6",
+    "F5IPBatch",
+    "ParsedF5IP",
+    "parse_f5ip",
+    "validate_many",
 ]
 
+_DECIMAL_DIGITS = frozenset("0123456789")
+_MAX_RDID = 65534
+_LOW_64 = (1 << 64) - 1
 
-class BaseF5IP(str):
+
+class ParsedF5IP:
     """
-    F5IP base class.
-    Accepts IPv4 and IPv6 IP addresses in F5 notation.
+    Result of :py:func:`parse_f5ip`, an IPv4 or IPv6 address or network in F5 notation: ``addr%rdid/mask``.
+
+    ``addr``, ``rdid`` and ``mask`` are the str components of the F5 notation (empty str if not present),
+    ``version`` is the IP version (4 or 6), ``address`` the address as int and ``prefixlen`` the prefix length.
     """
 
-    @staticmethod
-    def _get_addr(ipaddr: str) -> str:
-        addr = ipaddr.split("%")[0]
-        if addr != ipaddr:
-            return addr
-        return ipaddr.split("/")[0]
+    __slots__ = ("addr", "rdid", "mask", "version", "address", "prefixlen")
+
+    def __init__(
+        self,
+        addr: str,
+        rdid: str,
+        mask: str,
+        version: int,
+        address: int,
+        prefixlen: int,
+    ):
+        self.addr = addr
+        self.rdid = rdid
+        self.mask = mask
+        self.version = version
+        self.address = address
+        self.prefixlen = prefixlen
+
+    @property
+    def max_prefixlen(self) -> int:
+        """Property: returns the maximum prefix length of the IP version (32 or 128)."""
+        return 32 if self.version == 4 else 128
+
+    @property
+    def route_domain(self) -> Optional[int]:
+        """Property: returns the route domain id as int, ``None`` if the route domain is not specified."""
+        return int(self.rdid) if self.rdid else None
+
+    @property
+    def first(self) -> int:
+        """Property: returns the first address of the network as int."""
+        return self.address
+
+    @property
+    def last(self) -> int:
+        """Property: returns the last address of the network as int."""
+        return self.address | ((1 << (self.max_prefixlen - self.prefixlen)) - 1)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ParsedF5IP):
+            return NotImplemented
+        return (self.version, self.address, self.prefixlen, self.route_domain) == (
+            other.version,
+            other.address,
+            other.prefixlen,
+            other.route_domain,
+        )
 
-    @staticmethod
-    def _get_mask(ipaddr: str) -> str:
-        try:
-            return ipaddr.split("/")[1]
-        except IndexError:
-            return ""
+    def __hash__(self) -> int:
+        return hash((self.version, self.address, self.prefixlen, self.route_domain))
 
-    @staticmethod
-    def _get_rdid(ipaddr: str) -> str:
-        try:
-            ipaddr = ipaddr.split("/")[0]
-            return ipaddr.split("%")[1]
-        except IndexError:
-            return ""
+    def __repr__(self) -> str:
+        value = self.addr
+        if self.rdid:
+            value += f"%{self.rdid}"
+        if self.mask:
+            value += f"/{self.mask}"
+        return f"{self.__class__.__name__}({value!r})"
 
-    @staticmethod
-    def _validate_ipv4(value: str) -> None:
-        try:
-            ipaddress.IPv4Network(value)
-        except ValueError:
-            raise ValueError(f"invalid address: '{value}'") from None
 
-        if ipaddress.IPv4Network(value).is_loopback is True:
-            raise ValueError(f"invalid address: '{value}': loopback not allowed")
+def _split_f5ip(value: str) -> Tuple[str, str, str]:
+    """
+    Splits an address in F5 notation ``addr%rdid/mask`` into the str components ``addr``, ``rdid`` and ``mask``.
+    Components which are not present are returned as empty str.
+
+    :param value: Address in F5 notation
+    """
+    addr, _, mask = value.partition("/")
+    addr, _, rdid = addr.partition("%")
+    return addr, rdid, mask
+
+
+def _parse_ipv4_address(addr: str) -> int:
+    """
+    Parses an IPv4 address in dotted decimal notation to int. Raises ValueError if ``addr`` is invalid.
+
+    :param addr: IPv4 address
+    """
+    octets = addr.split(".")
+    if len(octets) != 4:
+        raise ValueError(f"invalid address: '{addr}'")
+    address = 0
+    for octet in octets:
+        if (
+            not octet
+            or len(octet) > 3
+            or not _DECIMAL_DIGITS.issuperset(octet)
+            or (octet[0] == "0" and len(octet) > 1)
+        ):
+            raise ValueError(f"invalid address: '{addr}'")
+        octet_value = int(octet)
+        if octet_value > 255:
+            raise ValueError(f"invalid address: '{addr}'")
+        address = (address << 8) | octet_value
+    return address
+
+
+def _parse_prefixlen(addr: str, mask: str, version: int) -> int:
+    """
+    Parses the mask of an address to the prefix length. Raises ValueError if ``mask`` is invalid.
+    The mask can be a prefix length or, for IPv4, a netmask or hostmask.
 
-    @staticmethod
-    def _validate_ipv6(value: str) -> None:
+    :param addr: Address
+    :param mask: Mask, empty str for a host address
+    :param version: IP version
+    """
+    max_prefixlen = 32 if version == 4 else 128
+    if not mask:
+        return max_prefixlen
+    if _DECIMAL_DIGITS.issuperset(mask):
+        prefixlen = int(mask)
+        if prefixlen <= max_prefixlen:
+            return prefixlen
+    elif version == 4:
         try:
-            ipaddress.IPv6Network(value)
+            return ipaddress.IPv4Network(f"0.0.0.0/{mask}").prefixlen
         except ValueError:
-            raise ValueError(f"invalid address: '{value}'") from None
+            pass
+    raise ValueError(f"invalid address: '{addr}/{mask}'")
 
-        if ipaddress.IPv6Network(value).is_loopback is True:
-            raise ValueError(f"invalid address: '{value}': loopback not allowed")
 
-    @classmethod
-    def _validate_ipany(cls, value: str) -> None:
+def parse_f5ip(value: str, version: Optional[int] = None) -> ParsedF5IP:
+    """
+    Parses and validates an IPv4 or IPv6 address or network in F5 notation ``addr%rdid/mask`` in a single pass.
+    Returns a :py:class:`ParsedF5IP`, raises ValueError if ``value`` is invalid.
+
+    Networks must not have host bits set, loopback addresses are not allowed and
+    the route domain id must be in the range of 0 to 65534.
+
+    :param value: Address in F5 notation, for example: ``192.0.2.0%12/24``
+    :param version: Only accept IPv4 (4) or IPv6 (6) addresses (Default value = None, accept both)
+    """
+    if not isinstance(value, str):
+        raise TypeError("string required")
+
+    addr, rdid, mask = _split_f5ip(value)
+
+    if rdid:
+        if not _DECIMAL_DIGITS.issuperset(rdid) or int(rdid) > _MAX_RDID:
+            raise ValueError(f"invalid route domain: '{rdid}'")
+
+    if ":" in addr:
+        if version == 4:
+            raise ValueError(f"invalid address: '{addr}'")
         try:
-            cls._validate_ipv4(value)
+            address = int(ipaddress.IPv6Address(addr))
         except ValueError:
-            cls._validate_ipv6(value)
+            raise ValueError(f"invalid address: '{addr}'") from None
+        ip_version = 6
+    else:
+        if version == 6:
+            raise ValueError(f"invalid address: '{addr}'")
+        address = _parse_ipv4_address(addr)
+        ip_version = 4
+
+    prefixlen = _parse_prefixlen(addr, mask, ip_version)
+    max_prefixlen = 32 if ip_version == 4 else 128
+    if address & ((1 << (max_prefixlen - prefixlen)) - 1):
+        raise ValueError(f"invalid address: '{addr}/{mask}': host bits set")
+
+    if ip_version == 4:
+        loopback = prefixlen >= 8 and address >> 24 == 127
+    else:
+        loopback = prefixlen == 128 and address == 1
+    if loopback:
+        raise ValueError(f"invalid address: '{value}': loopback not allowed")
+
+    return ParsedF5IP(
+        addr=addr,
+        rdid=rdid,
+        mask=mask,
+        version=ip_version,
+        address=address,
+        prefixlen=prefixlen,
+    )
+
+
+class F5IPBatch:
+    """
+    Result of :py:meth:`F5IP.validate_many`, holds one entry per validated value in packed arrays.
+
+    ``versions`` holds the IP version (0 for invalid values), ``route_domains`` the route domain id (-1 if not specified),
+    the first and last address of every value are split in a high and low 64bit part (``first_high``, ``first_low``,
+    ``last_high``, ``last_low``), IPv4 addresses only use the low part.
+    ``errors`` maps the index of every invalid value to the error message.
+    """
+
+    __slots__ = (
+        "versions",
+        "route_domains",
+        "first_high",
+        "first_low",
+        "last_high",
+        "last_low",
+        "errors",
+    )
+
+    def __init__(self):
+        self.versions = array("B")
+        self.route_domains = array("l")
+        self.first_high = array("Q")
+        self.first_low = array("Q")
+        self.last_high = array("Q")
+        self.last_low = array("Q")
+        self.errors: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    @property
+    def valid(self) -> bool:
+        """Property: returns ``True`` if all values are valid, ``False`` otherwise."""
+        return not self.errors
+
+    def is_valid(self, index: int) -> bool:
+        """Returns ``True`` if the value at ``index`` is valid, ``False`` otherwise.
+
+        :param index: Index of the value
+        """
+        return self.versions[index] != 0
+
+    def route_domain(self, index: int) -> Optional[int]:
+        """Returns the route domain id of the value at ``index``, ``None`` if not specified.
 
-    @staticmethod
-    def _validate_rdid(rdid: str) -> None:
-        if rdid:
+        :param index: Index of the value
+        """
+        rdid = self.route_domains[index]
+        return None if rdid < 0 else rdid
+
+    def first(self, index: int) -> int:
+        """Returns the first address of the value at ``index`` as int.
+
+        :param index: Index of the value
+        """
+        return (self.first_high[index] << 64) | self.first_low[index]
+
+    def last(self, index: int) -> int:
+        """Returns the last address of the value at ``index`` as int.
+
+        :param index: Index of the value
+        """
+        return (self.last_high[index] << 64) | self.last_low[index]
+
+    def _append(self, parsed: Optional[ParsedF5IP]) -> None:
+        """Private Method: appends the result for a value, ``None`` for an invalid value.
+
+        :param parsed: The parsed value
+        """
+        if parsed is None:
+            self.versions.append(0)
+            self.route_domains.append(-1)
+            first = last = 0
+        else:
+            self.versions.append(parsed.version)
+            self.route_domains.append(
+                -1 if parsed.route_domain is None else parsed.route_domain
+            )
+            first, last = parsed.first, parsed.last
+        self.first_high.append(first >> 64)
+        self.first_low.append(first & _LOW_64)
+        self.last_high.append(last >> 64)
+        self.last_low.append(last & _LOW_64)
+
+
+def validate_many(values: Iterable[Any], version: Optional[int] = None) -> F5IPBatch:
+    """
+    Parses and validates many addresses in F5 notation in one call, see :py:func:`parse_f5ip`.
+    Repeated values are only parsed once. Returns a :py:class:`F5IPBatch` with one entry per value.
+
+    :param values: Addresses in F5 notation
+    :param version: Only accept IPv4 (4) or IPv6 (6) addresses (Default value = None, accept both)
+    """
+    batch = F5IPBatch()
+    parsed_values: Dict[str, Tuple[Optional[ParsedF5IP], str]] = {}
+    for index, value in enumerate(values):
+        if not isinstance(value, str):
+            batch._append(None)  # pylint: disable=W0212 # Access to a protected member
+            batch.errors[index] = "string required"
+            continue
+        try:
+            parsed, error = parsed_values[value]
+        except KeyError:
             try:
-                _rdid = int(rdid)
-            except ValueError:
-                raise ValueError(f"invalid route domain: '{rdid}'") from None
+                parsed, error = parse_f5ip(value, version=version), ""
+            except ValueError as exc:
+                parsed, error = None, str(exc)
+            parsed_values[value] = (parsed, error)
+        batch._append(parsed)  # pylint: disable=W0212 # Access to a protected member
+        if parsed is None:
+            batch.errors[index] = error
+    return batch
 
-            if _rdid < 0 or _rdid > 65534:
-                raise ValueError(f"invalid route domain: '{rdid}'")
 
-    @classmethod
-    def _validate_ip(cls, value: str) -> None:
-        cls._validate_ipany(value)
+class BaseF5IP(str):
+    """
+    F5IP base class.
+    Accepts IPv4 and IPv6 IP addresses in F5 notation.
+    """
+
+    _version: Optional[int] = None  # IP version accepted by parse_f5ip
 
     @classmethod
     def __get_validators__(cls):
@@ -108,17 +356,7 @@ class BaseF5IP(str):
         """
         Validate method is automatically called pydantic.
         """
-        addr = cls._get_addr(value)
-        mask = cls._get_mask(value)
-        rdid = cls._get_rdid(value)
-
-        cls._validate_rdid(rdid)
-
-        if mask:
-            cls._validate_ip(f"{addr}/{mask}")
-        else:
-            cls._validate_ip(addr)
-
+        parse_f5ip(value, version=cls._version)
         return cls(f"{value}")
 
 
@@ -128,9 +366,7 @@ class BaseF5IPv4(BaseF5IP):
     Accepts IPv4 addresses in F5 notation.
     """
 
-    @classmethod
-    def _validate_ip(cls, value: str) -> None:
-        cls._validate_ipv4(value)
+    _version = 4
 
     @classmethod
     def __modify_schema__(cls, field_schema):
@@ -150,9 +386,7 @@ class BaseF5IPv6(BaseF5IP):
     Accepts IPv6 addresses in F5 notation.
     """
 
-    @classmethod
-    def _validate_ip(cls, value: str) -> None:
-        cls._validate_ipv6(value)
+    _version = 6
 
     @classmethod
     def __modify_schema__(cls, field_schema):
@@ -179,11 +413,20 @@ class F5IP(BaseModel):
     def __init__(self, f5ip):
         if not isinstance(f5ip, str):
             raise TypeError("string required")
-        super().__init__(
-            f5ip=f5ip,
-            addr=BaseF5IP._get_addr(f5ip),
-            mask=BaseF5IP._get_mask(f5ip),
-            rdid=BaseF5IP._get_rdid(f5ip),
+        addr, rdid, mask = _split_f5ip(f5ip)
+        super().__init__(f5ip=f5ip, addr=addr, mask=mask, rdid=rdid)
+
+    @classmethod
+    def validate_many(cls, values: Iterable[Any]) -> F5IPBatch:
+        """
+        Validates many addresses in F5 notation in one call without creating a model per address.
+        Returns a :py:class:`F5IPBatch` with one entry per value.
+
+        :param values: Addresses in F5 notation
+        """
+        f5ip_type = cls.__fields__["f5ip"].type_
+        return validate_many(
+            values, version=f5ip_type._version  # pylint: disable=W0212
         )
 
     def __repr__(self):
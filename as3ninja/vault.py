@@ -98,6 +98,7 @@ class VaultSecret(BaseModel):
         return (None, path)
 
 
+@J2Ninja.registeruncacheable
 @J2Ninja.registerfunction
 class VaultClient:
     """Vault Client object, returns a hvac.v1.Client object.
@@ -190,6 +191,7 @@ class VaultClient:
         return cls._defaultClient
 
 
+@J2Ninja.registeruncacheable
 @J2Ninja.registerfilter
 @J2Ninja.registerfunction
 @pass_context
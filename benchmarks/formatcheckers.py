@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the AS3 format checks.
+
+For every format the check is timed for distinct values (cold, every value is checked)
+and for a recurring value (warm, the memoized result is used).
+
+Usage: make benchmark or PYTHONPATH=. python benchmarks/formatcheckers.py [number]
+"""
+import sys
+import timeit
+
+from as3ninja.schema.formatcheckers import AS3FormatChecker
+
+SAMPLES = {
+    "f5ip": "192.0.2.{}%12/32",
+    "f5ipv4": "192.0.2.{}",
+    "f5ipv6": "2001:db8::{}%12/128",
+    "f5name": "Service_{}",
+    "f5bigip": "/Common/pool_{}",
+    "f5long-id": "sha256:9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f{}",
+    "f5label": "some label {}",
+    "f5remark": "some remark {}",
+    "f5pointer": "/@/A/serviceMain_{}/virtualPort",
+    "f5base64": "dGVzdA{}==",
+}
+
+
+def main(number: int = 10000) -> None:
+    """Runs the benchmark and prints the time per check in microseconds."""
+    checkers = AS3FormatChecker().checkers
+    print(f"{'format':<12}{'cold [us]':>12}{'warm [us]':>12}")
+    for name, sample in SAMPLES.items():
+        check = checkers[name][0]
+        values = [sample.format(i % 250) for i in range(number)]
+
+        cold = timeit.timeit(lambda: [check.__wrapped__(v) for v in values], number=1)
+
+        value = values[0]
+        check(value)
+        warm = timeit.timeit(lambda: check(value), number=number)
+
+        print(f"{name:<12}{cold / number * 1e6:>12.2f}{warm / number * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from as3ninja.analysis import AddressIndex, address_report
+
+
+def tenant(name: str, addresses: list, members: list = None, **kwargs) -> dict:
+    return {
+        name: {
+            "class": "Tenant",
+            **kwargs,
+            "App": {
+                "class": "Application",
+                "service": {"class": "Service_TCP", "virtualAddresses": addresses},
+                "pool": {
+                    "class": "Pool",
+                    "members": [{"serverAddresses": members or []}],
+                },
+            },
+        }
+    }
+
+
+class Test_AddressIndex:
+    @staticmethod
+    def test_add():
+        index = AddressIndex()
+        assert index.add("192.0.2.1") is True
+        assert index.add("invalid") is False
+        assert index.add(1) is False
+        assert len(index) == 1
+
+    @staticmethod
+    def test_duplicates():
+        index = AddressIndex()
+        index.add("192.0.2.1", pointer="/a", tenant="A")
+        index.add("192.0.2.1%0", pointer="/b", tenant="A")
+        index.add("192.0.2.1", pointer="/c", tenant="B", default_route_domain=1)
+        index.add("2001:db8::1", pointer="/d", tenant="A")
+        duplicates = index.duplicates()
+        assert len(duplicates) == 1
+        assert duplicates[0].route_domain == 0
+        assert [location.pointer for location in duplicates[0].locations] == [
+            "/a",
+            "/b",
+        ]
+
+    @staticmethod
+    def test_duplicates_cross_tenant():
+        index = AddressIndex()
+        index.add("192.0.2.1", tenant="A")
+        index.add("192.0.2.1", tenant="A")
+        index.add("192.0.2.2", tenant="A")
+        index.add("192.0.2.2", tenant="B")
+        duplicates = index.duplicates(cross_tenant=True)
+        assert len(duplicates) == 1
+        assert duplicates[0].locations[0].address == "192.0.2.2"
+
+    @staticmethod
+    def test_overlaps():
+        index = AddressIndex()
+        index.add("10.0.0.0/8", pointer="/net8")
+        index.add("10.1.0.0/16", pointer="/net16")
+        index.add("10.1.2.3", pointer="/host")
+        index.add("10.2.0.1", pointer="/other")
+        index.add("10.1.2.3%1", pointer="/rd1")
+        index.add("11.0.0.0/8", pointer="/net11")
+        index.add("::a01:203", pointer="/ipv6")
+        overlaps = {
+            (overlap.network[0].pointer, overlap.contained[0].pointer)
+            for overlap in index.overlaps()
+        }
+        assert overlaps == {
+            ("/net8", "/net16"),
+            ("/net8", "/host"),
+            ("/net16", "/host"),
+            ("/net8", "/other"),
+        }
+
+    @staticmethod
+    def test_overlaps_cross_tenant():
+        index = AddressIndex()
+        index.add("10.0.0.0/8", tenant="A")
+        index.add("10.1.0.0/16", tenant="B")
+        index.add("10.1.2.3", tenant="B")
+        overlaps = {
+            (overlap.network[0].address, overlap.contained[0].address)
+            for overlap in index.overlaps(cross_tenant=True)
+        }
+        assert overlaps == {("10.0.0.0/8", "10.1.0.0/16"), ("10.0.0.0/8", "10.1.2.3")}
+
+    @staticmethod
+    def test_large():
+        index = AddressIndex()
+        for i in range(20000):
+            index.add(f"10.{i >> 8 & 255}.{i & 255}.1")
+        index.add("10.0.0.0/16")
+        assert index.duplicates() == []
+        assert len(index.overlaps()) == 256
+
+
+class Test_address_report:
+    @staticmethod
+    def test_from_declaration():
+        declaration = {
+            "class": "AS3",
+            "declaration": {
+                "class": "ADC",
+                **tenant("A", ["192.0.2.1", ["192.0.2.2", "0.0.0.0/0"]], ["10.0.0.1"]),
+                **tenant("B", ["192.0.2.1", {"use": "va"}], ["10.0.0.1"]),
+            },
+        }
+        report = address_report(declaration)
+        assert report.addresses == 5
+        assert len(report.duplicates) == 2
+        assert report.overlaps == []
+        assert [location.pointer for location in report.duplicates[1].locations] == [
+            "/declaration/A/App/service/virtualAddresses/0",
+            "/declaration/B/App/service/virtualAddresses/0",
+        ]
+        assert report.duplicates[1].locations[0].tenant == "A"
+
+    @staticmethod
+    def test_default_route_domain():
+        declaration = {
+            **tenant("A", ["192.0.2.1"]),
+            **tenant("B", ["192.0.2.1"], defaultRouteDomain=2),
+            **tenant("C", ["192.0.2.1%2"]),
+        }
+        report = address_report(declaration)
+        assert len(report.duplicates) == 1
+        assert report.duplicates[0].route_domain == 2
+        assert [location.tenant for location in report.duplicates[0].locations] == [
+            "B",
+            "C",
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize("cross_tenant, expected", [(False, 2), (True, 1)])
+    def test_cross_tenant(cross_tenant, expected):
+        declaration = {
+            **tenant("A", ["192.0.2.1"], ["10.0.0.1", "10.0.0.1"]),
+            **tenant("B", ["192.0.2.1"]),
+        }
+        report = address_report(declaration, cross_tenant=cross_tenant)
+        assert len(report.duplicates) == expected
+
+    @staticmethod
+    def test_pointer_escape():
+        report = address_report(
+            {"a/b~c": {"virtualAddress": "192.0.2.1", "address": "192.0.2.1"}}
+        )
+        assert {location.pointer for location in report.duplicates[0].locations} == {
+            "/a~1b~0c/virtualAddress",
+            "/a~1b~0c/address",
+        }
@@ -1,13 +1,36 @@
+import asyncio
+import gzip
 import json
+import threading
+from concurrent.futures import Future
 from functools import partial
 from os import getenv
 from pathlib import Path
 
 import httpx
 import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
 from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 
-from as3ninja.api import app, startup
+from as3ninja.api import (
+    GIT_TRANSFORMS,
+    SCHEMA_SERVICE,
+    AS3DeclareGit,
+    _etag_matches,
+    _wait_job,
+    app,
+    post_declaration_git_transform,
+    startup,
+)
+from as3ninja.concurrency import BoundedExecutor
+from as3ninja.declaration import AS3Declaration, AS3DeclarationTemplate
+from as3ninja.exceptions import GitgetException, QueueFullError
+from as3ninja.jobs import Job, JobStore
+from as3ninja.schema import AS3SchemaService
+from as3ninja.settings import NINJASETTINGS
+from as3ninja.transformcache import TransformCache
 
 # ENV: DOCKER_TESTING=true to test docker
 
@@ -165,6 +188,217 @@ class Test_Schema:
         assert response.json()["valid"] == False
         assert response.json()["error"]
 
+    @staticmethod
+    def test_schema_validate_fail_max_errors():
+        invalid_declaration_v390__dict: dict = {
+            "class": "AS3",
+            "declaration": {"class": "ADC", "schemaVersion": "4.9.0", "id": 1},
+        }
+        response = api_client.post(
+            "/api/schema/validate?max_errors=5&max_context_depth=0",
+            json=invalid_declaration_v390__dict,
+        )
+        assert response.status_code == 200
+        assert response.json()["valid"] == False
+        assert 1 < len(response.json()["errors"]) <= 5
+        assert response.json()["error"] == response.json()["errors"][0]
+
+    @staticmethod
+    def test_schema_validate_max_errors_invalid():
+        response = api_client.post(
+            "/api/schema/validate?max_errors=0", json={"class": "AS3"}
+        )
+        assert response.status_code == 422
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "declaration",
+        [
+            {"class": "ADC", "schemaVersion": 3.9},
+            {"class": "AS3", "declaration": ["ADC"]},
+        ],
+    )
+    def test_schema_validate_auto_invalid_declaration(declaration):
+        response = api_client.post(
+            "/api/schema/validate?version=auto", json=declaration
+        )
+        assert response.status_code == 400
+
+
+class Test_Schema_serialized:
+    @staticmethod
+    @pytest.mark.parametrize("path", ["/api/schema/schema", "/api/schema/schemas"])
+    def test_etag(path):
+        response = api_client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        response = api_client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+        response = api_client.get(path, headers={"If-None-Match": f'"x", W/{etag}'})
+        assert response.status_code == 304
+        response = api_client.get(path, headers={"If-None-Match": '"x"'})
+        assert response.status_code == 200
+
+    @staticmethod
+    def test_etag_per_version():
+        etags = {
+            api_client.get(f"/api/schema/schema?version={version}").headers["ETag"]
+            for version in ("3.8.1", "latest", "3.8.1")
+        }
+        assert len(etags) == 2
+
+    @staticmethod
+    def test_gzip():
+        response = api_client.get(
+            "/api/schema/schema", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.json()["$schema"]
+
+    @staticmethod
+    def test_identity():
+        response = api_client.get(
+            "/api/schema/schema", headers={"Accept-Encoding": "identity"}
+        )
+        assert "Content-Encoding" not in response.headers
+        assert response.json()["$schema"]
+
+    @staticmethod
+    def test_etag_per_encoding():
+        identity = api_client.get(
+            "/api/schema/schema", headers={"Accept-Encoding": "identity"}
+        ).headers["ETag"]
+        response = api_client.get(
+            "/api/schema/schema", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["ETag"] == f'{identity[:-1]}-gzip"'
+        response = api_client.get(
+            "/api/schema/schema",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": identity},
+        )
+        assert response.status_code == 200
+        response = api_client.get(
+            "/api/schema/schema",
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": f'{identity[:-1]}-gzip"',
+            },
+        )
+        assert response.status_code == 304
+
+    @staticmethod
+    def test_brotli():
+        brotli = pytest.importorskip("brotli")
+        response = api_client.get(
+            "/api/schema/schema", headers={"Accept-Encoding": "gzip, br"}
+        )
+        assert response.headers["Content-Encoding"] == "br"
+
+    @staticmethod
+    def test_compression_disabled(mocker):
+        mocker.patch.object(NINJASETTINGS, "API_COMPRESSION", False)
+        response = api_client.get(
+            "/api/schema/schema", headers={"Accept-Encoding": "gzip"}
+        )
+        assert "Content-Encoding" not in response.headers
+
+
+class Test_Schema_subschema:
+    @staticmethod
+    def test_classes():
+        response = api_client.get("/api/schema/classes")
+        assert response.status_code == 200
+        classes = response.json()
+        assert classes == sorted(classes)
+        assert {"ADC", "Tenant", "Application", "Pool"} <= set(classes)
+
+    @staticmethod
+    def test_classes_unknown_version():
+        response = api_client.get("/api/schema/classes?version=3.99.99")
+        assert response.status_code == 400
+
+    @staticmethod
+    def test_class():
+        response = api_client.get("/api/schema/classes/Pool?version=3.8.1")
+        assert response.status_code == 200
+        subschema = response.json()
+        assert subschema["properties"]["class"]["const"] == "Pool"
+        assert response.headers["ETag"]
+
+    @staticmethod
+    def test_class_resolved():
+        response = api_client.get("/api/schema/classes/Tenant")
+        assert "$ref" not in response.text
+
+    @staticmethod
+    def test_pointer():
+        response = api_client.get(
+            "/api/schema/subschema",
+            params={"pointer": "/definitions/Pool", "version": "3.8.1"},
+        )
+        assert response.status_code == 200
+        assert (
+            response.json()
+            == api_client.get("/api/schema/classes/Pool?version=3.8.1").json()
+        )
+
+    @staticmethod
+    def test_etag():
+        response = api_client.get("/api/schema/classes/Pool")
+        response = api_client.get(
+            "/api/schema/classes/Pool",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 304
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/schema/classes/Unknown",
+            "/api/schema/subschema?pointer=/definitions/Unknown",
+        ],
+    )
+    def test_unknown(path):
+        response = api_client.get(path)
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/schema/classes/Pool?version=3.99.99",
+            "/api/schema/subschema?pointer=definitions",
+        ],
+    )
+    def test_invalid(path):
+        assert api_client.get(path).status_code == 400
+
+    @staticmethod
+    def test_pointer_required():
+        assert api_client.get("/api/schema/subschema").status_code == 422
+
+
+class Test_headers:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "if_none_match, expected",
+        [
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"x", "abc"', True),
+            ("*", True),
+            ('"abcd"', False),
+            ("", False),
+        ],
+    )
+    def test_etag_matches(if_none_match, expected):
+        assert _etag_matches(if_none_match, '"abc"') is expected
+
 
 class Test_declaration_transform_git:
     def test_successful(self, mocker):
@@ -199,6 +433,174 @@ class Test_declaration_transform_git:
         assert "repository 'none' does not exist" in response.json()["detail"]
 
 
+class Test_declaration_transform_git_coalescing:
+    @staticmethod
+    def transform(mocker, requests, remote_commit=None):
+        calls = []
+
+        def git_transform(as3d):
+            calls.append(as3d)
+            threading.Event().wait(0.05)
+            return b'{"commit": "%d"}' % len(calls)
+
+        mocker.patch("as3ninja.api._git_transform", side_effect=git_transform)
+        mocker.patch(
+            "as3ninja.api.Gitget.remote_commit",
+            side_effect=remote_commit or (lambda repository, branch: "a" * 40),
+        )
+
+        async def main():
+            return await asyncio.gather(
+                *(
+                    post_declaration_git_transform(
+                        AS3DeclareGit(**request),
+                        Request({"type": "http", "headers": []}),
+                    )
+                    for request in requests
+                )
+            )
+
+        return [response.body for response in asyncio.run(main())], calls
+
+    def test_coalesced(self, mocker):
+        request = {"repository": "https://example.com/repo", "branch": "main"}
+        results, calls = self.transform(mocker, [request] * 4)
+        assert results == [b'{"commit": "1"}'] * 4
+        assert len(calls) == 1
+        assert GIT_TRANSFORMS.inflight == 0
+
+    def test_different_requests(self, mocker):
+        request = {"repository": "https://example.com/repo"}
+        results, calls = self.transform(
+            mocker,
+            [
+                request,
+                dict(request, template_configuration={"a": 1}),
+                dict(request, commit="HEAD~1"),
+                dict(request, depth=2),
+            ],
+        )
+        assert len(calls) == 4
+
+    def test_commit_id_not_resolved(self, mocker):
+        remote_commit = mocker.MagicMock()
+        request = {"repository": "https://example.com/repo", "commit": "b" * 40}
+        results, calls = self.transform(mocker, [request] * 2, remote_commit)
+        remote_commit.assert_not_called()
+        assert len(calls) == 1
+
+    def test_unresolved_not_coalesced(self, mocker):
+        def remote_commit(repository, branch):
+            raise GitgetException("failed")
+
+        request = {"repository": "https://example.com/repo"}
+        results, calls = self.transform(mocker, [request] * 2, remote_commit)
+        assert len(calls) == 2
+
+
+class Test_declaration_transform_git_jobs:
+    @staticmethod
+    @pytest.fixture
+    def fixture_transform(mocker):
+        event = threading.Event()
+
+        def git_transform(as3d):
+            event.wait(5)
+            if as3d.repository == "fail":
+                raise HTTPException(status_code=400, detail="clone failed")
+            if as3d.repository == "error":
+                raise OSError("file not found")
+            return b'{"repository": "%s"}' % as3d.repository.encode()
+
+        mocker.patch("as3ninja.api._git_transform", side_effect=git_transform)
+        mocker.patch("as3ninja.api.JOBS", JobStore())
+        yield event
+        event.set()
+
+    @staticmethod
+    def submit(repository):
+        response = api_client.post(
+            "/api/declaration/transform/git/jobs", json={"repository": repository}
+        )
+        assert response.status_code == 202
+        assert (
+            response.headers["Location"]
+            == f"/api/declaration/transform/git/jobs/{response.json()['id']}"
+        )
+        return response.json()
+
+    def test_done(self, fixture_transform):
+        job = self.submit("repo")
+        assert job["status"] in ("pending", "running")
+        assert job["declaration"] is None
+        response = api_client.get(f"/api/declaration/transform/git/jobs/{job['id']}")
+        assert response.status_code == 200
+        assert response.json()["status"] in ("pending", "running")
+        fixture_transform.set()
+        response = api_client.get(
+            f"/api/declaration/transform/git/jobs/{job['id']}?wait=5"
+        )
+        assert response.json() == {
+            "id": job["id"],
+            "status": "done",
+            "declaration": {"repository": "repo"},
+            "error": None,
+        }
+
+    def test_long_polling_timeout(self, fixture_transform):
+        job = self.submit("repo")
+        response = api_client.get(
+            f"/api/declaration/transform/git/jobs/{job['id']}?wait=0.05"
+        )
+        assert response.json()["status"] in ("pending", "running")
+
+    @staticmethod
+    def test_wait_removes_callback():
+        job = Job(Future())
+        asyncio.run(_wait_job(job, 0.01))
+        assert job._callbacks == []
+
+    @pytest.mark.parametrize(
+        "repository, error",
+        [
+            ("fail", {"code": 400, "message": "clone failed"}),
+            ("error", {"code": 500, "message": "file not found"}),
+        ],
+    )
+    def test_failed(self, fixture_transform, repository, error):
+        job = self.submit(repository)
+        fixture_transform.set()
+        response = api_client.get(
+            f"/api/declaration/transform/git/jobs/{job['id']}?wait=5"
+        )
+        assert response.json()["status"] == "failed"
+        assert response.json()["error"] == error
+
+    @staticmethod
+    def test_unknown():
+        response = api_client.get("/api/declaration/transform/git/jobs/unknown")
+        assert response.status_code == 404
+
+    @staticmethod
+    def test_wait_limit():
+        response = api_client.get(
+            "/api/declaration/transform/git/jobs/unknown?wait=3600"
+        )
+        assert response.status_code == 422
+
+    @staticmethod
+    def test_queue_full(mocker):
+        mocker.patch(
+            "as3ninja.api.GIT_EXECUTOR.submit",
+            side_effect=QueueFullError("queue full", retry_after=2),
+        )
+        response = api_client.post(
+            "/api/declaration/transform/git/jobs", json={"repository": "repo"}
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+
+
 class Test_declaration_transform:
     declaration_template = """
         {
@@ -246,9 +648,702 @@ class Test_declaration_transform:
         assert "has no attribute 'Tenantname'" in response.json()["detail"]
 
 
+class Test_declaration_addresses:
+    @staticmethod
+    def test_addresses():
+        declaration = json.loads(
+            Path("tests/testdata/cli/addresses/declaration.json").read_text()
+        )
+        response = api_client.post("/api/declaration/addresses", json=declaration)
+        assert response.status_code == 200
+        assert response.json()["addresses"] == 5
+        assert len(response.json()["duplicates"]) == 1
+        assert response.json()["duplicates"][0]["locations"][0] == {
+            "address": "192.0.2.10",
+            "tenant": "TenantA",
+            "pointer": "/declaration/TenantA/App/serviceMain/virtualAddresses/0",
+            "route_domain": 0,
+        }
+        assert response.json()["overlaps"] == []
+
+    @staticmethod
+    def test_addresses_cross_tenant():
+        declaration = json.loads(
+            Path("tests/testdata/cli/addresses/clean.json").read_text()
+        )
+        response = api_client.post(
+            "/api/declaration/addresses?cross_tenant=true", json=declaration
+        )
+        assert response.status_code == 200
+        assert response.json()["duplicates"] == []
+
+
+class Test_raw_endpoints:
+    transform = {
+        "template_configuration": {"tenant": "Tenant"},
+        "declaration_template": '{"class": "ADC", "{{ ninja.tenant }}": {"class": "Tenant"}}',
+    }
+
+    @staticmethod
+    def post(path, body, headers=None):
+        return api_client.post(path, content=body, headers=headers or {})
+
+    def test_transform(self):
+        response = self.post(
+            "/api/declaration/transform/raw", json.dumps(self.transform).encode()
+        )
+        assert response.status_code == 200
+        assert response.json() == {"class": "ADC", "Tenant": {"class": "Tenant"}}
+
+    def test_transform_gzip(self):
+        response = self.post(
+            "/api/declaration/transform/raw",
+            gzip.compress(json.dumps(self.transform).encode()),
+            {"Content-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.json()["Tenant"] == {"class": "Tenant"}
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"[]",
+            b'{"declaration_template": "{}"}',
+            b'{"template_configuration": {}, "declaration_template": 1}',
+            b'{"template_configuration": [1], "declaration_template": "{}"}',
+        ],
+    )
+    def test_transform_invalid_input(body):
+        response = Test_raw_endpoints.post("/api/declaration/transform/raw", body)
+        assert response.status_code == 422
+
+    @staticmethod
+    def test_transform_error():
+        response = Test_raw_endpoints.post(
+            "/api/declaration/transform/raw",
+            b'{"template_configuration": {}, "declaration_template": "{{ ninja.a }}"}',
+        )
+        assert response.status_code == 400
+
+    @staticmethod
+    @pytest.mark.parametrize("content_encoding", ["", "gzip"])
+    def test_validate(content_encoding):
+        body = json.dumps(
+            {"class": "AS3", "declaration": {"class": "ADC", "schemaVersion": "4.9.0"}}
+        ).encode()
+        if content_encoding:
+            body = gzip.compress(body)
+        response = Test_raw_endpoints.post(
+            "/api/schema/validate/raw?max_errors=3",
+            body,
+            {"Content-Encoding": content_encoding},
+        )
+        assert response.status_code == 200
+        assert response.json()["valid"] is False
+        assert 1 <= len(response.json()["errors"]) <= 3
+
+    @staticmethod
+    def test_validate_not_object():
+        response = Test_raw_endpoints.post("/api/schema/validate/raw", b"[]")
+        assert response.status_code == 422
+
+    @staticmethod
+    def test_validate_parsed_in_worker(mocker):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        submit = mocker.spy(executor, "submit")
+        mocker.patch("as3ninja.api.VALIDATION_EXECUTOR", executor)
+        response = Test_raw_endpoints.post("/api/schema/validate/raw", b"{}")
+        executor.shutdown()
+        assert response.status_code == 200
+        submit.assert_called_once()
+        assert submit.call_args[0][1].func.__name__ == "_validate_raw"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "body, headers, status_code",
+        [
+            (b"{", {}, 400),
+            (b"\xff", {}, 400),
+            (b"{}", {"Content-Encoding": "br"}, 415),
+            (b"{}", {"Content-Encoding": "gzip"}, 400),
+            (gzip.compress(b"{}")[:-4], {"Content-Encoding": "gzip"}, 400),
+            (b"{}" + b" " * 64, {}, 413),
+            (gzip.compress(b"{}" + b" " * 64), {"Content-Encoding": "gzip"}, 413),
+        ],
+    )
+    def test_invalid_body(mocker, body, headers, status_code):
+        mocker.patch.object(NINJASETTINGS, "API_MAX_BODY_SIZE", 64)
+        response = Test_raw_endpoints.post("/api/schema/validate/raw", body, headers)
+        assert response.status_code == status_code
+
+    @staticmethod
+    def test_gzip_members():
+        body = gzip.compress(b'{"class": ') + gzip.compress(b'"AS3"}')
+        response = Test_raw_endpoints.post(
+            "/api/schema/validate/raw", body, {"Content-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+
+
+class Test_API_Backpressure:
+    @staticmethod
+    def test_queue_full(mocker):
+        executor = BoundedExecutor(max_workers=1, max_queue=0, retry_after=7)
+        mocker.patch("as3ninja.api.VALIDATION_EXECUTOR", executor)
+        event = threading.Event()
+        executor.submit(event.wait)
+        response = api_client.post("/api/schema/validate", json={})
+        event.set()
+        executor.shutdown()
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        assert "too many pending tasks" in response.json()["detail"]
+
+    @staticmethod
+    def test_executors_isolated(mocker):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        mocker.patch("as3ninja.api.VALIDATION_EXECUTOR", executor)
+        event = threading.Event()
+        executor.submit(event.wait)
+        response = api_client.post("/api/declaration/addresses", json={})
+        event.set()
+        executor.shutdown()
+        assert response.status_code == 200
+
+    @staticmethod
+    def test_metrics(mocker):
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        mocker.patch("as3ninja.api.GIT_EXECUTOR", executor)
+        event = threading.Event()
+        started = threading.Event()
+        executor.submit(lambda: started.set() or event.wait())
+        executor.submit(event.wait)
+        started.wait()
+        with pytest.raises(QueueFullError):
+            executor.submit(event.wait)
+        response = api_client.get("/api/metrics")
+        event.set()
+        executor.shutdown()
+        assert response.status_code == 200
+        assert sorted(response.json()["executors"]) == ["default", "git", "validation"]
+        assert response.json()["executors"]["git"] == {
+            "max_workers": 1,
+            "max_queue": 1,
+            "running": 1,
+            "waiting": 1,
+            "rejected": 1,
+        }
+        assert response.json()["jobs"] >= 0
+        assert response.json()["git_transforms_inflight"] == 0
+
+    @staticmethod
+    def test_runs_on_executor(mocker):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        submit = mocker.spy(executor, "submit")
+        mocker.patch("as3ninja.api.EXECUTOR", executor)
+        response = api_client.get("/api/schema/versions")
+        assert response.status_code == 200
+        submit.assert_not_called()
+        response = api_client.post("/api/declaration/addresses", json={})
+        assert response.status_code == 200
+        submit.assert_called_once()
+        assert executor.pending == 0
+        executor.shutdown()
+
+
+class Test_declaration_transform_response:
+    declaration_template = """{
+        "class": "AS3",
+        "declaration": {
+            "class": "ADC",
+            "remark": "{{ ninja.remark }}",
+            "items": [{% for i in range(ninja.count) %}"item{{ i }}"{{ "," if not loop.last }}{% endfor %}]
+        }
+    }"""
+
+    def test_serialized_json(self, mocker):
+        spy = mocker.spy(AS3Declaration, "dict")
+        response = api_client.post(
+            "/api/declaration/transform",
+            json={
+                "template_configuration": {"remark": "ü", "count": 2},
+                "declaration_template": self.declaration_template,
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert response.json()["declaration"]["remark"] == "ü"
+        assert response.json()["declaration"]["items"] == ["item0", "item1"]
+        spy.assert_not_called()
+
+    def test_streaming(self, mocker):
+        mocker.patch("as3ninja.api.STREAMING_THRESHOLD", 100)
+        mocker.patch("as3ninja.api.STREAMING_CHUNK_SIZE", 64)
+        response = api_client.post(
+            "/api/declaration/transform",
+            json={
+                "template_configuration": {"remark": "streamed", "count": 100},
+                "declaration_template": self.declaration_template,
+            },
+        )
+        assert response.status_code == 200
+        assert "content-length" not in response.headers
+        assert response.json()["declaration"]["items"][99] == "item99"
+
+
+class Test_declaration_transform_compression:
+    @staticmethod
+    def post(size, accept_encoding="gzip"):
+        return api_client.post(
+            "/api/declaration/transform",
+            json={
+                "template_configuration": {"value": "x" * size},
+                "declaration_template": '{"value": "{{ ninja.value }}"}',
+            },
+            headers={"Accept-Encoding": accept_encoding},
+        )
+
+    def test_compressed(self):
+        response = self.post(2048)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < 2048
+        assert response.json() == {"value": "x" * 2048}
+
+    def test_threshold(self):
+        response = self.post(100)
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+    def test_not_accepted(self):
+        assert "Content-Encoding" not in self.post(2048, "identity").headers
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(NINJASETTINGS, "API_COMPRESSION", False)
+        assert "Content-Encoding" not in self.post(2048).headers
+
+    @staticmethod
+    def test_executor_full(mocker):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        mocker.patch("as3ninja.api.EXECUTOR", executor)
+        body = json.dumps(list(range(1000))).encode()
+        mocker.patch("as3ninja.api._git_transform", return_value=body)
+        mocker.patch("as3ninja.api._git_transform_key", return_value=None)
+        event = threading.Event()
+        executor.submit(event.wait)
+        response = api_client.post(
+            "/api/declaration/transform/git",
+            json={"repository": "repo"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        event.set()
+        executor.shutdown()
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.json() == list(range(1000))
+
+    def test_streamed(self, mocker):
+        mocker.patch("as3ninja.api.STREAMING_THRESHOLD", 16)
+        response = self.post(4096)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.json() == {"value": "x" * 4096}
+
+
+class Test_declaration_transform_cache:
+    @staticmethod
+    @pytest.fixture
+    def fixture_cache(mocker):
+        cache = TransformCache()
+        mocker.patch("as3ninja.api.TRANSFORM_CACHE", cache)
+        return cache
+
+    @staticmethod
+    def post(declaration_template, tenant="Tenant"):
+        return api_client.post(
+            "/api/declaration/transform",
+            json={
+                "template_configuration": {"tenant": tenant},
+                "declaration_template": declaration_template,
+            },
+        )
+
+    def test_cached(self, fixture_cache, mocker):
+        spy = mocker.spy(AS3Declaration, "__init__")
+        template = '{"class": "ADC", "{{ ninja.tenant }}": {"class": "Tenant"}}'
+        first = self.post(template)
+        second = self.post(template)
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert spy.call_count == 1
+        assert len(fixture_cache) == 1
+        assert self.post(template, tenant="Other").json()["Other"]
+        assert spy.call_count == 2
+
+    def test_bypass(self, fixture_cache, mocker):
+        spy = mocker.spy(AS3Declaration, "__init__")
+        template = '{"class": "ADC", "id": "{{ uuid() }}"}'
+        first = self.post(template)
+        second = self.post(template)
+        assert first.json()["id"] != second.json()["id"]
+        assert spy.call_count == 2
+        assert len(fixture_cache) == 0
+
+    def test_errors_not_cached(self, fixture_cache):
+        assert self.post('{"a": {{ ninja.missing }}}').status_code == 400
+        assert len(fixture_cache) == 0
+
+    def test_disabled(self, mocker):
+        mocker.patch("as3ninja.api.TRANSFORM_CACHE", None)
+        assert self.post('{"a": "{{ ninja.tenant }}"}').json() == {"a": "Tenant"}
+
+
+class Test_declaration_transform_validate:
+    template = '{"class": "AS3", "declaration": {"class": "ADC", "schemaVersion": "{{ ninja.version }}", "id": "{{ ninja.id }}", "Tenant": {"class": "Tenant"}}}'
+
+    def post(self, template_configuration, query=""):
+        return api_client.post(
+            f"/api/declaration/transform/validate{query}",
+            json={
+                "template_configuration": template_configuration,
+                "declaration_template": self.template,
+            },
+        )
+
+    def test_valid(self):
+        response = self.post({"version": "3.9.0", "id": "one"})
+        assert response.status_code == 200
+        assert response.json()["declaration"]["declaration"]["id"] == "one"
+        assert response.json()["validation"] == {
+            "valid": True,
+            "error": None,
+            "errors": None,
+        }
+
+    def test_invalid(self):
+        response = self.post({"version": "4.9.0", "id": "one"}, "?max_errors=5")
+        assert response.status_code == 200
+        assert response.json()["declaration"]["declaration"]["schemaVersion"] == "4.9.0"
+        assert response.json()["validation"]["valid"] is False
+        assert response.json()["validation"]["errors"]
+
+    def test_auto(self, mocker):
+        spy = mocker.spy(SCHEMA_SERVICE, "get")
+        response = self.post({"version": "3.9.0", "id": "one"}, "?version=auto")
+        assert response.json()["validation"]["valid"] is True
+        spy.assert_called_once_with()
+
+    def test_auto_invalid_version(self):
+        response = self.post({"version": "a.b.c", "id": "one"}, "?version=auto")
+        assert response.status_code == 400
+        assert "not a valid version string" in response.json()["detail"]
+
+    def test_unknown_version(self):
+        response = self.post({"version": "3.9.0", "id": "one"}, "?version=3.99.99")
+        assert response.status_code == 400
+
+    def test_transform_error(self):
+        response = self.post({"version": "3.9.0"})
+        assert response.status_code == 400
+        assert "Undefined" in response.json()["detail"]
+
+    @staticmethod
+    def test_not_reserialized(mocker):
+        dumps = mocker.spy(json, "dumps")
+        api_client.post(
+            "/api/declaration/transform/validate",
+            json={"template_configuration": {}, "declaration_template": "{}"},
+        )
+        assert dumps.call_count == 1  # AS3Declaration transformation only
+
+
+class Test_declaration_transform_batch:
+    @staticmethod
+    def post(template_configurations, declaration_template):
+        return api_client.post(
+            "/api/declaration/transform/batch",
+            json={
+                "template_configurations": template_configurations,
+                "declaration_template": declaration_template,
+            },
+        )
+
+    @staticmethod
+    def results(response):
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        return {line.pop("index"): line for line in lines}
+
+    def test_results(self, mocker):
+        mocker.patch("as3ninja.api.TRANSFORM_CACHE", None)
+        spy = mocker.spy(AS3DeclarationTemplate, "__init__")
+        response = self.post(
+            [{"tenant": f"T{index}"} for index in range(10)],
+            '{"class": "ADC", "{{ ninja.tenant }}": {"class": "Tenant"}}',
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        results = self.results(response)
+        assert sorted(results) == list(range(10))
+        for index, result in results.items():
+            assert result["declaration"][f"T{index}"] == {"class": "Tenant"}
+        assert spy.call_count == 1
+
+    def test_item_exception(self):
+        response = self.post(
+            [{"net": "10.0.0.0/24"}, {"net": "bogus"}, {"net": "10.0.0.0/30"}],
+            '{"n": {{ ninja.net | cidr_size }} }',
+        )
+        assert response.status_code == 200
+        results = self.results(response)
+        assert results[0] == {"declaration": {"n": 256}}
+        assert results[1]["error"]["code"] == 400
+        assert results[1]["error"]["message"].startswith("ValueError")
+        assert results[2] == {"declaration": {"n": 4}}
+
+    def test_item_errors(self):
+        results = self.results(
+            self.post(
+                [{"a": 1}, {"b": 2}, [{"a": 3}, {"c": 4}]],
+                '{"a": {{ ninja.a }}}',
+            )
+        )
+        assert results[0] == {"declaration": {"a": 1}}
+        assert results[1]["error"]["code"] == 400
+        assert "Undefined" in results[1]["error"]["message"]
+        assert results[2] == {"declaration": {"a": 3}}
+
+    def test_syntax_error(self):
+        response = self.post([{"a": 1}], '{"a": {{ ninja.a }')
+        assert response.status_code == 400
+        assert "syntax error" in response.json()["detail"]
+
+    def test_empty(self):
+        response = self.post([], "{}")
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_queue_full(self, mocker):
+        mocker.patch(
+            "as3ninja.api.EXECUTOR.run",
+            side_effect=[
+                AS3DeclarationTemplate("{}"),
+                QueueFullError("queue full", retry_after=1),
+            ],
+        )
+        results = self.results(self.post([{}], "{}"))
+        assert results[0] == {"error": {"code": 503, "message": "queue full"}}
+
+
+class Test_declaration_transform_preview:
+    path = "/api/declaration/transform/preview"
+    template = '{"name": "{{ ninja.name }}", "items": {{ ninja["items"] | tojson }}}'
+
+    @pytest.fixture(autouse=True)
+    def debounce(self, mocker):
+        mocker.patch.object(NINJASETTINGS, "API_PREVIEW_DEBOUNCE", 0.01)
+
+    def test_render(self):
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_json(
+                {
+                    "id": 1,
+                    "declaration_template": self.template,
+                    "template_configuration": [{"name": "a"}, {"items": [1]}],
+                }
+            )
+            assert websocket.receive_json() == {
+                "id": 1,
+                "declaration": {"name": "a", "items": [1]},
+            }
+            websocket.send_json(
+                {"id": 2, "template_edits": [{"start": 10, "end": 10, "text": "x-"}]}
+            )
+            assert websocket.receive_json()["declaration"]["name"] == "x-a"
+
+    def test_patch(self):
+        with api_client.websocket_connect(f"{self.path}?patch=true") as websocket:
+            websocket.send_json(
+                {
+                    "id": "first",
+                    "declaration_template": self.template,
+                    "template_configuration": {"name": "a", "items": [1]},
+                }
+            )
+            assert "declaration" in websocket.receive_json()
+            websocket.send_json(
+                {
+                    "id": "second",
+                    "configuration_patch": [
+                        {"op": "add", "path": "/items/-", "value": 2}
+                    ],
+                }
+            )
+            assert websocket.receive_json() == {
+                "id": "second",
+                "patch": [{"op": "add", "path": "/items/1", "value": 2}],
+            }
+
+    def test_debounce(self, mocker):
+        mocker.patch.object(NINJASETTINGS, "API_PREVIEW_DEBOUNCE", 0.5)
+        render = mocker.patch(
+            "as3ninja.api.PreviewSession.render", return_value={"a": 1}
+        )
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_json({"id": 1, "declaration_template": "{}"})
+            for message_id in (2, 3):
+                websocket.send_json(
+                    {
+                        "id": message_id,
+                        "template_edits": [{"start": 0, "end": 0, "text": " "}],
+                    }
+                )
+            assert websocket.receive_json() == {"id": 3, "declaration": {"a": 1}}
+        render.assert_called_once()
+
+    def test_max_batch(self, mocker):
+        mocker.patch.object(NINJASETTINGS, "API_PREVIEW_DEBOUNCE", 0.5)
+        mocker.patch.object(NINJASETTINGS, "API_PREVIEW_MAX_BATCH", 2)
+        render = mocker.patch(
+            "as3ninja.api.PreviewSession.render", return_value={"a": 1}
+        )
+        with api_client.websocket_connect(self.path) as websocket:
+            for message_id in (1, 2, 3):
+                websocket.send_json({"id": message_id, "declaration_template": "{}"})
+            assert websocket.receive_json()["id"] == 2
+            assert websocket.receive_json()["id"] == 3
+        assert render.call_count == 2
+
+    def test_queue_overflow(self, mocker):
+        mocker.patch.object(NINJASETTINGS, "API_PREVIEW_QUEUE_SIZE", 2)
+        started = threading.Event()
+
+        def preview(*_):
+            started.set()
+            threading.Event().wait(0.5)  # the client keeps sending meanwhile
+            return []
+
+        mocker.patch("as3ninja.api._preview", side_effect=preview)
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_json({"id": 0, "declaration_template": "{}"})
+            assert started.wait(5)
+            for message_id in range(1, 5):
+                websocket.send_json({"id": message_id, "declaration_template": "{}"})
+            response = websocket.receive_json()
+            assert response["error"]["code"] == 429
+            with pytest.raises(WebSocketDisconnect) as exc:
+                websocket.receive_json()
+        assert exc.value.code == 1008
+
+    def test_errors_keep_session(self):
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_json(
+                {
+                    "id": 1,
+                    "declaration_template": "{% if %}",
+                    "template_configuration": {"name": "a", "items": []},
+                }
+            )
+            response = websocket.receive_json()
+            assert response["id"] == 1
+            assert response["error"]["code"] == 400
+            websocket.send_json(
+                {"id": 2, "template_edits": [{"start": 0, "end": 8, "text": ""}]}
+            )
+            response = websocket.receive_json()
+            assert response["error"]["code"] == 400  # empty template
+            websocket.send_json({"id": 3, "declaration_template": self.template})
+            assert websocket.receive_json()["declaration"] == {
+                "name": "a",
+                "items": [],
+            }
+
+    def test_invalid_messages(self):
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_text("not json")
+            response = websocket.receive_json()
+            assert response["id"] is None
+            assert response["error"]["code"] == 400
+            websocket.send_json(
+                {"id": 1, "template_edits": [{"start": 5, "end": 6, "text": ""}]}
+            )
+            assert websocket.receive_json()["error"]["code"] == 400
+
+    @pytest.mark.parametrize(
+        "update",
+        [
+            {"template_configuration": [{"as3ninja": "include"}]},
+            {"template_configuration": [{"as3ninja": {"include": 5}}]},
+            {"configuration_patch": [{"op": "add", "path": 1, "value": 1}]},
+        ],
+    )
+    def test_update_exception(self, update):
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_json(
+                {
+                    "id": 1,
+                    "declaration_template": self.template,
+                    "template_configuration": {"name": "a", "items": []},
+                }
+            )
+            assert "declaration" in websocket.receive_json()
+            websocket.send_json({"id": 2, **update})
+            response = websocket.receive_json()
+            assert response["id"] == 2
+            assert response["error"]["code"] == 400
+            websocket.send_json(
+                {"id": 3, "template_edits": [{"start": 10, "end": 10, "text": "x-"}]}
+            )
+            assert websocket.receive_json()["declaration"]["name"] == "x-a"
+
+    def test_render_exception(self):
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_json({"id": 1, "declaration_template": "{{ 1 / 0 }}"})
+            response = websocket.receive_json()
+            assert response["error"]["message"].startswith("ZeroDivisionError")
+
+    def test_queue_full(self, mocker):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        mocker.patch("as3ninja.api.EXECUTOR", executor)
+        event = threading.Event()
+        executor.submit(event.wait)
+        with api_client.websocket_connect(self.path) as websocket:
+            websocket.send_json({"id": 1, "declaration_template": "{}"})
+            response = websocket.receive_json()
+        event.set()
+        executor.shutdown()
+        assert response["error"]["code"] == 503
+
+
 class Test_API_Startup_event:
     @staticmethod
     def test_startup(mocker):
-        mocked_AS3Schema = mocker.patch("as3ninja.api.AS3Schema")
+        mocked_service = mocker.patch("as3ninja.api.SCHEMA_SERVICE")
         startup()
-        assert mocked_AS3Schema.called
+        assert mocked_service.get.called
+        assert mocked_service.start.called
+
+
+class Test_health:
+    @staticmethod
+    def test_live():
+        response = api_client.get("/api/health/live")
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+
+    @staticmethod
+    def test_ready(mocker):
+        service = AS3SchemaService(prewarm_minors=1)
+        mocker.patch("as3ninja.api.SCHEMA_SERVICE", service)
+        response = api_client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming up"
+        service.start().join()
+        response = api_client.get("/api/health/ready")
+        assert response.status_code == 200
+        assert response.json() == {
+            "status": "ready",
+            "warm_versions": [service.get().latest_version],
+            "error": None,
+        }
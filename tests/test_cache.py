@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from as3ninja.cache import DiskCache, LRUCache
+
+
+class Test_LRUCache:
+    @staticmethod
+    def test_get_set():
+        cache = LRUCache()
+        assert cache.get("key") is None
+        assert cache.get("key", "default") == "default"
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        assert "key" in cache
+        assert len(cache) == 1
+
+    @staticmethod
+    def test_eviction():
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    @staticmethod
+    def test_clear():
+        cache = LRUCache()
+        cache.set("a", 1)
+        cache.clear()
+        assert len(cache) == 0
+
+    @staticmethod
+    def test_max_bytes():
+        cache = LRUCache(max_bytes=10)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.get("a")
+        cache.set("c", b"cccc")
+        assert "a" in cache
+        assert "b" not in cache
+        cache.set("a", b"a")
+        cache.set("d", b"dddd")
+        assert "c" in cache
+        cache.set("e", b"e" * 11)
+        assert len(cache) == 0
+
+    @staticmethod
+    def test_delete():
+        cache = LRUCache(max_bytes=10)
+        cache.set("a", b"aaaaaaaaaa")
+        cache.delete("a")
+        cache.delete("a")
+        cache.set("b", b"bbbbbbbbbb")
+        assert "b" in cache
+
+
+class Test_DiskCache:
+    @staticmethod
+    @pytest.fixture
+    def fixture_diskcache(tmp_path):
+        cache = DiskCache(path=str(tmp_path / "cache.sqlite"))
+        yield cache
+        cache.close()
+
+    @staticmethod
+    def test_get_set(fixture_diskcache):
+        assert fixture_diskcache.get("key") is None
+        fixture_diskcache.set("key", b"value")
+        assert fixture_diskcache.get("key") == b"value"
+        assert "key" in fixture_diskcache
+        assert len(fixture_diskcache) == 1
+
+    @staticmethod
+    def test_persistent(fixture_diskcache):
+        fixture_diskcache.set("key", "value")
+        cache = DiskCache(path=fixture_diskcache.path)
+        assert cache.get("key") == "value"
+        cache.close()
+
+    @staticmethod
+    def test_eviction(fixture_diskcache, mocker):
+        mocker.patch.object(DiskCache, "_EVICT_INTERVAL", 1)
+        fixture_diskcache._max_entries = 2
+        for key in ("a", "b", "c"):
+            fixture_diskcache.set(key, 1)
+        assert len(fixture_diskcache) == 2
+        assert "a" not in fixture_diskcache
+
+    @staticmethod
+    def test_eviction_max_bytes(tmp_path, mocker):
+        mocker.patch.object(DiskCache, "_EVICT_INTERVAL", 1)
+        mocker.patch("as3ninja.cache.time.time", side_effect=range(100))
+        cache = DiskCache(path=str(tmp_path / "cache.sqlite"), max_bytes=10)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.get("a")
+        cache.set("c", b"cccc")
+        assert "b" not in cache
+        assert "a" in cache
+        assert "c" in cache
+        cache.close()
+
+    @staticmethod
+    def test_delete(fixture_diskcache):
+        fixture_diskcache.set("a", 1)
+        fixture_diskcache.delete("a")
+        fixture_diskcache.delete("a")
+        assert "a" not in fixture_diskcache
+
+    @staticmethod
+    def test_clear(fixture_diskcache):
+        fixture_diskcache.set("a", 1)
+        fixture_diskcache.clear()
+        assert len(fixture_diskcache) == 0
@@ -74,6 +74,42 @@ class Test_validate:
         )
         assert result.exit_code != 0
 
+    @staticmethod
+    def test_validation_failure_max_errors(fixture_clicker, capsys):
+        """
+        as3ninja validate -d tests/testdata/cli/validate/errors.json --max-errors 3 --max-context-depth 1
+        """
+        result = fixture_clicker.invoke(
+            cli,
+            [
+                "validate",
+                "-d",
+                "tests/testdata/cli/validate/errors.json",
+                "--max-errors",
+                "3",
+                "--max-context-depth",
+                "1",
+            ],
+        )
+        assert result.exit_code != 0
+
+    @staticmethod
+    def test_validation_success_max_errors(fixture_clicker, capsys):
+        """
+        as3ninja validate --declaration tests/testdata/cli/validate/declaration.json --max-errors 3
+        """
+        result = fixture_clicker.invoke(
+            cli,
+            [
+                "validate",
+                "--declaration",
+                "tests/testdata/cli/validate/declaration.json",
+                "--max-errors",
+                "3",
+            ],
+        )
+        assert result.exit_code == 0
+
 
 @pytest.mark.usefixtures("fixture_clicker")
 class Test_git_transform:
@@ -426,3 +462,52 @@ class Test_schema_update:
 
         assert result.exit_code == 0
         assert result.output.count("3.1.0") == 1
+
+
+@pytest.mark.usefixtures("fixture_clicker")
+class Test_addresses:
+    @staticmethod
+    def test_conflicts(fixture_clicker):
+        result = fixture_clicker.invoke(
+            cli,
+            [
+                "addresses",
+                "--declaration",
+                "tests/testdata/cli/addresses/declaration.json",
+            ],
+        )
+        assert result.exit_code == 1
+        assert (
+            "duplicate (route domain 0): 192.0.2.10 at /declaration/TenantA/App/serviceMain/virtualAddresses/0, 192.0.2.10 at /declaration/TenantB/App/serviceMain/virtualAddresses/0"
+            in result.output
+        )
+
+    @staticmethod
+    def test_clean(fixture_clicker):
+        result = fixture_clicker.invoke(
+            cli,
+            [
+                "addresses",
+                "--declaration",
+                "tests/testdata/cli/addresses/clean.json",
+                "--cross-tenant",
+            ],
+        )
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_json(fixture_clicker):
+        result = fixture_clicker.invoke(
+            cli,
+            [
+                "addresses",
+                "--declaration",
+                "tests/testdata/cli/addresses/declaration.json",
+                "--json",
+            ],
+        )
+        assert result.exit_code == 1
+        report = json.loads(result.output)
+        assert report["addresses"] == 5
+        assert len(report["duplicates"]) == 1
+        assert report["overlaps"] == []
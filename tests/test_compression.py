@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import gzip
+
+import pytest
+
+from as3ninja import compression
+from as3ninja.compression import ENCODINGS, compress, negotiate_encoding
+
+
+class Test_negotiate_encoding:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            ("gzip", True),
+            ("deflate, gzip;q=0.5", True),
+            ("GZIP", True),
+            ("*", True),
+            ("gzip;q=0", False),
+            ("*, gzip;q=0", False),
+            ("gzip;q=invalid", False),
+            ("br, deflate", False),
+            ("", False),
+        ],
+    )
+    def test_gzip(accept_encoding, expected):
+        assert negotiate_encoding(accept_encoding, ("gzip",)) == (
+            "gzip" if expected else None
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            ("gzip, deflate, br", "br"),
+            ("gzip, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("br;q=0, gzip", "gzip"),
+            ("*", "br"),
+            ("*;q=0.5, gzip", "gzip"),
+            ("identity", None),
+        ],
+    )
+    def test_preference(accept_encoding, expected):
+        assert negotiate_encoding(accept_encoding, ("br", "gzip")) == expected
+
+    @staticmethod
+    def test_default_encodings():
+        assert "gzip" in ENCODINGS
+        assert ("br" in ENCODINGS) is (compression.brotli is not None)
+
+
+class Test_compress:
+    @staticmethod
+    @pytest.mark.parametrize("best", [True, False])
+    def test_gzip(best):
+        data = b'{"a": 1}' * 100
+        compressed = compress(data, "gzip", best=best)
+        assert gzip.decompress(compressed) == data
+        assert compressed == compress(data, "gzip", best=best)  # deterministic
+
+    @staticmethod
+    def test_brotli():
+        brotli = pytest.importorskip("brotli")
+        data = b'{"a": 1}' * 100
+        assert brotli.decompress(compress(data, "br")) == data
+
+    @staticmethod
+    def test_unsupported(mocker):
+        mocker.patch.object(compression, "brotli", None)
+        with pytest.raises(ValueError):
+            compress(b"", "br")
+        with pytest.raises(ValueError):
+            compress(b"", "deflate")
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from as3ninja.concurrency import BoundedExecutor, SingleFlight
+from as3ninja.exceptions import QueueFullError
+
+
+@pytest.fixture
+def fixture_executor():
+    executor = BoundedExecutor(max_workers=1, max_queue=1, retry_after=3)
+    yield executor
+    executor.shutdown()
+
+
+class Test_BoundedExecutor:
+    @staticmethod
+    def test_properties(fixture_executor):
+        assert fixture_executor.max_workers == 1
+        assert fixture_executor.max_queue == 1
+        assert fixture_executor.pending == 0
+
+    @staticmethod
+    def test_submit(fixture_executor):
+        assert fixture_executor.submit(sum, [1, 2]).result() == 3
+
+    @staticmethod
+    def test_queue_full(fixture_executor):
+        event = threading.Event()
+        running = fixture_executor.submit(event.wait)
+        waiting = fixture_executor.submit(event.wait)
+        assert fixture_executor.pending == 2
+        with pytest.raises(QueueFullError) as exc_info:
+            fixture_executor.submit(event.wait)
+        assert exc_info.value.retry_after == 3
+        event.set()
+        assert running.result() and waiting.result()
+        assert fixture_executor.pending == 0
+        assert fixture_executor.submit(sum, [1]).result() == 1
+
+    @staticmethod
+    def test_metrics(fixture_executor):
+        event = threading.Event()
+        started = threading.Event()
+
+        def work():
+            started.set()
+            event.wait()
+
+        running = fixture_executor.submit(work)
+        waiting = fixture_executor.submit(event.wait)
+        started.wait()
+        with pytest.raises(QueueFullError):
+            fixture_executor.submit(event.wait)
+        assert fixture_executor.running == 1
+        assert fixture_executor.waiting == 1
+        assert fixture_executor.rejected == 1
+        event.set()
+        running.result(), waiting.result()
+        assert fixture_executor.running == 0
+        assert fixture_executor.waiting == 0
+        assert fixture_executor.rejected == 1
+
+    @staticmethod
+    def test_exception_releases(fixture_executor):
+        future = fixture_executor.submit(int, "x")
+        with pytest.raises(ValueError):
+            future.result()
+        assert fixture_executor.pending == 0
+
+    @staticmethod
+    def test_run(fixture_executor):
+        variable = contextvars.ContextVar("variable")
+
+        def work(value):
+            return threading.current_thread().name, variable.get(), value
+
+        async def main():
+            variable.set("context")
+            return await fixture_executor.run(work, value=1)
+
+        thread_name, context_value, value = asyncio.run(main())
+        assert thread_name.startswith("as3ninja")
+        assert context_value == "context"
+        assert value == 1
+
+
+class Test_SingleFlight:
+    @staticmethod
+    def test_coalesce():
+        singleflight = SingleFlight()
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        async def main():
+            results = await asyncio.gather(
+                *(singleflight.run("a", lambda: work(1)) for _ in range(5)),
+                singleflight.run("b", lambda: work(2)),
+            )
+            assert singleflight.inflight == 0
+            return results
+
+        assert asyncio.run(main()) == [1, 1, 1, 1, 1, 2]
+        assert calls == [1, 2]
+
+    @staticmethod
+    def test_sequential():
+        singleflight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        async def main():
+            return [await singleflight.run("a", work) for _ in range(2)]
+
+        assert asyncio.run(main()) == [1, 2]
+
+    @staticmethod
+    def test_exception_shared():
+        singleflight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        async def main():
+            return await asyncio.gather(
+                singleflight.run("a", work),
+                singleflight.run("a", work),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(main())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert calls == [1]
+
+    @staticmethod
+    def test_cancel_waiter():
+        singleflight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        async def main():
+            first = asyncio.ensure_future(singleflight.run("a", work))
+            second = asyncio.ensure_future(singleflight.run("a", work))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(main()) == "done"
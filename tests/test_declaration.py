@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 import json
+import threading
 
 import pytest
 from jinja2.exceptions import TemplateSyntaxError
 
-from as3ninja.declaration import AS3Declaration
+from as3ninja.declaration import AS3Declaration, AS3DeclarationTemplate
 from as3ninja.exceptions import (
     AS3JSONDecodeError,
     AS3TemplateSyntaxError,
@@ -337,3 +338,53 @@ class Test_invalid_declarations:
         config = {"a": "aaa", "b": "bbb"}
         with pytest.raises(AS3TemplateSyntaxError):
             AS3Declaration(declaration_template=template, template_configuration=config)
+
+
+class Test_AS3DeclarationTemplate:
+    @staticmethod
+    def test_reuse():
+        template = AS3DeclarationTemplate(mock_declaration_template)
+        as3d = AS3Declaration(
+            template_configuration=mock_template_configuration.dict(),
+            declaration_template=template,
+        )
+        assert as3d.dict() == json.loads(mock_declaration)
+        assert as3d.declaration_template == mock_declaration_template
+        as3d = AS3Declaration(
+            template_configuration={"a": "x", "b": "y"}, declaration_template=template
+        )
+        assert as3d.dict() == {"json": True, "a": "x", "b": "y"}
+
+    @staticmethod
+    def test_syntax_error():
+        with pytest.raises(AS3TemplateSyntaxError):
+            AS3DeclarationTemplate('{"a": "{{ ninja.a }"}')
+
+    @staticmethod
+    def test_searchpath():
+        template = AS3DeclarationTemplate(
+            '{"include": {% include "./include.j2" %}}',
+            jinja2_searchpath="tests/testdata/declaration/transform/",
+        )
+        for value in ["A", "B"]:
+            as3d = AS3Declaration(
+                template_configuration={"include": value},
+                declaration_template=template,
+                jinja2_searchpath="ignored",
+            )
+            assert as3d.dict() == {"include": {"include": value}}
+
+    @staticmethod
+    def test_concurrent_render():
+        template = AS3DeclarationTemplate("{{ ninja.value }}")
+        results = {}
+
+        def render(value):
+            results[value] = template.render({"value": value})
+
+        threads = [threading.Thread(target=render, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {i: str(i) for i in range(20)}
@@ -107,6 +107,42 @@ class Test_Gitget_subprocess_security:
         Gitget._run_command(mocked_self, ("--version", ";", "exit", "1"))
 
 
+class Test_Gitget_remote_commit:
+    ls_remote = (
+        "1111111111111111111111111111111111111111\tHEAD\n"
+        "1111111111111111111111111111111111111111\trefs/heads/master\n"
+        "2222222222222222222222222222222222222222\trefs/heads/v1.0\n"
+        "3333333333333333333333333333333333333333\trefs/tags/v1.0\n"
+        "4444444444444444444444444444444444444444\trefs/tags/v1.0^{}\n"
+        "5555555555555555555555555555555555555555\trefs/tags/v2.0\n"
+        "6666666666666666666666666666666666666666\trefs/tags/v2.0^{}\n"
+    )
+
+    @pytest.mark.parametrize(
+        "branch, expected",
+        [
+            (None, "1" * 40),
+            ("master", "1" * 40),
+            ("v1.0", "2" * 40),
+            ("v2.0", "6" * 40),
+        ],
+    )
+    def test_resolve(self, mocker, branch, expected):
+        mocked = mocker.patch.object(Gitget, "_run_git", return_value=self.ls_remote)
+        assert Gitget.remote_commit("https://example.com/repo", branch) == expected
+        assert "ls-remote" in mocked.call_args[0][0]
+
+    def test_unknown(self, mocker):
+        mocker.patch.object(Gitget, "_run_git", return_value=self.ls_remote)
+        with pytest.raises(GitgetException):
+            Gitget.remote_commit("https://example.com/repo", "unknown")
+
+    @staticmethod
+    def test_non_existing_repository():
+        with pytest.raises(GitgetException):
+            Gitget.remote_commit("none")
+
+
 class Test_Gitget_interface:
     @staticmethod
     def test_Gitget_simple():
@@ -37,3 +37,14 @@ class Test_J2Ninja:
 
         assert J2Ninja.functions["my_filterfunction"] == my_filterfunction
         assert J2Ninja.filters["my_filterfunction"] == my_filterfunction
+
+    @staticmethod
+    def test_registeruncacheable():
+        @J2Ninja.registeruncacheable
+        @J2Ninja.registerfunction
+        def my_uncacheable():
+            pass
+
+        assert J2Ninja.functions["my_uncacheable"] == my_uncacheable
+        assert "my_uncacheable" in J2Ninja.uncacheable
+        assert "my_function" not in J2Ninja.uncacheable
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+from types import GeneratorType
+
+import pytest
+from jinja2 import Environment
+
+from as3ninja.jinja2 import J2Ninja
+from as3ninja.jinja2.network import *
+
+
+@pytest.fixture
+def fixture_env():
+    env = Environment()
+    env.globals.update(J2Ninja.functions)
+    env.filters.update(J2Ninja.filters)
+    env.tests.update(J2Ninja.tests)
+    return env
+
+
+class Test_cidr_contains:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "network, address, expected",
+        [
+            ("192.0.2.0/24", "192.0.2.10", True),
+            ("192.0.2.0/24", "192.0.2.128/25", True),
+            ("192.0.2.0/24", "192.0.2.0/24", True),
+            ("192.0.2.0/25", "192.0.2.128", False),
+            ("192.0.2.0/24", "192.0.0.0/16", False),
+            ("192.0.2.0%2/24", "192.0.2.10%2", True),
+            ("192.0.2.0%2/24", "192.0.2.10%3", False),
+            ("192.0.2.0%2/24", "192.0.2.10", False),
+            ("2001:db8::/32", "2001:db8:1::1", True),
+            ("2001:db8::/32", "192.0.2.10", False),
+            ("0.0.0.0/0", "::", False),
+        ],
+    )
+    def test_contains(network, address, expected):
+        assert cidr_contains(network, address) is expected
+
+    @staticmethod
+    def test_invalid():
+        with pytest.raises(ValueError):
+            cidr_contains("192.0.2.1/24", "192.0.2.1")
+
+
+class Test_cidr_size:
+    @staticmethod
+    def test_size():
+        assert cidr_size("192.0.2.0/24") == 256
+        assert cidr_size("192.0.2.1") == 1
+        assert cidr_size("2001:db8::/32") == 2**96
+
+
+class Test_cidr_hosts:
+    @staticmethod
+    def test_ipv4():
+        assert list(cidr_hosts("192.0.2.0/29")) == [
+            "192.0.2.1",
+            "192.0.2.2",
+            "192.0.2.3",
+            "192.0.2.4",
+            "192.0.2.5",
+            "192.0.2.6",
+        ]
+
+    @staticmethod
+    def test_route_domain_skip():
+        assert list(cidr_hosts("192.0.2.0%2/29", skip=4)) == [
+            "192.0.2.5%2",
+            "192.0.2.6%2",
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "network, expected",
+        [
+            ("192.0.2.0/31", ["192.0.2.0", "192.0.2.1"]),
+            ("192.0.2.1", ["192.0.2.1"]),
+            ("2001:db8::/126", ["2001:db8::1", "2001:db8::2", "2001:db8::3"]),
+            ("2001:db8::/127", ["2001:db8::", "2001:db8::1"]),
+        ],
+    )
+    def test_small_networks(network, expected):
+        assert list(cidr_hosts(network)) == expected
+
+    @staticmethod
+    def test_lazy():
+        hosts = cidr_hosts("2001:db8::/32")
+        assert isinstance(hosts, GeneratorType)
+        assert next(hosts) == "2001:db8::1"
+
+    @staticmethod
+    def test_same_as_ipaddress():
+        import ipaddress
+
+        assert list(cidr_hosts("10.0.0.0/20")) == [
+            str(host) for host in ipaddress.IPv4Network("10.0.0.0/20").hosts()
+        ]
+
+
+class Test_ip_range:
+    @staticmethod
+    def test_range():
+        assert list(ip_range("192.0.2.254%1", "192.0.3.1%1")) == [
+            "192.0.2.254%1",
+            "192.0.2.255%1",
+            "192.0.3.0%1",
+            "192.0.3.1%1",
+        ]
+
+    @staticmethod
+    def test_ipv6():
+        assert list(ip_range("2001:db8::ffff", "2001:db8::1:0")) == [
+            "2001:db8::ffff",
+            "2001:db8::1:0",
+        ]
+
+    @staticmethod
+    def test_empty():
+        assert list(ip_range("192.0.2.2", "192.0.2.1")) == []
+
+    @staticmethod
+    def test_lazy():
+        addresses = ip_range("::1:0", "ffff::")
+        assert isinstance(addresses, GeneratorType)
+        assert next(addresses) == "::1:0"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "start, end",
+        [("192.0.2.1", "2001:db8::1"), ("192.0.2.1%1", "192.0.2.2%2")],
+    )
+    def test_mismatch(start, end):
+        with pytest.raises(ValueError):
+            ip_range(start, end)
+
+
+class Test_next_free_ip:
+    @staticmethod
+    def test_next_free():
+        assert next_free_ip("192.0.2.0/24") == "192.0.2.1"
+        assert (
+            next_free_ip("192.0.2.0/24", ["192.0.2.1", "192.0.2.3", "192.0.2.2"])
+            == "192.0.2.4"
+        )
+
+    @staticmethod
+    def test_route_domain():
+        assert next_free_ip("192.0.2.0%2/24", ["192.0.2.1", "192.0.2.2%2"]) == (
+            "192.0.2.1%2"
+        )
+
+    @staticmethod
+    def test_ignores_invalid():
+        assert next_free_ip("192.0.2.0/30", ["invalid", None, "2001:db8::1"]) == (
+            "192.0.2.1"
+        )
+
+    @staticmethod
+    def test_exhausted():
+        assert next_free_ip("192.0.2.0/30", ["192.0.2.1", "192.0.2.2"]) is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "used, expected",
+        [
+            [["10.0.0.1", "10.0.0.0/30"], "10.0.0.4"],
+            [["10.0.0.0/30", "10.0.0.4"], "10.0.0.5"],
+            [["10.0.0.4/30", "10.0.0.1"], "10.0.0.2"],
+            [["10.0.0.2/31", "10.0.0.1", "10.0.0.4/31"], "10.0.0.6"],
+            [["10.0.0.0/28"], None],
+            [["10.0.0.0/29"], None],
+            [["10.0.0.0/31", "10.0.0.2/31", "10.0.0.4/31", "10.0.0.6"], None],
+        ],
+    )
+    def test_used_networks(used, expected):
+        assert next_free_ip("10.0.0.0/29", used) == expected
+
+
+class Test_is_f5ip:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("192.0.2.1", (True, True, False)),
+            ("192.0.2.0%1/24", (True, True, False)),
+            ("2001:db8::1%1", (True, False, True)),
+            ("192.0.2.1/24", (False, False, False)),
+            ("127.0.0.1", (False, False, False)),
+            (None, (False, False, False)),
+        ],
+    )
+    def test_is_f5ip(value, expected):
+        assert (is_f5ip(value), is_f5ipv4(value), is_f5ipv6(value)) == expected
+
+
+class Test_templates:
+    @staticmethod
+    def test_filters(fixture_env):
+        template = fixture_env.from_string(
+            '{{ "192.0.2.0%2/29" | cidr_hosts(skip=4) | join(",") }} '
+            '{{ "192.0.2.0/24" | cidr_contains("192.0.2.10") }} '
+            '{{ "192.0.2.0/24" | next_free_ip(["192.0.2.1"]) }}'
+        )
+        assert template.render() == "192.0.2.5%2,192.0.2.6%2 True 192.0.2.2"
+
+    @staticmethod
+    def test_functions(fixture_env):
+        template = fixture_env.from_string(
+            '{% for address in ip_range("192.0.2.1", "192.0.2.3") %}{{ address }} {% endfor %}'
+        )
+        assert template.render() == "192.0.2.1 192.0.2.2 192.0.2.3 "
+
+    @staticmethod
+    def test_tests(fixture_env):
+        template = fixture_env.from_string(
+            "{{ value is f5ip }} {{ value is f5ipv4 }} {{ value is f5ipv6 }}"
+        )
+        assert template.render(value="2001:db8::1") == "True False True"
+        assert template.render(value="192.0.2.1%1") == "True True False"
+        assert template.render(value="invalid") == "False False False"
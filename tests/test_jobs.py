@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from as3ninja.jobs import Job, JobStore
+
+
+def finished_future(result=None, exception=None):
+    future = Future()
+    future.set_running_or_notify_cancel()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
+class Test_Job:
+    @staticmethod
+    def test_status():
+        future = Future()
+        job = Job(future)
+        assert job.status == "pending"
+        future.set_running_or_notify_cancel()
+        assert job.status == "running"
+        future.set_result(b"{}")
+        assert job.status == "done"
+
+    @staticmethod
+    @pytest.mark.parametrize("cancel", [True, False])
+    def test_failed(cancel):
+        future = Future()
+        if cancel:
+            future.cancel()
+        else:
+            future.set_exception(ValueError())
+        assert Job(future).status == "failed"
+
+    @staticmethod
+    def test_unique_id():
+        assert Job(Future()).id != Job(Future()).id
+
+    @staticmethod
+    def test_done_callback():
+        future = Future()
+        job = Job(future)
+        called, removed = [], []
+        job.add_done_callback(called.append)
+        job.add_done_callback(removed.append)
+        job.remove_done_callback(removed.append)
+        job.remove_done_callback(removed.append)
+        future.set_result(b"{}")
+        assert called == [future]
+        assert removed == []
+        job.add_done_callback(called.append)
+        assert called == [future, future]
+
+
+class Test_JobStore:
+    @staticmethod
+    def test_add_get():
+        store = JobStore()
+        job = store.add(Future())
+        assert store.get(job.id) is job
+        assert store.get("unknown") is None
+        assert len(store) == 1
+
+    @staticmethod
+    def test_finished():
+        store = JobStore()
+        future = Future()
+        job = store.add(future)
+        assert job.finished is None
+        future.set_result(None)
+        assert job.finished is not None
+        assert store.add(finished_future()).finished is not None
+
+    @staticmethod
+    def test_retention(mocker):
+        store = JobStore(retention=10)
+        running = store.add(Future())
+        finished = store.add(finished_future())
+        mocked_time = mocker.patch("as3ninja.jobs.time.time")
+        mocked_time.return_value = finished.finished + 5
+        assert store.get(finished.id) is finished
+        mocked_time.return_value = finished.finished + 11
+        assert store.get(finished.id) is None
+        assert store.get(running.id) is running
+
+    @staticmethod
+    def test_max_jobs():
+        store = JobStore(max_jobs=2)
+        running = store.add(Future())
+        first = store.add(finished_future())
+        second = store.add(finished_future())
+        assert store.get(first.id) is None
+        assert store.get(second.id) is second
+        assert store.get(running.id) is running
+        third = store.add(Future())
+        assert len(store) == 2
+        assert store.get(second.id) is None
+        assert store.get(third.id) is third
+
+    @staticmethod
+    def test_unfinished_not_removed():
+        store = JobStore(max_jobs=1)
+        jobs = [store.add(Future()) for _ in range(3)]
+        assert all(store.get(job.id) is job for job in jobs)
+
+    @staticmethod
+    def test_threads():
+        store = JobStore()
+        jobs = []
+
+        def add():
+            for _ in range(100):
+                jobs.append(store.add(finished_future()))
+
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(store) == 400
+        assert all(store.get(job.id) is job for job in jobs)
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from as3ninja.exceptions import AS3TemplateSyntaxError, AS3UndefinedError
+from as3ninja.preview import (
+    PreviewSession,
+    apply_patch,
+    apply_text_edits,
+    make_patch,
+)
+
+
+class Test_apply_text_edits:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "edits, expected",
+        [
+            [[], "hello world"],
+            [[{"start": 0, "end": 5, "text": "bye"}], "bye world"],
+            [[{"start": 11, "end": 11, "text": "!"}], "hello world!"],
+            [[{"start": 5, "end": 11}], "hello"],
+            [
+                [
+                    {"start": 0, "end": 5, "text": "bye"},
+                    {"start": 3, "end": 3, "text": ","},
+                ],
+                "bye, world",
+            ],
+        ],
+    )
+    def test_edits(edits, expected):
+        assert apply_text_edits("hello world", edits) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "edit",
+        [
+            {"start": 0, "end": 12, "text": ""},
+            {"start": 5, "end": 4, "text": ""},
+            {"start": -1, "end": 0, "text": ""},
+        ],
+    )
+    def test_outside(edit):
+        with pytest.raises(ValueError):
+            apply_text_edits("hello world", [edit])
+
+
+class Test_apply_patch:
+    document = {"a": {"b": [1, 2, 3]}, "c/d": "e"}
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "patch, expected",
+        [
+            [
+                [{"op": "add", "path": "/x", "value": 1}],
+                {"a": {"b": [1, 2, 3]}, "c/d": "e", "x": 1},
+            ],
+            [
+                [{"op": "add", "path": "/a/b/-", "value": 4}],
+                {"a": {"b": [1, 2, 3, 4]}, "c/d": "e"},
+            ],
+            [
+                [{"op": "add", "path": "/a/b/0", "value": 0}],
+                {"a": {"b": [0, 1, 2, 3]}, "c/d": "e"},
+            ],
+            [[{"op": "remove", "path": "/c~1d"}], {"a": {"b": [1, 2, 3]}}],
+            [
+                [{"op": "remove", "path": "/a/b/1"}],
+                {"a": {"b": [1, 3]}, "c/d": "e"},
+            ],
+            [
+                [{"op": "replace", "path": "/a/b/1", "value": 5}],
+                {"a": {"b": [1, 5, 3]}, "c/d": "e"},
+            ],
+            [[{"op": "replace", "path": "", "value": []}], []],
+            [
+                [{"op": "move", "from": "/c~1d", "path": "/a/c"}],
+                {"a": {"b": [1, 2, 3], "c": "e"}},
+            ],
+            [
+                [{"op": "copy", "from": "/a/b", "path": "/b"}],
+                {"a": {"b": [1, 2, 3]}, "b": [1, 2, 3], "c/d": "e"},
+            ],
+            [
+                [{"op": "test", "path": "/a/b/2", "value": 3}],
+                {"a": {"b": [1, 2, 3]}, "c/d": "e"},
+            ],
+        ],
+    )
+    def test_operations(patch, expected):
+        assert apply_patch(Test_apply_patch.document, patch) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "patch",
+        [
+            [{"op": "remove", "path": "/x"}],
+            [{"op": "remove", "path": "/a/b/3"}],
+            [{"op": "replace", "path": "/x", "value": 1}],
+            [{"op": "add", "path": "/x/y", "value": 1}],
+            [{"op": "add", "path": "/a/b/5", "value": 1}],
+            [{"op": "add", "path": "x", "value": 1}],
+            [{"op": "move", "from": "/a", "path": "/a/x"}],
+            [{"op": "test", "path": "/c~1d", "value": "x"}],
+            [{"op": "unknown", "path": "/a"}],
+            [{"op": "add", "path": "/x"}],
+        ],
+    )
+    def test_invalid(patch):
+        with pytest.raises(ValueError):
+            apply_patch(Test_apply_patch.document, patch)
+
+    @staticmethod
+    def test_atomic():
+        document = {"a": 1}
+        with pytest.raises(ValueError):
+            apply_patch(
+                document,
+                [
+                    {"op": "replace", "path": "/a", "value": 2},
+                    {"op": "remove", "path": "/b"},
+                ],
+            )
+        assert document == {"a": 1}
+
+
+class Test_make_patch:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "source, target",
+        [
+            [{"a": 1}, {"a": 1}],
+            [{"a": 1}, {"a": 2}],
+            [{"a": 1}, {"b": 1}],
+            [{"a": {"b/c": [1, 2, 3]}}, {"a": {"b/c": [1, 3]}}],
+            [{"a": [1]}, {"a": [1, {"b": 2}, 3]}],
+            [{"a": [1, 2, 3, 4]}, {"a": [2]}],
+            [{"a": 1}, {"a": True}],
+            [{"a": 1}, [1]],
+            ["a", "b"],
+        ],
+    )
+    def test_roundtrip(source, target):
+        assert apply_patch(source, make_patch(source, target)) == target
+
+    @staticmethod
+    def test_unchanged():
+        assert make_patch({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}) == []
+
+    @staticmethod
+    def test_minimal():
+        assert make_patch({"a": {"b": 1, "c": 2}}, {"a": {"b": 1, "c": 3}}) == [
+            {"op": "replace", "path": "/a/c", "value": 3}
+        ]
+
+
+@pytest.fixture
+def fixture_session():
+    session = PreviewSession()
+    session.update(
+        declaration_template='{"name": "{{ ninja.name }}", "items": {{ ninja["items"] | tojson }}}',
+        template_configuration=[{"name": "a", "items": [1]}, {"items": [1, 2]}],
+    )
+    return session
+
+
+class Test_PreviewSession:
+    @staticmethod
+    def test_render(fixture_session):
+        assert fixture_session.declaration is None
+        declaration = fixture_session.render()
+        assert declaration == {"name": "a", "items": [1, 2]}
+        assert fixture_session.declaration is declaration
+
+    @staticmethod
+    def test_template_edits(fixture_session):
+        fixture_session.update(
+            template_edits=[{"start": 10, "end": 10, "text": "x-"}],
+        )
+        assert fixture_session.render()["name"] == "x-a"
+
+    @staticmethod
+    def test_configuration_patch(fixture_session):
+        fixture_session.update(
+            configuration_patch=[{"op": "add", "path": "/items/-", "value": 3}]
+        )
+        assert fixture_session.template_configuration["items"] == [1, 2, 3]
+        assert fixture_session.render()["items"] == [1, 2, 3]
+
+    @staticmethod
+    def test_template_compiled_once(fixture_session, mocker):
+        fixture_session.render()
+        compiled = mocker.patch("as3ninja.preview.AS3DeclarationTemplate")
+        fixture_session.update(
+            configuration_patch=[{"op": "replace", "path": "/name", "value": "b"}]
+        )
+        assert fixture_session.render()["name"] == "b"
+        compiled.assert_not_called()
+
+    @staticmethod
+    def test_syntax_error_keeps_template(fixture_session):
+        fixture_session.render()
+        fixture_session.update(template_edits=[{"start": 0, "end": 0, "text": "{%"}])
+        with pytest.raises(AS3TemplateSyntaxError):
+            fixture_session.render()
+        assert fixture_session.declaration == {"name": "a", "items": [1, 2]}
+        fixture_session.update(template_edits=[{"start": 0, "end": 2, "text": ""}])
+        assert fixture_session.render() == {"name": "a", "items": [1, 2]}
+
+    @staticmethod
+    def test_undefined(fixture_session):
+        fixture_session.update(
+            configuration_patch=[{"op": "remove", "path": "/name"}],
+        )
+        with pytest.raises(AS3UndefinedError):
+            fixture_session.render()
+
+    @staticmethod
+    def test_update_atomic(fixture_session):
+        template = fixture_session.declaration_template
+        with pytest.raises(ValueError):
+            fixture_session.update(
+                template_edits=[{"start": 0, "end": 1, "text": "["}],
+                configuration_patch=[{"op": "remove", "path": "/unknown"}],
+            )
+        assert fixture_session.declaration_template == template
+
+    @staticmethod
+    def test_empty_template():
+        with pytest.raises(ValueError):
+            PreviewSession().render()
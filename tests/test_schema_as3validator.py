@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from jsonschema import Draft7Validator, RefResolver
+
+from as3ninja.schema.as3validator import (
+    CLASS_DISPATCH_KEYWORD,
+    AS3Validator,
+    class_dispatch_prune,
+    class_dispatch_update,
+    prune_definitions,
+    resolve_pointer,
+    resolve_refs,
+)
+from as3ninja.schema.formatcheckers import AS3FormatChecker
+from as3ninja.types import validate_many
+
+SCHEMA_URL = "file:///s.json"
+PRUNED_URL = "file:///s.json?classes=A"
+
+
+@pytest.fixture
+def fixture_schema():
+    return {
+        "definitions": {
+            "Application": {
+                "type": "object",
+                "properties": {"class": {"const": "Application"}},
+                "additionalProperties": {
+                    "type": "object",
+                    "properties": {"class": {"type": "string", "enum": ["A", "B"]}},
+                    "allOf": [
+                        {
+                            "if": {"properties": {"class": {"const": "A"}}},
+                            "then": {"$ref": "#/definitions/A"},
+                        },
+                        {
+                            "if": {"properties": {"class": {"const": "B"}}},
+                            "then": {"$ref": "#/definitions/B"},
+                        },
+                    ],
+                },
+            },
+            "A": {
+                "type": "object",
+                "properties": {"class": {"const": "A"}, "a": {"type": "integer"}},
+            },
+            "B": {
+                "type": "object",
+                "properties": {"class": {"const": "B"}, "b": {"type": "string"}},
+            },
+        },
+        "if": {"properties": {"class": {"const": "Application"}}},
+        "then": {"$ref": "#/definitions/Application"},
+        "else": {"required": ["class"]},
+    }
+
+
+class Test_class_dispatch_update:
+    @staticmethod
+    def test_index(fixture_schema):
+        index = class_dispatch_update(schema=fixture_schema, ref_url="file:///s.json")
+        assert index == {
+            "Application": "#/definitions/Application",
+            "A": "#/definitions/A",
+            "B": "#/definitions/B",
+        }
+
+    @staticmethod
+    def test_index_ref_url():
+        index = class_dispatch_update(
+            schema={"definitions": {"A": {"properties": {"class": {"enum": ["A"]}}}}},
+            ref_url="file:///s.json",
+        )
+        assert index == {"A": "file:///s.json#/definitions/A"}
+
+    @staticmethod
+    def test_replaces_branches(fixture_schema):
+        class_dispatch_update(schema=fixture_schema)
+        assert "if" not in fixture_schema
+        assert CLASS_DISPATCH_KEYWORD in fixture_schema
+        additional = fixture_schema["definitions"]["Application"][
+            "additionalProperties"
+        ]
+        assert "allOf" not in additional
+        assert list(additional[CLASS_DISPATCH_KEYWORD]["classes"]) == ["A", "B"]
+
+    @staticmethod
+    def test_single_branch_not_replaced():
+        schema = {
+            "allOf": [
+                {
+                    "if": {"properties": {"class": {"const": "A"}}},
+                    "then": {"$ref": "#/definitions/A"},
+                }
+            ]
+        }
+        class_dispatch_update(schema=schema)
+        assert CLASS_DISPATCH_KEYWORD not in schema
+
+    @staticmethod
+    def test_non_class_branch_not_replaced():
+        schema = {"if": {"properties": {"other": {"const": "A"}}}, "then": {}}
+        class_dispatch_update(schema=schema)
+        assert CLASS_DISPATCH_KEYWORD not in schema
+
+
+class Test_AS3Validator:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "instance, expected_valid",
+        [
+            [{"class": "Application", "x": {"class": "A", "a": 1}}, True],
+            [{"class": "Application", "x": {"class": "A", "a": "1"}}, False],
+            [{"class": "Application", "x": {"class": "B", "b": "1"}}, True],
+            [{"class": "Application", "x": {"class": "B", "b": 1}}, False],
+            [{"class": "Application", "x": {"class": "C"}}, False],
+            [{"class": "Application", "x": {"a": "1"}}, False],
+            [{"class": "Application", "x": "string"}, False],
+            [{"class": "Other"}, True],
+            [{"noclass": True}, False],
+        ],
+    )
+    def test_same_result(fixture_schema, instance, expected_valid):
+        """class dispatching must produce the same result as the original schema"""
+        assert AS3Validator(fixture_schema).is_valid(instance) is expected_valid
+        class_dispatch_update(schema=fixture_schema)
+        assert AS3Validator(fixture_schema).is_valid(instance) is expected_valid
+
+
+@pytest.fixture
+def fixture_pruned(fixture_schema):
+    schema = json.loads(
+        json.dumps(fixture_schema).replace(
+            '"#/definitions', f'"{SCHEMA_URL}#/definitions'
+        )
+    )
+    class_dispatch_update(schema=schema, ref_url=SCHEMA_URL)
+    pruned = class_dispatch_prune(
+        schema,
+        classes=frozenset(["Application", "A"]),
+        ref_url=SCHEMA_URL,
+        pruned_url=PRUNED_URL,
+    )
+    prune_definitions(schema=pruned, url=PRUNED_URL)
+    return schema, pruned
+
+
+class Test_class_dispatch_prune:
+    @staticmethod
+    def test_does_not_mutate(fixture_pruned):
+        schema, _ = fixture_pruned
+        assert sorted(schema["definitions"]) == ["A", "Application", "B"]
+
+    @staticmethod
+    def test_classes(fixture_pruned):
+        _, pruned = fixture_pruned
+        additional = pruned["definitions"]["Application"]["additionalProperties"]
+        assert list(additional[CLASS_DISPATCH_KEYWORD]["classes"]) == ["A"]
+
+    @staticmethod
+    def test_refs(fixture_pruned):
+        _, pruned = fixture_pruned
+        dispatch = pruned["definitions"]["Application"]["additionalProperties"][
+            CLASS_DISPATCH_KEYWORD
+        ]
+        assert dispatch["classes"]["A"] == [{"$ref": f"{PRUNED_URL}#/definitions/A"}]
+        assert dispatch["original"] == [
+            {
+                "$ref": f"{SCHEMA_URL}#/definitions/Application/additionalProperties/{CLASS_DISPATCH_KEYWORD}/original/0"
+            },
+            {
+                "$ref": f"{SCHEMA_URL}#/definitions/Application/additionalProperties/{CLASS_DISPATCH_KEYWORD}/original/1"
+            },
+        ]
+
+    @staticmethod
+    def test_prune_definitions(fixture_pruned):
+        _, pruned = fixture_pruned
+        assert sorted(pruned["definitions"]) == ["A", "Application"]
+
+    @staticmethod
+    def test_prune_definitions_escaped():
+        schema = {
+            "$ref": "u#/definitions/a~1b",
+            "definitions": {"a/b": {"$ref": "u#/definitions/c"}, "c": {}, "d": {}},
+        }
+        prune_definitions(schema=schema, url="u")
+        assert sorted(schema["definitions"]) == ["a/b", "c"]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "instance, expected_valid",
+        [
+            [{"class": "Application", "x": {"class": "A", "a": 1}}, True],
+            [{"class": "Application", "x": {"class": "A", "a": "1"}}, False],
+            [{"class": "Application", "x": {"a": "1"}}, False],
+            [{"class": "Application", "x": "string"}, False],
+            [{"noclass": True}, False],
+        ],
+    )
+    def test_same_result(fixture_pruned, instance, expected_valid):
+        """the reduced schema must produce the same result for instances using the kept classes"""
+        schema, pruned = fixture_pruned
+        validator = AS3Validator(
+            pruned,
+            resolver=RefResolver(
+                base_uri=PRUNED_URL,
+                referrer=pruned,
+                store={SCHEMA_URL: schema, PRUNED_URL: pruned},
+            ),
+        )
+        assert validator.is_valid(instance) is expected_valid
+
+
+class Test_batch_items:
+    @staticmethod
+    def validator(items: dict, format_checker=AS3FormatChecker()):
+        return AS3Validator(
+            {"type": "array", "items": items}, format_checker=format_checker
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "items",
+        [
+            {"type": "string", "format": "f5ip"},
+            {"type": "string", "format": "f5ipv4"},
+            {"type": "string", "format": "f5ipv6"},
+            {"format": "f5ip", "maxLength": 12},
+            {"type": "string", "format": "f5name"},
+        ],
+    )
+    @pytest.mark.parametrize(
+        "instance",
+        [
+            ["192.0.2.1", "192.0.2.0%1/24"],
+            ["2001:db8::1", "2001:db8::%1/64"],
+            ["192.0.2.1", "192.0.2.1/24", "2001:db8::1"],
+            ["192.0.2.1", 1],
+            [],
+            "192.0.2.1",
+        ],
+    )
+    def test_same_errors(items, instance):
+        """batch validation must produce the same errors as Draft7Validator"""
+        expected = [
+            (error.message, list(error.path))
+            for error in Draft7Validator(
+                {"type": "array", "items": items}, format_checker=AS3FormatChecker()
+            ).iter_errors(instance)
+        ]
+        errors = [
+            (error.message, list(error.path))
+            for error in Test_batch_items.validator(items).iter_errors(instance)
+        ]
+        assert errors == expected
+
+    @staticmethod
+    def test_batch_used(mocker):
+        mocked = mocker.patch(
+            "as3ninja.schema.as3validator.validate_many", wraps=validate_many
+        )
+        validator = Test_batch_items.validator({"type": "string", "format": "f5ip"})
+        assert validator.is_valid(["192.0.2.1"])
+        mocked.assert_called_once()
+
+    @staticmethod
+    def test_batch_not_used_without_format_checker(mocker):
+        mocked = mocker.patch("as3ninja.schema.as3validator.validate_many")
+        validator = Test_batch_items.validator(
+            {"type": "string", "format": "f5ip"}, format_checker=None
+        )
+        assert validator.is_valid(["invalid"])
+        mocked.assert_not_called()
+
+
+class Test_resolve_pointer:
+    document = {"a/b": {"c~d": [1, {"e": 2}]}, "": 3}
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "pointer, expected",
+        [
+            ["", {"a/b": {"c~d": [1, {"e": 2}]}, "": 3}],
+            ["/", 3],
+            ["/a~1b/c~0d/0", 1],
+            ["/a~1b/c~0d/1/e", 2],
+            ["#/a~1b/c~0d/1/e", 2],
+            ["#/a~1b/c~0d/1/%65", 2],
+        ],
+    )
+    def test_resolve(pointer, expected):
+        assert resolve_pointer(Test_resolve_pointer.document, pointer) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "pointer", ["/x", "/a~1b/c~0d/2", "/a~1b/c~0d/-1", "/a~1b/c~0d/-", "/a~1b/x/y"]
+    )
+    def test_not_found(pointer):
+        with pytest.raises(KeyError):
+            resolve_pointer(Test_resolve_pointer.document, pointer)
+
+    @staticmethod
+    def test_invalid():
+        with pytest.raises(ValueError):
+            resolve_pointer(Test_resolve_pointer.document, "a")
+
+
+class Test_resolve_refs:
+    @staticmethod
+    def test_resolves(fixture_schema):
+        resolved = resolve_refs(fixture_schema, "/definitions/Application")
+        branches = resolved["additionalProperties"]["allOf"]
+        assert branches[0]["then"] == fixture_schema["definitions"]["A"]
+        assert "$ref" not in json.dumps(resolved)
+        assert "definitions" not in resolved
+
+    @staticmethod
+    def test_does_not_mutate(fixture_schema):
+        original = json.dumps(fixture_schema)
+        resolve_refs(fixture_schema, "#/definitions/Application")
+        resolve_refs(fixture_schema)
+        assert json.dumps(fixture_schema) == original
+
+    @staticmethod
+    def test_recursive():
+        schema = {
+            "definitions": {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "value": {"$ref": "#/definitions/Value"},
+                        "children": {
+                            "type": "array",
+                            "items": {"$ref": "#/definitions/Node"},
+                        },
+                    },
+                },
+                "Value": {"type": "integer"},
+            }
+        }
+        resolved = resolve_refs(schema, "/definitions/Node")
+        assert resolved["properties"]["value"] == {"type": "integer"}
+        assert resolved["properties"]["children"]["items"] == {
+            "$ref": "#/definitions/Node"
+        }
+        node = {key: value for key, value in resolved.items() if key != "definitions"}
+        assert resolved["definitions"] == {"Node": node}
+        validator = Draft7Validator(resolved)
+        assert validator.is_valid({"value": 1, "children": [{"children": []}]})
+        assert not validator.is_valid({"children": [{"value": "1"}]})
+
+    @staticmethod
+    def test_mutually_recursive():
+        schema = {
+            "definitions": {
+                "A": {
+                    "type": "object",
+                    "properties": {"b": {"$ref": "#/definitions/B"}},
+                },
+                "B": {"properties": {"a": {"$ref": "#/definitions/A"}}},
+            }
+        }
+        resolved = resolve_refs(schema, "/definitions/A")
+        assert resolved["properties"]["b"]["properties"]["a"] == {
+            "$ref": "#/definitions/A"
+        }
+        assert sorted(resolved["definitions"]) == ["A"]
+        validator = Draft7Validator(resolved)
+        assert not validator.is_valid({"b": {"a": {"b": {"a": 1}}}})
+
+    @staticmethod
+    def test_unresolvable():
+        with pytest.raises(ValueError):
+            resolve_refs({"a": {"$ref": "#/definitions/missing"}}, "/a")
+
+    @staticmethod
+    def test_recursive_not_definition():
+        with pytest.raises(ValueError):
+            resolve_refs({"a": {"items": {"$ref": "#/a"}}}, "/a")
+
+    @staticmethod
+    def test_not_found(fixture_schema):
+        with pytest.raises(KeyError):
+            resolve_refs(fixture_schema, "/definitions/C")
@@ -5,24 +5,6 @@ from jsonschema import FormatChecker
 from as3ninja.schema.formatcheckers import AS3FormatChecker
 
 
-class Test_AS3FormatChecker_staticmethods:
-    @staticmethod
-    def test_is_type_True():
-        assert AS3FormatChecker._is_type(int, 4) is True
-
-    @staticmethod
-    def test_is_type_False():
-        assert AS3FormatChecker._is_type(int, "string") is False
-
-    @staticmethod
-    def test_positive_match():
-        assert AS3FormatChecker._regex_match("^[a-z]{3}$", "foo") is True
-
-    @staticmethod
-    def test_negative_match():
-        assert AS3FormatChecker._regex_match("[^a-z]{3}$", "foo") is False
-
-
 class Test_AS3FormatChecker_as3_schema_format_checkers:
     @staticmethod
     def test_is_dict():
@@ -75,3 +57,42 @@ class Test_AS3FormatChecker_checkers:
     )
     def test_formatcheckers(self, format_check, test_string, expected_result):
         assert self.fc.checkers[format_check][0](test_string) is expected_result
+
+
+class Test_AS3FormatChecker_memoization:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "format_check", AS3FormatChecker().as3_schema_format_checkers.keys()
+    )
+    @pytest.mark.parametrize("value", [None, 1, 1.0, [], {}, True])
+    def test_non_str_false(format_check, value):
+        assert AS3FormatChecker().checkers[format_check][0](value) is False
+
+    @staticmethod
+    def test_memoized():
+        AS3FormatChecker.cache_clear()
+        check = AS3FormatChecker().checkers["f5ip"][0]
+        assert check("192.0.2.1%1/32") is True
+        assert check("192.0.2.1%1/32") is True
+        assert check.cache_info().hits == 1
+        assert check.cache_info().misses == 1
+
+    @staticmethod
+    def test_cache_clear():
+        check = AS3FormatChecker().checkers["f5name"][0]
+        check("name")
+        AS3FormatChecker.cache_clear()
+        assert check.cache_info().currsize == 0
+
+    @staticmethod
+    def test_shared_checkers():
+        assert (
+            AS3FormatChecker().checkers["f5ip"][0]
+            is AS3FormatChecker().checkers["f5ip"][0]
+        )
+
+    @staticmethod
+    def test_as3_schema_format_checkers_copy():
+        fc = AS3FormatChecker()
+        fc.as3_schema_format_checkers.clear()
+        assert fc.as3_schema_format_checkers
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from as3ninja.exceptions import AS3SchemaVersionError
+from as3ninja.schema import AS3Schema, AS3SchemaService
+from as3ninja.schema.service import SerializedJSON
+
+
+@pytest.fixture
+def fixture_service():
+    return AS3SchemaService(prewarm_minors=2)
+
+
+class Test_AS3SchemaService:
+    @staticmethod
+    def test_get_shared(fixture_service):
+        as3s = fixture_service.get()
+        assert isinstance(as3s, AS3Schema)
+        assert fixture_service.get() is as3s
+        assert fixture_service.get("latest") is as3s
+        assert fixture_service.get(as3s.latest_version) is not as3s
+
+    @staticmethod
+    def test_get_concurrent(fixture_service):
+        versions = fixture_service.get().versions
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(fixture_service.get, version)
+                for version in versions * 4
+            ] + [executor.submit(fixture_service.serialized) for _ in range(4)]
+            results = [future.result() for future in futures]
+        for version, as3s in zip(versions * 4, results):
+            assert as3s is fixture_service.get(version)
+
+    @staticmethod
+    def test_get_unknown(fixture_service):
+        with pytest.raises(AS3SchemaVersionError):
+            fixture_service.get("3.99.99")
+        with pytest.raises(AS3SchemaVersionError):
+            fixture_service.get("3.99.99")
+
+    @staticmethod
+    def test_reset(fixture_service):
+        as3s = fixture_service.get()
+        fixture_service.reset()
+        assert fixture_service.get() is not as3s
+
+    @staticmethod
+    def test_prewarm_versions(fixture_service):
+        versions = fixture_service.get().versions
+        prewarm_versions = fixture_service.prewarm_versions()
+        assert len(prewarm_versions) == 2
+        assert prewarm_versions[0] == versions[0]
+        assert prewarm_versions[0].split(".")[:2] != prewarm_versions[1].split(".")[:2]
+        # latest PATCH version of the MAJOR.MINOR version
+        assert fixture_service.get(
+            ".".join(prewarm_versions[1].split(".")[:2])
+        ).version == (prewarm_versions[1])
+
+    @staticmethod
+    def test_prewarm_disabled():
+        service = AS3SchemaService(prewarm_minors=0)
+        assert service.prewarm_versions() == []
+        service.warmup()
+        assert service.ready is True
+
+    @staticmethod
+    def test_warmup(fixture_service, mocker):
+        spy = mocker.spy(AS3Schema, "_validator")
+        assert fixture_service.ready is False
+        thread = fixture_service.start()
+        assert fixture_service.start() is thread
+        thread.join()
+        assert fixture_service.ready is True
+        assert fixture_service.error is None
+        assert fixture_service.warm_versions == fixture_service.prewarm_versions()
+        assert [call.args[1] for call in spy.call_args_list] == (
+            fixture_service.warm_versions
+        )
+
+    @staticmethod
+    def test_warmup_error(fixture_service, mocker):
+        mocker.patch.object(AS3Schema, "_validator", side_effect=ValueError("broken"))
+        fixture_service.warmup()
+        assert fixture_service.ready is False
+        assert fixture_service.error == "ValueError: broken"
+
+
+class Test_SerializedJSON:
+    @staticmethod
+    def test_body():
+        serialized = SerializedJSON({"a": [1, "ü"]})
+        assert serialized.body == '{"a":[1,"ü"]}'.encode("utf-8")
+        assert gzip.decompress(serialized.encoded("gzip")) == serialized.body
+        assert serialized.encoded("gzip") is serialized.encoded("gzip")
+
+    @staticmethod
+    def test_etag():
+        assert SerializedJSON({"a": 1}).etag == SerializedJSON({"a": 1}).etag
+        assert SerializedJSON({"a": 1}).etag != SerializedJSON({"a": 2}).etag
+
+    @staticmethod
+    def test_encoded():
+        serialized = SerializedJSON({"a": 1})
+        assert serialized.encoded("gzip", compress_body=False) is None
+        assert gzip.decompress(serialized.encoded("gzip")) == serialized.body
+        assert serialized.encoded("gzip", compress_body=False) is serialized.encoded(
+            "gzip"
+        )
+
+    @staticmethod
+    def test_etag_for():
+        serialized = SerializedJSON({"a": 1})
+        assert serialized.etag_for() == serialized.etag
+        assert serialized.etag_for("gzip") == f'{serialized.etag[:-1]}-gzip"'
+        assert serialized.etag_for("gzip") != serialized.etag_for("br")
+
+
+class Test_AS3SchemaService_serialized:
+    @staticmethod
+    def test_version(fixture_service):
+        as3s = fixture_service.get()
+        serialized = fixture_service.serialized("latest")
+        assert json.loads(serialized.body) == as3s.schema
+        assert fixture_service.serialized(as3s.version) is serialized
+
+    @staticmethod
+    def test_schemas(fixture_service):
+        serialized = fixture_service.serialized()
+        assert list(json.loads(serialized.body)) == list(fixture_service.get().versions)
+        assert fixture_service.serialized() is serialized
+        fixture_service.reset()
+        assert fixture_service.serialized() is not serialized
+
+    @staticmethod
+    def test_unknown_version(fixture_service):
+        with pytest.raises(AS3SchemaVersionError):
+            fixture_service.serialized("3.99.99")
+
+
+class Test_AS3SchemaService_serialized_subschema:
+    @staticmethod
+    def test_as3class(fixture_service):
+        as3s = fixture_service.get()
+        serialized = fixture_service.serialized_subschema(as3class="Pool")
+        assert json.loads(serialized.body) == as3s.subschema(as3class="Pool")
+        assert (
+            fixture_service.serialized_subschema(as3s.version, as3class="Pool")
+            is serialized
+        )
+        fixture_service.reset()
+        assert fixture_service.serialized_subschema(as3class="Pool") is not serialized
+
+    @staticmethod
+    def test_pointer(fixture_service):
+        serialized = fixture_service.serialized_subschema(
+            "3.8.1", pointer="/definitions/Pool"
+        )
+        assert json.loads(serialized.body)["properties"]["class"]["const"] == "Pool"
+
+    @staticmethod
+    def test_unknown(fixture_service):
+        with pytest.raises(KeyError):
+            fixture_service.serialized_subschema(as3class="Unknown")
+        with pytest.raises(AS3SchemaVersionError):
+            fixture_service.serialized_subschema("3.99.99", as3class="Pool")
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from as3ninja.schema.validationcache import ValidationCache
+
+
+class Test_ValidationCache:
+    @staticmethod
+    def test_key_canonical():
+        assert ValidationCache.key(
+            "3.9.0", "Tenant", {"a": 1, "b": [1, 2]}
+        ) == ValidationCache.key("3.9.0", "Tenant", {"b": [1, 2], "a": 1})
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "other",
+        [
+            ("3.8.1", "Tenant", {"a": 1}),
+            ("3.9.0", "Application", {"a": 1}),
+            ("3.9.0", "Tenant", {"a": 2}),
+        ],
+    )
+    def test_key_differs(other):
+        assert ValidationCache.key("3.9.0", "Tenant", {"a": 1}) != ValidationCache.key(
+            *other
+        )
+
+    @staticmethod
+    def test_add_is_valid():
+        cache = ValidationCache()
+        assert cache.is_valid("3.9.0", "Tenant", {"a": 1}) is False
+        cache.add("3.9.0", "Tenant", {"a": 1})
+        assert cache.is_valid("3.9.0", "Tenant", {"a": 1}) is True
+        assert len(cache) == 1
+        cache.clear()
+        assert cache.is_valid("3.9.0", "Tenant", {"a": 1}) is False
+
+    @staticmethod
+    def test_max_entries():
+        cache = ValidationCache(max_entries=2)
+        for value in range(3):
+            cache.add("3.9.0", "Tenant", {"a": value})
+        assert len(cache) == 2
+        assert cache.is_valid("3.9.0", "Tenant", {"a": 0}) is False
+
+    @staticmethod
+    def test_disk(tmp_path):
+        path = str(tmp_path / "validationcache.sqlite")
+        ValidationCache(path=path).add("3.9.0", "Tenant", {"a": 1})
+
+        cache = ValidationCache(path=path)
+        assert len(cache) == 0
+        assert cache.is_valid("3.9.0", "Tenant", {"a": 1}) is True
+        assert len(cache) == 1
@@ -19,6 +19,27 @@ class Test_NinjaSettings:
         assert "SCHEMA_BASE_PATH" in njs.dict()
         assert "SCHEMA_GITHUB_REPO" in njs.dict()
         assert "VAULT_SSL_VERIFY" in njs.dict()
+        assert "SCHEMA_PREWARM_MINORS" in njs.dict()
+        assert "API_WORKERS" in njs.dict()
+        assert "API_QUEUE_SIZE" in njs.dict()
+        assert "API_RETRY_AFTER" in njs.dict()
+        assert "API_GIT_WORKERS" in njs.dict()
+        assert "API_GIT_QUEUE_SIZE" in njs.dict()
+        assert "API_VALIDATION_WORKERS" in njs.dict()
+        assert "API_VALIDATION_QUEUE_SIZE" in njs.dict()
+        assert "API_MAX_BODY_SIZE" in njs.dict()
+        assert "API_COMPRESSION" in njs.dict()
+        assert "API_COMPRESSION_MIN_SIZE" in njs.dict()
+        assert "API_JOB_RETENTION" in njs.dict()
+        assert "API_JOB_MAX" in njs.dict()
+        assert "API_JOB_MAX_WAIT" in njs.dict()
+        assert "API_PREVIEW_DEBOUNCE" in njs.dict()
+        assert "API_PREVIEW_MAX_BATCH" in njs.dict()
+        assert "API_PREVIEW_QUEUE_SIZE" in njs.dict()
+        assert "TRANSFORM_CACHE_TTL" in njs.dict()
+        assert "TRANSFORM_CACHE_MAX_ENTRIES" in njs.dict()
+        assert "TRANSFORM_CACHE_MAX_BYTES" in njs.dict()
+        assert "TRANSFORM_CACHE_PATH" in njs.dict()
 
     @staticmethod
     def test_forbid_extra_attributes():
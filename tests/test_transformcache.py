@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from as3ninja.transformcache import TransformCache
+
+
+@pytest.fixture(params=["memory", "disk"])
+def fixture_cache(request, tmp_path):
+    if request.param == "disk":
+        return TransformCache(ttl=60, path=str(tmp_path / "transformcache.sqlite"))
+    return TransformCache(ttl=60)
+
+
+class Test_TransformCache:
+    @staticmethod
+    def test_get_set(fixture_cache):
+        key = TransformCache.key({"a": 1}, "{{ ninja.a }}")
+        assert fixture_cache.get(key) is None
+        fixture_cache.set(key, b'{"a": 1}')
+        assert fixture_cache.get(key) == b'{"a": 1}'
+        assert len(fixture_cache) == 1
+        fixture_cache.clear()
+        assert fixture_cache.get(key) is None
+
+    @staticmethod
+    def test_ttl(fixture_cache, mocker):
+        key = TransformCache.key({}, "{}")
+        fixture_cache.set(key, b"{}")
+        mocker.patch("as3ninja.transformcache.time.time", return_value=2**40)
+        assert fixture_cache.get(key) is None
+        assert len(fixture_cache) == 0
+
+    @staticmethod
+    def test_max_bytes():
+        cache = TransformCache(max_bytes=100)
+        cache.set("a", b"a" * 50)
+        cache.set("b", b"b" * 50)
+        assert cache.get("a") is None
+        assert cache.get("b") == b"b" * 50
+
+    @staticmethod
+    def test_max_entries():
+        cache = TransformCache(max_entries=1)
+        cache.set("a", b"a")
+        cache.set("b", b"b")
+        assert len(cache) == 1
+
+
+class Test_key:
+    @staticmethod
+    def test_canonical():
+        assert TransformCache.key({"a": 1, "b": 2}, "t") == TransformCache.key(
+            {"b": 2, "a": 1}, "t"
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "template_configuration, declaration_template",
+        [({"a": 2}, "t"), ({"a": 1}, "t2"), ([{"a": 1}], "t")],
+    )
+    def test_different(template_configuration, declaration_template):
+        assert TransformCache.key({"a": 1}, "t") != TransformCache.key(
+            template_configuration, declaration_template
+        )
+
+
+class Test_cacheable:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "declaration_template",
+        [
+            '{"a": "{{ ninja.a }}"}',
+            '{"a": {{ ninja.a | jsonify }}, "b": "{{ ninja.b | b64encode }}"}',
+            "{% for i in range(3) %}{{ i }}{% endfor %}",
+            '{"uuid": "{{ ninja.uuid }}"}',
+        ],
+    )
+    def test_cacheable(declaration_template):
+        assert TransformCache.cacheable({"a": 1}, declaration_template) is True
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "declaration_template",
+        [
+            '{"id": "{{ uuid() }}"}',
+            '{"home": "{{ "HOME" | env }}"}',
+            '{"home": "{{ env("HOME") }}"}',
+            '{"key": "{{ ninja.secret | vault }}"}',
+            '{"key": "{{ vault(ctx, ninja.secret) }}"}',
+            '{"token": "{{ VaultClient(addr=ninja.addr).token }}"}',
+            '{"file": {{ "file.txt" | readfile | jsonify }}}',
+            '{% for file in iterfiles("*.txt") %}{% endfor %}',
+            "{{ ninja.template | ninjutsu }}",
+            '{% include "other.j2" %}',
+            '{% import "macros.j2" as macros %}',
+            '{% from "macros.j2" import macro %}',
+            '{% extends "base.j2" %}',
+            "{{ invalid",
+        ],
+    )
+    def test_not_cacheable(declaration_template):
+        assert TransformCache.cacheable({"a": 1}, declaration_template) is False
+
+    @staticmethod
+    def test_include_configuration():
+        assert (
+            TransformCache.cacheable(
+                [{"a": 1}, {"as3ninja": {"include": "extra.yaml"}}], "{}"
+            )
+            is False
+        )
+        assert TransformCache.cacheable([{"a": 1}, {"as3ninja": {}}], "{}") is True
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import pytest
 
-from as3ninja.types import F5IP, F5IPv4, F5IPv6
+from as3ninja.types import F5IP, F5IPv4, F5IPv6, parse_f5ip, validate_many
 
 
 class Test_type_F5IPx:
@@ -104,3 +104,135 @@ class Test_type_F5IPx:
         else:
             with pytest.raises(ValueError):
                 F5IPv6(test_ip)
+
+
+class Test_parse_f5ip:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "ipv, test_ip, expected_result", Test_type_F5IPx.test_params
+    )
+    def test_valid(ipv, test_ip, expected_result):
+        try:
+            parsed = parse_f5ip(test_ip)
+            assert expected_result is True
+            assert parsed.version == int(ipv[-1])
+        except ValueError:
+            assert expected_result is False
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "ipv, test_ip, expected_result", Test_type_F5IPx.test_params
+    )
+    def test_version(ipv, test_ip, expected_result):
+        other_version = 6 if ipv == "ipv4" else 4
+        with pytest.raises(ValueError):
+            parse_f5ip(test_ip, version=other_version)
+
+    @staticmethod
+    def test_input_type():
+        with pytest.raises(TypeError):
+            parse_f5ip(123)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "test_ip, expected",
+        [
+            ["192.0.2.0%12/24", ("192.0.2.0", "12", "24", 4, 0xC0000200, 24)],
+            ["192.0.2.1", ("192.0.2.1", "", "", 4, 0xC0000201, 32)],
+            [
+                "192.0.2.0/255.255.255.0",
+                ("192.0.2.0", "", "255.255.255.0", 4, 0xC0000200, 24),
+            ],
+            ["2001:db8::%1/32", ("2001:db8::", "1", "32", 6, 0x20010DB8 << 96, 32)],
+            ["::", ("::", "", "", 6, 0, 128)],
+        ],
+    )
+    def test_result(test_ip, expected):
+        parsed = parse_f5ip(test_ip)
+        assert (
+            parsed.addr,
+            parsed.rdid,
+            parsed.mask,
+            parsed.version,
+            parsed.address,
+            parsed.prefixlen,
+        ) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "test_ip", ["1.2.3.4%+1", "01.2.3.4", "1.2.3.0/24/8", "1.2.3", "1.2.3.4.5"]
+    )
+    def test_invalid(test_ip):
+        with pytest.raises(ValueError):
+            parse_f5ip(test_ip)
+
+    @staticmethod
+    def test_route_domain():
+        assert parse_f5ip("192.0.2.1%0").route_domain == 0
+        assert parse_f5ip("192.0.2.1%65534").route_domain == 65534
+        assert parse_f5ip("192.0.2.1").route_domain is None
+
+    @staticmethod
+    def test_first_last():
+        parsed = parse_f5ip("192.0.2.0/24")
+        assert (parsed.first, parsed.last) == (0xC0000200, 0xC00002FF)
+        parsed = parse_f5ip("2001:db8::/127")
+        assert parsed.last - parsed.first == 1
+
+    @staticmethod
+    def test_slots():
+        with pytest.raises(AttributeError):
+            parse_f5ip("192.0.2.1").other = True
+
+    @staticmethod
+    def test_eq_hash():
+        assert parse_f5ip("192.0.2.0/24") == parse_f5ip("192.0.2.0/255.255.255.0")
+        assert parse_f5ip("192.0.2.0%1/24") != parse_f5ip("192.0.2.0/24")
+        assert len({parse_f5ip("2001:db8::1"), parse_f5ip("2001:DB8::1")}) == 1
+
+    @staticmethod
+    def test_repr():
+        assert repr(parse_f5ip("192.0.2.0%1/24")) == "ParsedF5IP('192.0.2.0%1/24')"
+
+
+class Test_validate_many:
+    @staticmethod
+    def test_results():
+        batch = F5IP.validate_many(
+            ["192.0.2.0%1/24", "2001:db8::/32", "127.0.0.1", 123, "192.0.2.0%1/24"]
+        )
+        assert len(batch) == 5
+        assert batch.valid is False
+        assert [batch.is_valid(i) for i in range(5)] == [True, True, False, False, True]
+        assert list(batch.versions) == [4, 6, 0, 0, 4]
+        assert sorted(batch.errors) == [2, 3]
+        assert batch.route_domain(0) == 1
+        assert batch.route_domain(1) is None
+        assert (batch.first(0), batch.last(0)) == (0xC0000200, 0xC00002FF)
+        assert batch.first(1) == 0x20010DB8 << 96
+        assert batch.last(1) == (0x20010DB8 << 96) | ((1 << 96) - 1)
+
+    @staticmethod
+    def test_version():
+        values = ["192.0.2.1", "2001:db8::1"]
+        assert list(F5IPv4.validate_many(values).versions) == [4, 0]
+        assert list(F5IPv6.validate_many(values).versions) == [0, 6]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "ipv, test_ip, expected_result", Test_type_F5IPx.test_params
+    )
+    def test_same_result(ipv, test_ip, expected_result):
+        assert F5IP.validate_many([test_ip]).valid is expected_result
+
+    @staticmethod
+    def test_generator():
+        batch = validate_many(f"192.0.2.{i}" for i in range(1, 255))
+        assert batch.valid is True
+        assert len(batch) == 254
+
+    @staticmethod
+    def test_empty():
+        batch = validate_many([])
+        assert batch.valid is True
+        assert len(batch) == 0